@@ -0,0 +1,117 @@
+import os
+import random
+from collections import namedtuple
+
+CorpusStats = namedtuple("CorpusStats", ["files", "functions", "loc"])
+
+IMPORTS = {
+    "pandas": "import pandas as pd",
+    "numpy": "import numpy as np",
+    "torch": "import torch",
+    "tensorflow": "import tensorflow as tf",
+    "sklearn": "from sklearn.ensemble import RandomForestClassifier\nfrom sklearn.cluster import KMeans",
+}
+
+# statements defining the variables used by the idioms of each library
+PROLOGUES = {
+    "pandas": ["frame = pd.read_csv('input.csv', dtype={'a': int})", "other = frame.copy()", "total = 0"],
+    "numpy": ["value = np.zeros(3)"],
+    "torch": ["batch = torch.ones(3)"],
+    "tensorflow": ["x = tf.ones(3)"],
+    "sklearn": [],
+}
+
+# statements that trigger (or come close to triggering) the detection rules, {n} is a unique number
+IDIOMS = {
+    "pandas": [
+        "frame_{n} = pd.read_csv('data_{n}.csv')",
+        "frame_{n} = pd.DataFrame({{'a': [1, 2], 'b': [3, 4]}})",
+        "merged_{n} = frame.merge(other)",
+        "merged_{n} = frame.merge(other, how='inner', on='a', validate='1:1')",
+        "frame['column_{n}'] = 0",
+        "values_{n} = frame.values",
+        "frame.dropna(inplace=True)",
+        "frame.fillna(0)",
+        "cell_{n} = frame['a']['b']",
+        "for index_{n}, row_{n} in frame.iterrows():\n    total = total + row_{n}['a']",
+    ],
+    "numpy": [
+        "if value == np.nan:\n    value = np.zeros(3)",
+        "product_{n} = np.dot([[1, 2], [3, 4]], [[1], [2]])",
+        "matrix_{n} = [[1, 2], [3, 4]]\nproduct_{n} = np.matmul(matrix_{n}, matrix_{n})",
+    ],
+    "torch": [
+        "torch.use_deterministic_algorithms(True)",
+        "output_{n} = self.forward(batch)",
+        "for epoch_{n} in range(3):\n    loss_{n} = criterion(model(batch), target)\n    loss_{n}.backward()\n"
+        "    optimizer.step()",
+        "for epoch_{n} in range(3):\n    optimizer.zero_grad()\n    loss_{n} = criterion(model(batch), target)\n"
+        "    loss_{n}.backward()\n    optimizer.step()",
+    ],
+    "tensorflow": [
+        "tensor_{n} = tf.constant([[1, 2], [3, 4]])",
+        "list_{n} = [1, 2, 3]\ntensor_{n} = tf.constant(list_{n})",
+        "for step_{n} in range(3):\n    model_{n} = tf.keras.Sequential()\n    model_{n}.fit(x, y)",
+    ],
+    "sklearn": [
+        "model_{n} = RandomForestClassifier()",
+        "model_{n} = KMeans(n_clusters=3, random_state=0)",
+    ],
+}
+
+# plain statements, without smells
+FILLERS = [
+    "value_{n} = {n} * 2",
+    "text_{n} = 'line {n}'.upper()",
+    "items_{n} = [item for item in range({n})]",
+    "if len(args) > {n}:\n    result = args[{n}]\nelse:\n    result = None",
+    "for item_{n} in range({n}):\n    result = item_{n} + 1",
+    "try:\n    value_{n} = int('{n}')\nexcept ValueError:\n    value_{n} = 0",
+]
+
+
+def indent(statement, prefix="    "):
+    return "\n".join(prefix + line for line in statement.split("\n"))
+
+
+def generate_function(rng, name, libraries, length, density):
+    """
+    Return the source of a function with about length statements, a statement is an idiom of one of libraries
+    with probability density and a filler statement otherwise.
+    """
+    lines = [f"def {name}(self, criterion, model, optimizer, target, y, *args):"]
+    for library in libraries:
+        lines.extend(indent(statement) for statement in PROLOGUES[library])
+    for n in range(length):
+        if libraries and rng.random() < density:
+            template = rng.choice(IDIOMS[rng.choice(libraries)])
+        else:
+            template = rng.choice(FILLERS)
+        lines.append(indent(template.format(n=n)))
+    lines.append("    return self")
+    return "\n".join(lines)
+
+
+def generate_corpus(path, files=100, functions=10, function_length=30, density=0.3,
+                    libraries=("pandas", "numpy", "torch", "tensorflow", "sklearn"), seed=0):
+    """
+    Write a synthetic project of files Python modules in path, each with the given number of functions of
+    function_length statements. density is the fraction of statements using one of libraries (the others are
+    plain Python). The same arguments always give the same corpus.
+    Returns the CorpusStats of the generated corpus.
+    """
+    rng = random.Random(seed)
+    libraries = list(libraries)
+    loc = 0
+    for i in range(files):
+        package = os.path.join(path, f"package_{i // 100}")
+        if not os.path.exists(package):
+            os.makedirs(package)
+        used = [library for library in libraries if rng.random() < 0.7] or libraries[:1]
+        parts = [IMPORTS[library] for library in used]
+        parts.extend(generate_function(rng, f"function_{j}", used, function_length, density) for j in range(functions))
+        source = "\n\n\n".join(parts) + "\n"
+        loc += source.count("\n")
+        with open(os.path.join(package, f"module_{i}.py"), "w") as file:
+            file.write(source)
+    return CorpusStats(files, files * functions, loc)
@@ -0,0 +1,184 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark.corpus import generate_corpus
+from components import detector
+from components.profiler import FileProfile, Profiler
+from controller.analyzer import analyze_project, get_python_files
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+
+def peak_rss():
+    """
+    Return the peak resident set size of the process in MB, None if it cannot be measured.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def throughput(stats, seconds):
+    return {"seconds": seconds, "files_per_second": stats.files / seconds,
+            "functions_per_second": stats.functions / seconds, "loc_per_second": stats.loc / seconds}
+
+
+def bench_inspect(filenames, stats, repeat):
+    # best of repeat runs of detector.inspect, the detail files are written to a temporary folder
+    best = None
+    for _ in range(repeat):
+        output_path = tempfile.mkdtemp()
+        try:
+            start = time.perf_counter()
+            for filename in filenames:
+                detector.inspect(filename, output_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(output_path)
+        best = elapsed if best is None else min(best, elapsed)
+    return throughput(stats, best)
+
+
+def bench_rules(filenames):
+    # per-rule cost measured by a profiled run of detect
+    profiler = Profiler()
+    for filename in filenames:
+        profile = FileProfile(filename)
+        detector.detect(filename, profile=profile)
+        profiler.add(profile)
+    return {phase["phase"]: {"seconds": phase["wall"], "calls": phase["calls"]} for phase in profiler.phases()}
+
+
+def bench_analyze_project(corpus_path, stats, repeat, jobs):
+    best = None
+    for _ in range(repeat):
+        output_path = tempfile.mkdtemp()
+        try:
+            start = time.perf_counter()
+            analyze_project(corpus_path, output_path, jobs)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(output_path)
+        best = elapsed if best is None else min(best, elapsed)
+    return throughput(stats, best)
+
+
+def run(corpus, repeat=3, jobs=1):
+    """
+    Generate the corpus described by the corpus arguments (see generate_corpus) in a temporary folder and
+    measure detector.inspect and analyze_project on it. Returns the benchmark result as a dict.
+    """
+    corpus_path = tempfile.mkdtemp()
+    try:
+        stats = generate_corpus(corpus_path, **corpus)
+        filenames = list(get_python_files(corpus_path))
+        result = {
+            "commit": git_commit(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "corpus": dict(corpus, loc=stats.loc),
+            "repeat": repeat,
+            "jobs": jobs,
+        }
+        result["inspect"] = bench_inspect(filenames, stats, repeat)
+        result["rules"] = bench_rules(filenames)
+        result["peak_rss_inspect_mb"] = peak_rss()
+        result["analyze_project"] = bench_analyze_project(corpus_path, stats, repeat, jobs)
+        result["peak_rss_mb"] = peak_rss()
+        return result
+    finally:
+        shutil.rmtree(corpus_path)
+
+
+def load_results(results_path):
+    if not os.path.exists(results_path):
+        return []
+    with open(results_path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def save_result(result, results_path):
+    with open(results_path, "a") as file:
+        file.write(json.dumps(result, sort_keys=True) + "\n")
+
+
+def previous_result(results, result):
+    # last stored run on the same corpus with the same settings
+    for previous in reversed(results):
+        if (previous["corpus"], previous["repeat"], previous["jobs"]) == \
+                (result["corpus"], result["repeat"], result["jobs"]):
+            return previous
+    return None
+
+
+def print_result(result, previous=None):
+    def change(stage):
+        if previous is None:
+            return ""
+        ratio = result[stage]["seconds"] / previous[stage]["seconds"] - 1
+        return f" ({ratio:+.1%} vs {previous['commit']})"
+
+    print(f"Commit {result['commit']}, corpus {result['corpus']}")
+    for stage in ("inspect", "analyze_project"):
+        timing = result[stage]
+        print(f"  {stage}: {timing['seconds']:.3f}s{change(stage)}, {timing['files_per_second']:.1f} files/s, "
+              f"{timing['functions_per_second']:.1f} functions/s, {timing['loc_per_second']:.0f} LOC/s")
+    if result["peak_rss_mb"] is not None:
+        print(f"  peak RSS: {result['peak_rss_mb']:.1f} MB")
+    rules = sorted(result["rules"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    for name, timing in rules[:10]:
+        print(f"  {name}: {timing['seconds']:.3f}s, {timing['calls']} calls")
+
+
+def main(args):
+    corpus = {"files": args.files, "functions": args.functions, "function_length": args.function_length,
+              "density": args.density, "libraries": args.libraries, "seed": args.seed}
+    result = run(corpus, args.repeat, args.jobs)
+    previous = previous_result(load_results(args.results), result)
+    print_result(result, previous)
+    if not args.no_save:
+        save_result(result, args.results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the CodeSmile detection engine on a synthetic corpus")
+    parser.add_argument("--files", type=int, default=200, help="Number of generated files")
+    parser.add_argument("--functions", type=int, default=10, help="Number of functions of each file")
+    parser.add_argument("--function_length", type=int, default=30, help="Number of statements of each function")
+    parser.add_argument("--density", type=float, default=0.3,
+                        help="Fraction of the statements using pandas, numpy, torch, tensorflow or sklearn")
+    parser.add_argument("--libraries", type=str, nargs="+",
+                        default=["pandas", "numpy", "torch", "tensorflow", "sklearn"],
+                        help="Libraries used by the generated code")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus generator")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each measure, the best one is kept")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of processes used by analyze_project")
+    parser.add_argument("--results", type=str, default=RESULTS_PATH,
+                        help="File where the results are appended, one JSON object per line")
+    parser.add_argument("--no_save", action="store_true", help="Only print the results")
+    args = parser.parse_args()
+    main(args)
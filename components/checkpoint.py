@@ -0,0 +1,124 @@
+import datetime
+import json
+import os
+import tempfile
+import threading
+
+CHECKPOINT_FILE = "checkpoint.json"
+JOURNAL_FILE = "checkpoint_files.jsonl"
+
+
+def write_atomically(path, text):
+    # write to a temporary file first and rename it, readers see either the old or the new content
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class Checkpoint:
+    """
+    Manifest of an analysis, saved in output_path/checkpoint.json: the state of each project, "started" when its
+    analysis begins, "done" once all its results are written and "failed" if its analysis raised an error.
+    The manifest is rewritten atomically on every change and can be shared by the threads analyzing projects
+    in parallel.
+    The previous manifest is loaded when resume is True, otherwise the analysis starts from scratch.
+    """
+
+    def __init__(self, output_path, resume=False):
+        self.path = os.path.join(output_path, CHECKPOINT_FILE)
+        self.projects = {}
+        self._lock = threading.Lock()
+        if resume and os.path.exists(self.path):
+            with open(self.path) as file:
+                self.projects = json.load(file)["projects"]
+
+    def is_done(self, project):
+        return self.projects.get(project, {}).get("state") == "done"
+
+    def start(self, project):
+        self._update(project, "started")
+
+    def finish(self, project):
+        self._update(project, "done")
+
+    def fail(self, project):
+        self._update(project, "failed")
+
+    def _update(self, project, state):
+        with self._lock:
+            self.projects[project] = {"state": state,
+                                      "date": datetime.datetime.now().isoformat(timespec="seconds")}
+            if not os.path.exists(os.path.dirname(os.path.abspath(self.path))):
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)))
+            write_atomically(self.path, json.dumps({"projects": self.projects}, indent=1, sort_keys=True))
+
+
+class FileJournal:
+    """
+    Per-file completion state of a project: the results of each analyzed file are appended as a JSON line to
+    output_path/checkpoint_files.jsonl once they are written, so an interrupted analysis of the project can be
+    resumed without analyzing these files again. A last line left incomplete by the interruption is discarded.
+    """
+
+    def __init__(self, output_path, filename=JOURNAL_FILE):
+        self.path = os.path.join(output_path, filename)
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def load(self):
+        """
+        Return the entries recorded so far (dicts with filename, rows, details, error and prescreen_misses),
+        in the order they were recorded, and drop the incomplete last line if any.
+        """
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        complete = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+                complete += len(line)
+        if complete < os.path.getsize(self.path):
+            with open(self.path, "r+b") as file:
+                file.truncate(complete)
+        return entries
+
+    def open(self, resume=False):
+        # a new analysis of the project discards the journal of the previous one
+        if not os.path.exists(os.path.dirname(os.path.abspath(self.path))):
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)))
+        self._file = open(self.path, "a" if resume else "w")
+
+    def record(self, filename, rows, details, error=None, prescreen_misses=()):
+        entry = {"filename": filename, "rows": rows, "details": details, "error": error,
+                 "prescreen_misses": list(prescreen_misses)}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -2,18 +2,106 @@
 #Please consider to use debug mode with debug_filter_repo function to avoid downloading a lot of data
 #The debug mode is used to test the code and the experiment setup
 
+import argparse
 import os
+import shutil
+import subprocess
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 BASE_PATH = "../input/projects/"
+GITHUB = "https://github.com/"
+# repositories cloned at the same time, cloning is bound by the network rather than the CPU
+MAX_WORKERS = 8
+
+# status is "cloned", "skipped" (already checked out) or "failed", error is the last git error of a failed clone
+CloneResult = namedtuple("CloneResult", ["repo_url", "path", "status", "seconds", "attempts", "error"])
+
 
-def get_repo(repo_url):
+def repo_path(repo_url, base_path=BASE_PATH):
     folder_url = repo_url.replace("/", "")
-    build_path = BASE_PATH+"/"+folder_url
+    return os.path.abspath(base_path + "/" + folder_url)
+
+
+def is_checkout(path):
+    # a complete clone: the clones are only moved to their folder once finished. A folder inside another repository
+    # (BASE_PATH is inside this one) is part of that repository, not a checkout
+    process = subprocess.run(["git", "-C", path, "rev-parse", "--show-toplevel"], capture_output=True, text=True)
+    if process.returncode != 0 or os.path.realpath(process.stdout.strip()) != os.path.realpath(path):
+        return False
+    return subprocess.run(["git", "-C", path, "rev-parse", "--verify", "HEAD"], capture_output=True).returncode == 0
+
+
+def get_repo(repo_url, base_path=BASE_PATH, depth=1, blobless=False, retries=3, backoff=2.0, host=GITHUB):
+    """
+    Clone host/repo_url in base_path unless it is already checked out. The clone is shallow (the last depth
+    commits, the whole history if depth is None) and blobless (the files of older commits are downloaded when
+    needed) if asked. A failed clone is tried again up to retries times, waiting backoff, 2 * backoff, ... seconds.
+    """
+    start = time.time()
+    build_path = repo_path(repo_url, base_path)
+    if os.path.exists(build_path):
+        if is_checkout(build_path):
+            return CloneResult(repo_url, build_path, "skipped", time.time() - start, 0, None)
+        if os.listdir(build_path):
+            # not a clone of the cloner, its files are left untouched
+            return CloneResult(repo_url, build_path, "failed", time.time() - start, 0,
+                               f"{build_path} exists and is not a git checkout, remove it to clone {repo_url}")
+        # left empty by an interrupted clone of an earlier version of the cloner
+        os.rmdir(build_path)
+
+    command = ["git", "clone", "--quiet"]
+    if depth is not None:
+        command += ["--depth", str(depth)]
+    if blobless:
+        command += ["--filter=blob:none"]
+    # cloned next to its folder and renamed when complete, an interrupted clone is never taken for a checkout
+    tmp_path = build_path + ".part"
+    error = None
+    for attempt in range(1, retries + 2):
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        process = subprocess.run(command + [host + repo_url, tmp_path], capture_output=True, text=True)
+        if process.returncode == 0:
+            os.replace(tmp_path, build_path)
+            return CloneResult(repo_url, build_path, "cloned", time.time() - start, attempt, None)
+        error = process.stderr.strip()
+        if attempt <= retries:
+            time.sleep(backoff * 2 ** (attempt - 1))
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    return CloneResult(repo_url, build_path, "failed", time.time() - start, retries + 1, error)
+
+
+def get_repos(repo_urls, base_path=BASE_PATH, max_workers=MAX_WORKERS, **options):
+    """
+    Clone the repositories with get_repo (options are passed to it), max_workers at a time.
+    Returns their CloneResult in the order of repo_urls, each one is printed once done.
+    """
+    if not os.path.exists(base_path):
+        os.makedirs(base_path)
+
+    def clone(repo_url):
+        result = get_repo(repo_url, base_path, **options)
+        print(f"{result.repo_url}: {result.status} in {result.seconds:.1f}s"
+              + (f" after {result.attempts} attempts" if result.attempts > 1 else "")
+              + (f" ({result.error})" if result.error else ""))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(clone, repo_urls))
+
+
+def print_report(results, seconds):
+    counts = {status: sum(result.status == status for result in results) for status in ("cloned", "skipped", "failed")}
+    print(f"{counts['cloned']} cloned, {counts['skipped']} already present, {counts['failed']} failed "
+          f"in {seconds:.1f}s")
+    slowest = sorted((result for result in results if result.status == "cloned"), key=lambda result: -result.seconds)
+    for result in slowest[:5]:
+        print(f"  {result.repo_url}: {result.seconds:.1f}s")
 
-    build_path = os.path.abspath(build_path)
-    if not os.path.exists(build_path):
-        os.mkdir(build_path)
-    os.system("git clone " + "https://github.com/"+repo_url + " " + build_path)
 
 def filter_repos(df,stars=200, commits=100):
     df = df[df["Engineered ML Project"] == 'Y']
@@ -29,18 +117,16 @@ def debug_filter_repo(df):
     df = df.head(30)
     return df
 
-def get_debug_projects():
+def get_debug_projects(**options):
     df = pd.read_csv("../input/dataset/NICHE.csv")
     df = filter_repos(df)
     df = debug_filter_repo(df)
-    for repo_url in df["GitHub_Repo"]:
-        get_repo(repo_url)
+    return get_repos(df["GitHub_Repo"], **options)
 
-def get_projects():
+def get_projects(**options):
     df = pd.read_csv("../input/dataset/NICHE.csv")
     df = filter_repos(df)
-    for repo_url in df["GitHub_Repo"]:
-        get_repo(repo_url)
+    return get_repos(df["GitHub_Repo"], **options)
 def clean():
     if os.name == "nt":
         if os.path.exists(".\\projects"):
@@ -59,10 +145,23 @@ def setup():
 
 
 if __name__ == "__main__":
-    clean()
-    setup()
-    get_debug_projects()
-
-
-
+    parser = argparse.ArgumentParser(description="Clone the repositories of the NICHE dataset")
+    parser.add_argument("--all", action="store_true", help="Clone all the selected projects, not only the small "
+                                                           "ones of the debug mode")
+    parser.add_argument("--max_workers", type=int, default=MAX_WORKERS, help="Repositories cloned at the same time")
+    parser.add_argument("--depth", type=int, default=1, help="Commits of history cloned, 0 for the whole history")
+    parser.add_argument("--blobless", action="store_true",
+                        help="Do not download the files of older commits (only useful with --depth 0)")
+    parser.add_argument("--retries", type=int, default=3, help="Times a failed clone is tried again")
+    parser.add_argument("--clean", action="store_true", help="Delete the projects cloned before, instead of skipping "
+                                                             "them")
+    args = parser.parse_args()
 
+    if args.clean:
+        clean()
+    setup()
+    start = time.time()
+    options = dict(max_workers=args.max_workers, depth=args.depth or None, blobless=args.blobless,
+                   retries=args.retries)
+    results = get_projects(**options) if args.all else get_debug_projects(**options)
+    print_report(results, time.time() - start)
@@ -0,0 +1,76 @@
+import atexit
+import threading
+
+from components.output_format import TableWriter, output_file
+
+DETAIL_COLUMNS = ["filename", "function_name", "smell_name", "line"]
+# number of rows kept in memory before they are written to the files
+BUFFER_SIZE = 1000
+
+_open_writers = set()
+_open_writers_lock = threading.Lock()
+
+
+class DetailWriter:
+    """
+    Append-only writer of the detailed smell instances, saved in output_path in one <smell_name> file per smell
+    in output_format (see OUTPUT_FORMATS).
+    Rows are buffered in memory and appended to the files in batches, files are kept open until close().
+    Writers that are still open when the interpreter exits are flushed by an atexit hook.
+    """
+
+    def __init__(self, output_path, buffer_size=BUFFER_SIZE, output_format="csv"):
+        self.output_path = output_path
+        self.buffer_size = buffer_size
+        self.output_format = output_format
+        self._buffers = {}
+        self._buffered = 0
+        self._files = {}
+        with _open_writers_lock:
+            _open_writers.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, smell_list):
+        for smell in smell_list:
+            self._buffers.setdefault(smell["smell_name"], []).append([smell[column] for column in DETAIL_COLUMNS])
+        self._buffered += len(smell_list)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def _open(self, smell_name):
+        writer = TableWriter(output_file(self.output_path, smell_name, self.output_format), DETAIL_COLUMNS,
+                             self.output_format)
+        self._files[smell_name] = writer
+        return writer
+
+    def flush(self):
+        for smell_name, rows in self._buffers.items():
+            if not rows:
+                continue
+            writer = self._files.get(smell_name) or self._open(smell_name)
+            writer.write(rows)
+            rows.clear()
+        self._buffered = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for writer in self._files.values():
+                writer.close()
+            self._files.clear()
+            with _open_writers_lock:
+                _open_writers.discard(self)
+
+
+@atexit.register
+def _close_open_writers():
+    with _open_writers_lock:
+        writers = list(_open_writers)
+    for writer in writers:
+        writer.close()
@@ -1,114 +1,119 @@
+import ast
 import os
 import pandas as pd
 
-from cs_detector.code_extractor.libraries import extract_libraries
-from cs_detector.detection_rules.Generic import *
-from cs_detector.detection_rules.APISpecific import *
-from cs_detector.code_extractor.models import load_model_dict, load_tensor_operations_dict
-from cs_detector.code_extractor.dataframe_detector import load_dataframe_dict
+from cs_detector.code_extractor.libraries import ImportTable, extract_libraries
+from cs_detector.code_extractor.function_context import function_context, analysis_scopes, SourceLines
+from cs_detector.detection_rules.registry import RULES, applicable_rules, may_apply, screen_rules
+from cs_detector.code_extractor.dictionaries import get_dictionaries
+from components.detail_writer import DetailWriter
+from components.profiler import NULL_PROFILE
 
+COLUMNS = ["filename", "function_name", "smell", "name_smell", "message"]
 
-def rule_check(node, libraries, filename, df_output,models,output_path):
-    #create dictionaries and libraries useful for detection
-    dataframe_path = os.path.abspath("obj_dictionaries/dataframes.csv")
-    df_dict = load_dataframe_dict(dataframe_path)
-    tensor_dict = load_tensor_operations_dict()
+
+def rule_check(node, libraries, filename, rows,details, profile=NULL_PROFILE, rules=RULES):
+    # dictionaries are loaded once per process and shared by all the rules
+    dictionaries = get_dictionaries()
+    # the rules take an ImportTable, libraries can also be a plain list of import strings
+    libraries = ImportTable.of(libraries)
+    # walk the function once, every rule reads the nodes it needs from the shared index
+    context = function_context(node)
     #start detection
-    deterministic, deterministic_list = deterministic_algorithm_option_not_used(libraries, filename, node)
-    merge, merge_list = merge_api_parameter_not_explicitly_set(libraries, filename, node,df_dict)
-    columns_and_data, columns_and_data_list = columns_and_datatype_not_explicitly_set(libraries, filename, node,df_dict)
-    empty, empty_list = empty_column_misinitialization(libraries, filename, node,df_dict)
-    nan_equivalence, nan_equivalence_list = nan_equivalence_comparison_misused(libraries, filename, node)
-    inplace, inplace_list = in_place_apis_misused(libraries, filename, node,df_dict)
-    memory_not, memory_not_list = memory_not_freed(libraries, filename, node, models)
-    chain, chain_list = Chain_Indexing(libraries, filename, node,df_dict)
-    dataframe_conversion, dataframe_conversion_list = dataframe_conversion_api_misused(libraries, filename, node,df_dict)
-    matrix_mul, matrix_mul_list = matrix_multiplication_api_misused(libraries, filename, node)
-    gradients, gradients_list = gradients_not_cleared_before_backward_propagation(libraries, filename, node)
-    tensor, tensor_list = tensor_array_not_used(libraries, filename, node)
-    pytorch, pytorch_list = pytorch_call_method_misused(libraries, filename, node)
-    unnecessary_iterations, unnecessary_iterations_list = unnecessary_iteration(libraries, filename, node, df_dict)
-    hyper_parameters, hyper_parameters_list = hyperparameters_randomness_not_explicitly_set(libraries, filename, node,models)
-    broadcasting_not_used,broadcasting_not_used_list = broadcasting_feature_not_used(libraries, filename, node,tensor_dict)
-    if deterministic:
-        df_output.loc[len(df_output)] = deterministic
-        save_single_file(filename, deterministic_list,output_path)
-    if merge:
-        df_output.loc[len(df_output)] = merge
-        save_single_file(filename, merge_list,output_path)
-    if columns_and_data:
-        df_output.loc[len(df_output)] = columns_and_data
-        save_single_file(filename, columns_and_data_list,output_path)
-    if empty:
-        df_output.loc[len(df_output)] = empty
-        save_single_file(filename, empty_list,output_path)
-    if nan_equivalence:
-        df_output.loc[len(df_output)] = nan_equivalence
-        save_single_file(filename, nan_equivalence_list,output_path)
-    if inplace:
-        df_output.loc[len(df_output)] = inplace
-        save_single_file(filename, inplace_list,output_path)
-    if memory_not:
-        df_output.loc[len(df_output)] = memory_not
-        save_single_file(filename, memory_not_list,output_path)
-    if chain:
-        df_output.loc[len(df_output)] = chain
-        save_single_file(filename, chain_list,output_path)
-    if dataframe_conversion:
-        df_output.loc[len(df_output)] = dataframe_conversion
-        save_single_file(filename, dataframe_conversion_list,output_path)
-    if matrix_mul:
-        df_output.loc[len(df_output)] = matrix_mul
-        save_single_file(filename, matrix_mul_list,output_path)
-    if gradients:
-        df_output.loc[len(df_output)] = gradients
-        save_single_file(filename, gradients_list,output_path)
-    if tensor:
-        df_output.loc[len(df_output)] = tensor
-        save_single_file(filename, tensor_list,output_path)
-    if pytorch:
-        df_output.loc[len(df_output)] = pytorch
-        save_single_file(filename,pytorch_list, output_path)
-    if unnecessary_iterations:
-        df_output.loc[len(df_output)] = unnecessary_iterations
-        save_single_file(filename, unnecessary_iterations_list,output_path)
-    if broadcasting_not_used:
-        df_output.loc[len(df_output)] = broadcasting_not_used
-        save_single_file(filename, broadcasting_not_used_list,output_path)
-    if hyper_parameters:
-        df_output.loc[len(df_output)] = hyper_parameters
-        save_single_file(filename, hyper_parameters_list,output_path)
+    for rule in rules:
+        if not context.has_nodes(rule.node_types):
+            continue
+        profile.start()
+        if rule.dictionary is None:
+            smell, smell_list = rule.function(libraries, filename, node)
+        else:
+            smell, smell_list = rule.function(libraries, filename, node, getattr(dictionaries, rule.dictionary))
+        profile.stop("rule:" + rule.name)
+        if smell:
+            rows.append(smell)
+            details.append(smell_list)
 
-    return df_output
+    return rows
 def save_single_file(filename, smell_list,output_path):
-    cols = ["filename", "function_name", "smell_name", "line"]
-    if os.path.exists(f'{output_path}/{smell_list[0]["smell_name"]}.csv'):
-        to_save = pd.read_csv(f'{output_path}/{smell_list[0]["smell_name"]}.csv')
-    else:
-        to_save = pd.DataFrame(columns=cols)
-    for smell in smell_list:
-        to_save.loc[len(to_save)] = smell
-    smell_name = smell_list[0]['smell_name']
-    to_save.to_csv(f'{output_path}/{smell_name}.csv', index=False)
+    with DetailWriter(output_path) as writer:
+        writer.write(smell_list)
+
+
 def inspect(filename, output_path):
-    col = ["filename", "function_name", "smell", "name_smell", "message"]
-    to_save = pd.DataFrame(columns=col)
+    rows, details = detect(filename)
+    with DetailWriter(output_path) as writer:
+        for smell_list in details:
+            writer.write(smell_list)
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def read_source(filename):
     file_path = os.path.join(filename)
     try:
         with open(file_path, "rb") as file:
-            source = file.read()
+            return file.read()
     except FileNotFoundError as e:
         message = f"Error in file {filename}: {e}"
         raise FileNotFoundError(message)
+
+
+def detect(filename, source=None, profile=NULL_PROFILE, prescreen=False):
+    """
+    Run all the detection rules on filename without writing anything, source is read from filename if not given.
+    Returns the smells found as a list of rows (one for each function and smell, with the values of COLUMNS)
+    and the list of detailed smell instances of each row, to be saved with save_single_file.
+    The time of each phase and rule is recorded in profile (a FileProfile) when given.
+    Files that do not import any of the libraries the rules apply to are not analyzed, the files that do not even
+    mention them are only parsed, so their syntax errors are still reported.
+    With prescreen only the rules whose trigger tokens occur in the source are run (see screen_rules), and the
+    file is not parsed when there is none.
+    """
+    rows = []
+    details = []
+    if source is None:
+        profile.start()
+        source = read_source(filename)
+        profile.stop("read")
+    dictionaries = get_dictionaries()
+    profile.start()
+    if prescreen:
+        screened = screen_rules(source, dictionaries)
+        relevant = bool(screened)
+    else:
+        screened = RULES
+        relevant = may_apply(source, dictionaries)
+    profile.stop("prefilter")
+    if not relevant and prescreen:
+        return rows, details
     try:
+        profile.start()
         tree = ast.parse(source)
+        profile.stop("parse")
+        if not relevant:
+            return rows, details
+        profile.start()
         libraries = extract_libraries(tree)
-        models = load_model_dict()
-        # Visita i nodi dell'albero dell'AST alla ricerca di funzioni
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                rule_check(node, libraries, filename, to_save,models,output_path)
+        rules = [rule for rule in applicable_rules(libraries, dictionaries) if rule in screened]
+        profile.stop("libraries")
+        if not rules:
+            return rows, details
+        source_lines = SourceLines(source)
+        # module-level code and every (async) function, each body is analyzed once
+        for node in analysis_scopes(tree):
+            profile.start()
+            function_context(node).source = source_lines
+            profile.stop("index")
+            rule_check(node, libraries, filename, rows,details, profile, rules)
     except SyntaxError as e:
         message = f"Error in file {filename}: {e}"
         raise SyntaxError(message)
-    return to_save
+    return rows, details
+
+
+def prescreen_misses(source, rows):
+    """
+    Correctness check of the pre-parse screening: return the smells reported in rows (the result of a full detect
+    of source) by rules that screen_rules would have skipped. It is empty when the screening is correct.
+    """
+    screened = {rule.name for rule in screen_rules(source, get_dictionaries())}
+    return sorted({row[3] for row in rows if row[3] not in screened})
@@ -0,0 +1,162 @@
+import fnmatch
+import os
+import re
+
+# directories and files that are never analyzed, written as .gitignore patterns relative to the project folder
+DEFAULT_EXCLUDE = ["venv/", ".venv/", "lib/", "site-packages/", ".tox/", ".nox/", "node_modules/", "build/",
+                   "dist/", ".eggs/", "*.egg-info/", "__pycache__/", ".git/", "tests/"]
+# files bigger than this (e.g. generated code) are skipped
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+
+class IgnorePattern:
+    """
+    A single .gitignore pattern, base is the folder (relative to the project, with a trailing '/' or empty)
+    of the file that defines it.
+    Supported syntax: comments, negation with '!', directory-only patterns ending with '/', anchored patterns
+    (with a '/' at the beginning or in the middle), '*', '?', '[...]' and '**'.
+    """
+
+    def __init__(self, pattern, base=""):
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        self.directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        self.anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        self.base = base
+        self.regex = re.compile(translate(pattern) if self.anchored else fnmatch.translate(pattern))
+
+    def match(self, relative_path, is_dir):
+        """
+        Return True if the pattern matches relative_path, a path relative to the project using '/' as separator.
+        """
+        if self.directory_only and not is_dir:
+            return False
+        if not relative_path.startswith(self.base):
+            return False
+        if self.anchored:
+            return self.regex.match(relative_path[len(self.base):]) is not None
+        return self.regex.match(relative_path.rsplit("/", 1)[-1]) is not None
+
+
+def translate(pattern):
+    """
+    Translate an anchored .gitignore pattern to a regular expression where '*' does not match '/'.
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            content = pattern[i + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex += "[" + content.replace("\\", "\\\\") + "]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex + r"\Z"
+
+
+def parse_patterns(lines, base=""):
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        patterns.append(IgnorePattern(line, base))
+    return patterns
+
+
+def is_ignored(patterns, relative_path, is_dir):
+    # as in git, the last matching pattern decides
+    ignored = False
+    for pattern in patterns:
+        if pattern.match(relative_path, is_dir):
+            ignored = not pattern.negate
+    return ignored
+
+
+class FileDiscovery:
+    """
+    Finds the Python files of a project. Files are yielded while the folders are scanned, sorted by name,
+    skipping the folders and files matched by the exclude patterns or by the .gitignore files of the project,
+    and the files bigger than max_file_size bytes (None for no limit).
+    """
+
+    def __init__(self, exclude=None, max_file_size=DEFAULT_MAX_FILE_SIZE, use_gitignore=True):
+        self.exclude = list(DEFAULT_EXCLUDE if exclude is None else exclude)
+        self.max_file_size = max_file_size
+        self.use_gitignore = use_gitignore
+        # parsed by the first call of is_excluded
+        self._exclude_patterns = None
+
+    def is_excluded(self, relative_path, size=None):
+        """
+        Return True if files would skip the file at relative_path (relative to the project, with '/' separators):
+        it or one of its folders matches the exclude patterns, or it is bigger than max_file_size.
+        The .gitignore files are not read, it is used for the files tracked by git.
+        """
+        if self._exclude_patterns is None:
+            self._exclude_patterns = parse_patterns(self.exclude)
+        patterns = self._exclude_patterns
+        folders = relative_path.split("/")[:-1]
+        for i in range(1, len(folders) + 1):
+            if is_ignored(patterns, "/".join(folders[:i]), True):
+                return True
+        if is_ignored(patterns, relative_path, False):
+            return True
+        return self.max_file_size is not None and size is not None and size > self.max_file_size
+
+    def files(self, path):
+        if os.path.isfile(path):
+            if path.endswith(".py"):
+                yield path
+            return
+        root = os.path.abspath(path)
+        yield from self._scan(root, "", parse_patterns(self.exclude))
+
+    def _scan(self, folder, relative_folder, patterns):
+        if self.use_gitignore:
+            gitignore = os.path.join(folder, ".gitignore")
+            if os.path.isfile(gitignore):
+                with open(gitignore, encoding="utf-8", errors="replace") as file:
+                    patterns = patterns + parse_patterns(file, relative_folder)
+        try:
+            with os.scandir(folder) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            relative_path = relative_folder + entry.name
+            try:
+                # symbolic links to folders are not followed, as in os.walk
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_ignored(patterns, relative_path, True):
+                        yield from self._scan(entry.path, relative_path + "/", patterns)
+                    continue
+                if not entry.name.endswith(".py") or is_ignored(patterns, relative_path, False):
+                    continue
+                if self.max_file_size is not None and entry.stat().st_size > self.max_file_size:
+                    continue
+            except OSError:
+                continue
+            yield entry.path
@@ -0,0 +1,71 @@
+import subprocess
+import threading
+from collections import namedtuple
+
+from components.discovery import FileDiscovery
+
+# a Python file of a revision: its path in the repository (with '/' separators), blob id and size in bytes
+GitFile = namedtuple("GitFile", ["path", "blob", "size"])
+# mode of the symbolic links, their blob is the target path
+SYMLINK_MODE = "120000"
+
+
+def revision_files(repo, revision, discovery=None):
+    """
+    The Python files of repo at revision not excluded by discovery (see FileDiscovery.is_excluded), sorted by path,
+    listed from the tree of the revision without checking it out.
+    """
+    if discovery is None:
+        discovery = FileDiscovery()
+    process = subprocess.run(["git", "-C", repo, "ls-tree", "-r", "-l", "-z", "--full-tree", revision],
+                             capture_output=True)
+    if process.returncode != 0:
+        raise ValueError(f"Unknown revision {revision} of {repo}: {process.stderr.decode(errors='replace').strip()}")
+    files = []
+    for entry in process.stdout.split(b"\0"):
+        if not entry:
+            continue
+        info, path = entry.decode("utf-8", errors="surrogateescape").split("\t", 1)
+        mode, object_type, blob, size = info.split()
+        if object_type != "blob" or mode == SYMLINK_MODE or not path.endswith(".py"):
+            continue
+        if not discovery.is_excluded(path, int(size)):
+            files.append(GitFile(path, blob, int(size)))
+    return sorted(files)
+
+
+class BlobReader:
+    """
+    Reads the content of blobs from repo through a single `git cat-file --batch` process, so reading a file costs
+    a round trip on a pipe instead of a process or a checkout. It can be shared by threads, reads are serialized.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._process = subprocess.Popen(["git", "-C", repo, "cat-file", "--batch"], stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self, blob):
+        with self._lock:
+            self._process.stdin.write(blob.encode() + b"\n")
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().split()
+            if len(header) != 3:
+                raise FileNotFoundError(f"Blob {blob} not found in {self.repo}")
+            content = self._process.stdout.read(int(header[2]))
+            # the content is followed by a newline
+            self._process.stdout.read(1)
+            return content
+
+    def close(self):
+        # git exits at the end of its input
+        self._process.stdin.close()
+        self._process.wait()
+        self._process.stdout.close()
@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+
+from components.checkpoint import FileJournal, write_atomically
+from components.result_cache import ruleset_version
+
+# results of every file of the last analysis of a project, in the format of the FileJournal
+INDEX_FILE = "file_results.jsonl"
+# commit of the last analysis of a project and the files it found modified but not committed
+STATE_FILE = "incremental.json"
+
+
+def git(project_path, *args):
+    return subprocess.run(["git", "-C", project_path] + list(args), capture_output=True, check=True).stdout
+
+
+def git_paths(project_path, *args):
+    # paths printed by a git command run with -z, relative to project_path
+    output = git(project_path, *args)
+    return {os.path.abspath(os.path.join(project_path, path.decode())) for path in output.split(b"\0") if path}
+
+
+def head_commit(project_path):
+    """
+    Commit checked out in project_path, None if it is not a git repository (or has no commit).
+    """
+    try:
+        return git(project_path, "rev-parse", "--verify", "HEAD").decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def changed_files(project_path, base):
+    """
+    Absolute paths of the files of project_path added, modified, deleted or renamed (both paths) since the commit
+    base, including the changes not committed and the files not tracked. None if git cannot compare them.
+    """
+    try:
+        return (git_paths(project_path, "diff", "--name-only", "--no-renames", "--relative", "-z", base) |
+                git_paths(project_path, "ls-files", "--others", "--exclude-standard", "-z"))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class IncrementalIndex:
+    """
+    Results of the last analysis of a project kept in its output_path, so the next analysis only goes through the
+    files changed since then: the results of each file (INDEX_FILE) and the commit they were produced from
+    (STATE_FILE), with the version of the rules and the prescreen mode, since other rules give other results.
+    The files excluded by other discovery options are not tracked, run a full analysis after changing them.
+    """
+
+    def __init__(self, output_path, project_path, prescreen="off"):
+        self.index = FileJournal(output_path, INDEX_FILE)
+        self.state_path = os.path.join(output_path, STATE_FILE)
+        self.prescreen = prescreen
+        self.project = os.path.abspath(project_path)
+        # the commit and the changes not committed are taken before any file is read
+        self.commit = head_commit(project_path)
+        self.dirty = sorted(changed_files(project_path, self.commit) or ()) if self.commit is not None else []
+
+    def unchanged(self, base=None):
+        """
+        Entries of the index whose files did not change since base (by default the commit of the last analysis),
+        or no entry when the changes cannot be found: the whole project is analyzed again.
+        """
+        if not os.path.exists(self.state_path):
+            return []
+        with open(self.state_path) as file:
+            state = json.load(file)
+        if state["version"] != ruleset_version() or state["prescreen"] != self.prescreen:
+            print("Rules changed since the last analysis, analyzing all the files.")
+            return []
+        if state["project"] != self.project:
+            print("Project moved since the last analysis, analyzing all the files.")
+            return []
+        base = base or state["commit"]
+        changed = changed_files(self.project, base) if base is not None else None
+        if changed is None:
+            print("Changes since the last analysis not found, analyzing all the files.")
+            return []
+        # files modified but not committed then may have been restored since
+        changed.update(state["dirty"])
+        print(f"{len(changed)} files changed since {base}.")
+        return [entry for entry in self.index.load() if os.path.abspath(entry["filename"]) not in changed]
+
+    def save(self, journal):
+        """
+        Keep the journal of a finished analysis of the project (with the results of all its files) as the index.
+        """
+        journal.close()
+        os.replace(journal.path, self.index.path)
+        write_atomically(self.state_path, json.dumps({"project": self.project, "commit": self.commit,
+                                                      "dirty": self.dirty, "version": ruleset_version(),
+                                                      "prescreen": self.prescreen}, indent=1))
@@ -0,0 +1,146 @@
+import csv
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # the parquet and feather formats need pyarrow
+    pa = None
+
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+# columns with a few distinct (and long) values, stored dictionary-encoded in the columnar formats
+DICTIONARY_COLUMNS = frozenset(["name_smell", "message", "smell_name"])
+INTEGER_COLUMNS = frozenset(["index", "smell", "line"])
+
+
+def output_file(output_path, name, output_format="csv"):
+    return os.path.join(output_path, name + EXTENSIONS[output_format])
+
+
+def check_output_format(output_format):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format}, expected one of {', '.join(OUTPUT_FORMATS)}")
+    if output_format != "csv" and pa is None:
+        raise ImportError(f"The {output_format} output format needs pyarrow (pip install pyarrow)")
+
+
+def table_schema(columns):
+    fields = []
+    for column in columns:
+        if column in INTEGER_COLUMNS:
+            fields.append(pa.field(column, pa.int64()))
+        elif column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+class TableWriter:
+    """
+    Writes rows (lists of values in the order of columns) to a table file in one of OUTPUT_FORMATS, the file is
+    created by the first write, even of no rows. CSV files are appended to, with the header only written in new
+    files. Parquet and feather files are written again from scratch: each write adds a row group (a record batch
+    for feather), so rows can be written in batches without keeping them in memory.
+    """
+
+    def __init__(self, path, columns, output_format="csv"):
+        check_output_format(output_format)
+        self.path = path
+        self.columns = list(columns)
+        self.output_format = output_format
+        self._schema = table_schema(self.columns) if output_format != "csv" else None
+        self._file = None
+        self._writer = None
+        # dictionary of each dictionary-encoded column, it only grows so that batches share it
+        self._dictionaries = {column: {} for column in self.columns if column in DICTIONARY_COLUMNS}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self):
+        if not os.path.exists(os.path.dirname(os.path.abspath(self.path))):
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)))
+        if self.output_format == "csv":
+            self._file = open(self.path, "a", newline="")
+            self._writer = csv.writer(self._file, lineterminator="\n")
+            if self._file.tell() == 0:
+                self._writer.writerow(self.columns)
+        elif self.output_format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(self.path, self._schema,
+                                           options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def write(self, rows):
+        if self._writer is None:
+            self._open()
+        if self.output_format == "csv":
+            self._writer.writerows(rows)
+            self._file.flush()
+            return
+        self._writer.write_table(self._table(rows))
+
+    def _table(self, rows):
+        arrays = []
+        for i, column in enumerate(self.columns):
+            values = [row[i] for row in rows]
+            dictionary = self._dictionaries.get(column)
+            if dictionary is None:
+                arrays.append(pa.array(values, self._schema.field(column).type))
+                continue
+            indices = [dictionary.setdefault(value, len(dictionary)) for value in values]
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()),
+                                                         pa.array(list(dictionary), pa.string())))
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+        self._file = None
+        self._writer = None
+
+
+def read_table(path, columns=None, categories=True):
+    """
+    Read a table written by a TableWriter as a DataFrame, the format is given by the extension of path.
+    Only the given columns are read when columns is not None, dictionary-encoded columns are read as categories
+    unless categories is False, then they hold plain values as in the CSV format.
+    """
+    if path.endswith(EXTENSIONS["parquet"]):
+        df = pd.read_parquet(path, columns=columns)
+    elif path.endswith(EXTENSIONS["feather"]):
+        df = pd.read_feather(path, columns=columns)
+    else:
+        return pd.read_csv(path, usecols=columns)
+    if not categories:
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(df[column].cat.categories.dtype)
+    return df
+
+
+def read_rows(path):
+    """
+    Return the columns of the table at path and an iterator over its rows, one batch of the file at a time.
+    """
+    if path.endswith(EXTENSIONS["parquet"]):
+        parquet_file = pa.parquet.ParquetFile(path)
+        batches = parquet_file.iter_batches()
+        columns = parquet_file.schema_arrow.names
+    elif path.endswith(EXTENSIONS["feather"]):
+        reader = pa.ipc.open_file(path)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        columns = reader.schema.names
+    else:
+        raise ValueError(f"{path} is not a parquet or feather file")
+    return columns, (list(row) for batch in batches for row in zip(*(column.to_pylist() for column in batch.columns)))
@@ -0,0 +1,93 @@
+import csv
+import os
+import threading
+
+from components.output_format import TableWriter, check_output_format, output_file, read_rows
+
+OVERVIEW_FILE = "overview_output"
+# position of each row in the to_save file it comes from, as written by the former pandas merge
+INDEX_COLUMN = "index"
+# rows written to the overview at a time
+BATCH_SIZE = 1000
+
+
+class OverviewMerger:
+    """
+    Streams the to_save file of each project into output_dir/overview_output one batch of rows at a time, so the
+    memory used does not depend on the size of the outputs. Projects can be added as soon as they are analyzed, also
+    by several threads. The header is written once, the header rows repeated inside a to_save.csv (the file is
+    appended to by every analysis) and blank lines are skipped. The overview is only created with the first row.
+    """
+
+    def __init__(self, output_dir, output_format="csv"):
+        check_output_format(output_format)
+        self.output_format = output_format
+        self.path = output_file(output_dir, OVERVIEW_FILE, output_format)
+        self.columns = None
+        self.rows = 0
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, to_save_path):
+        """
+        Append the rows of to_save_path (a to_save file in the output format of the merger) to the overview,
+        returning their number.
+        """
+        with self._lock:
+            if self.output_format != "csv":
+                header, rows = read_rows(to_save_path)
+                return self._add(header, enumerate(rows))
+            with open(to_save_path, newline="") as file:
+                reader = csv.reader(file)
+                header = next(reader, None)
+                return self._add(header, csv_rows(reader, header))
+
+    def _add(self, header, indexed_rows):
+        added = 0
+        batch = []
+        for index, row in indexed_rows:
+            if self._writer is None:
+                self._open(header)
+            if header != self.columns or len(row) != len(header):
+                # columns are matched by name when the files do not have the same layout
+                values = dict(zip(header, row))
+                row = [values.get(column) for column in self.columns]
+            batch.append([index] + row)
+            if len(batch) >= BATCH_SIZE:
+                self._writer.write(batch)
+                batch = []
+            added += 1
+        if batch:
+            self._writer.write(batch)
+        self.rows += added
+        return added
+
+    def _open(self, header):
+        # the overview of a previous analysis is replaced
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.columns = header
+        self._writer = TableWriter(self.path, [INDEX_COLUMN] + header, self.output_format)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+def csv_rows(reader, header):
+    # (index, row) of the data rows of a csv file, the index counts the repeated headers but not the blank lines
+    index = 0
+    for row in reader:
+        if not row:
+            continue
+        if row != header:
+            yield index, row
+        index += 1
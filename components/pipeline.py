@@ -0,0 +1,83 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# number of files read ahead of the detection, bounds the sources kept in memory
+READ_AHEAD = 64
+# threads reading the files, reads release the GIL so they overlap parsing and detection
+READERS = 4
+# number of results waiting to be written before the detection is blocked
+WRITE_QUEUE_SIZE = 64
+
+
+def read_ahead(items, read, readers=READERS, depth=READ_AHEAD):
+    """
+    Yield (item, read(item)) for each item, in the same order as items, while the next items are read by a pool
+    of threads. At most depth reads are in flight or waiting to be consumed.
+    If read raises an exception None is yielded in place of the result.
+    """
+    with ThreadPoolExecutor(max_workers=readers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(read, item)))
+            if len(pending) >= depth:
+                yield _result(*pending.popleft())
+        while pending:
+            yield _result(*pending.popleft())
+
+
+def _result(item, future):
+    try:
+        return item, future.result()
+    except Exception:
+        return item, None
+
+
+class BackgroundWriter:
+    """
+    Consumes the items put in a bounded queue in a separate thread, so that writing the results overlaps the
+    detection. put blocks while the queue is full. An exception raised by consume is raised again by the next
+    put or by close.
+    """
+
+    _DONE = object()
+
+    def __init__(self, consume, maxsize=WRITE_QUEUE_SIZE):
+        self.consume = consume
+        self._queue = queue.Queue(maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if self._error is None:
+                try:
+                    self.consume(item)
+                except BaseException as e:
+                    self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def put(self, item):
+        self._raise_error()
+        self._queue.put(item)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._DONE)
+            self._thread.join()
+        self._raise_error()
@@ -0,0 +1,145 @@
+import csv
+import json
+import math
+import os
+import threading
+import time
+
+# number of files listed in the slowest_files section of the report
+TOP_FILES = 20
+PERCENTILES = (50, 95, 99)
+
+
+class FileProfile:
+    """
+    Wall and CPU time spent on a single file, by phase: read, cache, parse, libraries and one
+    "rule:<name>" phase for each detection rule. CPU time is the time of the current thread,
+    so the threads reading and writing files are not counted.
+    Phases are measured with start() followed by stop(phase), they cannot be nested.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        # phase -> [calls, wall, cpu]
+        self.phases = {}
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def start(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def stop(self, phase):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        timing = self.phases.get(phase)
+        if timing is None:
+            self.phases[phase] = [1, wall, cpu]
+        else:
+            timing[0] += 1
+            timing[1] += wall
+            timing[2] += cpu
+
+    @property
+    def wall(self):
+        return sum(timing[1] for timing in self.phases.values())
+
+    @property
+    def cpu(self):
+        return sum(timing[2] for timing in self.phases.values())
+
+
+class NullProfile:
+    """
+    Used when profiling is disabled, so the detector does not need to check for it.
+    """
+
+    def start(self):
+        pass
+
+    def stop(self, phase):
+        pass
+
+
+NULL_PROFILE = NullProfile()
+
+
+def percentile(sorted_values, q):
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Profiler:
+    """
+    Collects the FileProfile of every analyzed file and writes the profile report:
+    profile_files.csv with the time of each file and phase, and profile.json with the slowest files,
+    the phases and rules ranked by cumulative time and the p50/p95/p99 of the time per file.
+    """
+
+    def __init__(self):
+        self.files = []
+        self._lock = threading.Lock()
+
+    def add(self, file_profile):
+        with self._lock:
+            self.files.append(file_profile)
+
+    def phases(self):
+        """
+        Return the summary of each phase sorted by cumulative wall time, percentiles are computed on the
+        time spent in the phase by each file.
+        """
+        totals = {}
+        for file_profile in self.files:
+            for phase, (calls, wall, cpu) in file_profile.phases.items():
+                total = totals.setdefault(phase, {"phase": phase, "files": 0, "calls": 0, "wall": 0.0, "cpu": 0.0,
+                                                  "per_file": []})
+                total["files"] += 1
+                total["calls"] += calls
+                total["wall"] += wall
+                total["cpu"] += cpu
+                total["per_file"].append(wall)
+        summary = []
+        for total in totals.values():
+            per_file = sorted(total.pop("per_file"))
+            for q in PERCENTILES:
+                total[f"p{q}"] = percentile(per_file, q)
+            summary.append(total)
+        return sorted(summary, key=lambda total: total["wall"], reverse=True)
+
+    def report(self):
+        file_walls = sorted(file_profile.wall for file_profile in self.files)
+        slowest = sorted(self.files, key=lambda file_profile: file_profile.wall, reverse=True)[:TOP_FILES]
+        return {
+            "files": len(self.files),
+            "wall": sum(file_walls),
+            "cpu": sum(file_profile.cpu for file_profile in self.files),
+            "file_percentiles": {f"p{q}": percentile(file_walls, q) for q in PERCENTILES},
+            "slowest_files": [{"filename": file_profile.filename, "wall": file_profile.wall, "cpu": file_profile.cpu}
+                              for file_profile in slowest],
+            "phases": self.phases(),
+        }
+
+    def write(self, output_path):
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+        with open(os.path.join(output_path, "profile_files.csv"), "w", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(["filename", "phase", "calls", "wall", "cpu"])
+            for file_profile in self.files:
+                for phase, (calls, wall, cpu) in file_profile.phases.items():
+                    writer.writerow([file_profile.filename, phase, calls, wall, cpu])
+        report = self.report()
+        with open(os.path.join(output_path, "profile.json"), "w") as file:
+            json.dump(report, file, indent=2)
+        return report
+
+
+def print_report(report, top=10):
+    print(f"Profiled {report['files']} files: wall {report['wall']:.2f}s, cpu {report['cpu']:.2f}s, "
+          + ", ".join(f"{name} {value * 1000:.1f}ms" for name, value in report["file_percentiles"].items()))
+    for total in report["phases"][:top]:
+        print(f"  {total['phase']}: {total['wall']:.3f}s wall, {total['cpu']:.3f}s cpu, {total['calls']} calls")
@@ -0,0 +1,157 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from cs_detector.code_extractor.dictionaries import get_dictionaries
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def ruleset_version():
+    """
+    Digest of the detection code and of the obj_dictionaries: cached results are only reused
+    if they were produced by the same rules with the same dictionaries.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = sorted(glob.glob(os.path.join(root, "cs_detector", "**", "*.py"), recursive=True))
+    sources.append(os.path.join(root, "components", "detector.py"))
+    digest = hashlib.sha1(get_dictionaries().version.encode())
+    for path in sources:
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+class CacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.evictions = 0
+        self.bytes_evicted = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit, size):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.bytes_read += size
+            else:
+                self.misses += 1
+                self.bytes_written += size
+
+    def __str__(self):
+        return f"hits={self.hits}, misses={self.misses}, read={self.bytes_read}B, written={self.bytes_written}B, " \
+               f"evictions={self.evictions} ({self.bytes_evicted}B)"
+
+
+class ResultCache:
+    """
+    On-disk cache of the smells of a file, keyed by the file content, the version of the rules and whether the
+    rules were screened (prescreen, which can report fewer smells).
+    Entries are json files stored under path, the least recently used ones are evicted when the
+    cache grows over max_bytes. Filenames are not part of the entries, so a file keeps its
+    entry when it is moved and identical files share it.
+    The cache can be sent to worker processes; statistics are recorded by the caller with stats.record.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, version=None):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.version = version if version is not None else ruleset_version()
+        self.stats = CacheStats()
+        os.makedirs(self.path, exist_ok=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["stats"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.stats = CacheStats()
+
+    def key(self, source, prescreen=False):
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(b"\0prescreen\0" if prescreen else b"\0full\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".json")
+
+    def load(self, filename, source, prescreen=False):
+        """
+        Return (rows, details, size) of the cached entry for source analyzed with or without prescreen, or None on a
+        miss.
+        rows and details are given back in the format returned by detector.detect, for the given filename.
+        """
+        path = self.entry_path(self.key(source, prescreen))
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            return None
+        # mark the entry as recently used
+        os.utime(path)
+        rows = [[filename] + row for row in entry["rows"]]
+        details = [[{"filename": filename, "function_name": function_name, "smell_name": smell_name, "line": line}
+                    for function_name, smell_name, line in smell_list] for smell_list in entry["details"]]
+        return rows, details, len(data)
+
+    def store(self, source, rows, details, prescreen=False):
+        """
+        Save the rows and details detected for source with or without prescreen, returning the size of the new entry.
+        """
+        entry = {
+            "rows": [list(row[1:]) for row in rows],
+            "details": [[[smell["function_name"], smell["smell_name"], smell["line"]] for smell in smell_list]
+                        for smell_list in details],
+        }
+        data = json.dumps(entry).encode()
+        path = self.entry_path(self.key(source, prescreen))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first, concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def entries(self):
+        for subdir in os.scandir(self.path):
+            if subdir.is_dir():
+                for entry in os.scandir(subdir.path):
+                    if entry.name.endswith(".json"):
+                        yield entry
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+        """
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self.entries()]
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.stats.evictions += 1
+            self.stats.bytes_evicted += size
+        return total
@@ -0,0 +1,146 @@
+import datetime
+import sqlite3
+import threading
+
+# rows of a project kept in memory before they are inserted in a single transaction
+BATCH_SIZE = 1000
+
+# smells mirrors to_save.csv and smell_instances the detail files, every row belongs to a run and a project
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    input TEXT,
+    started TEXT NOT NULL,
+    finished TEXT
+);
+CREATE TABLE IF NOT EXISTS smells (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    project TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    function_name TEXT,
+    smell INTEGER NOT NULL,
+    name_smell TEXT NOT NULL,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS smell_instances (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    project TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    function_name TEXT,
+    smell_name TEXT NOT NULL,
+    line INTEGER
+);
+CREATE INDEX IF NOT EXISTS smells_run_project ON smells(run_id, project);
+CREATE INDEX IF NOT EXISTS smells_project_smell ON smells(project, name_smell);
+CREATE INDEX IF NOT EXISTS smells_smell ON smells(name_smell);
+CREATE INDEX IF NOT EXISTS smells_filename ON smells(filename);
+CREATE INDEX IF NOT EXISTS smell_instances_run_project ON smell_instances(run_id, project);
+CREATE INDEX IF NOT EXISTS smell_instances_project_smell ON smell_instances(project, smell_name);
+CREATE INDEX IF NOT EXISTS smell_instances_smell ON smell_instances(smell_name);
+CREATE INDEX IF NOT EXISTS smell_instances_filename ON smell_instances(filename);
+"""
+
+
+def now():
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+class ResultsStore:
+    """
+    SQLite database with the results of every analysis (run), in WAL mode so reports can query it while an
+    analysis is writing. A single connection is shared by the threads writing the projects, each write is a
+    transaction. Rows are added through the ProjectResults returned by project().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.run_id = None
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start_run(self, input_path, resume=False):
+        """
+        Start a new run, or with resume continue the last run that did not finish if any. Returns the run id.
+        """
+        with self._lock, self._connection:
+            row = None
+            if resume:
+                row = self._connection.execute("SELECT id FROM runs WHERE finished IS NULL ORDER BY id DESC "
+                                               "LIMIT 1").fetchone()
+            if row is None:
+                self.run_id = self._connection.execute("INSERT INTO runs (input, started) VALUES (?, ?)",
+                                                       (input_path, now())).lastrowid
+            else:
+                self.run_id = row[0]
+        return self.run_id
+
+    def finish_run(self):
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE runs SET finished = ? WHERE id = ?", (now(), self.run_id))
+
+    def project(self, project, clear=False):
+        """
+        Return the ProjectResults of project in the current run, with clear its rows already stored by an
+        interrupted analysis are deleted first.
+        """
+        if clear:
+            with self._lock, self._connection:
+                for table in ("smells", "smell_instances"):
+                    self._connection.execute(f"DELETE FROM {table} WHERE run_id = ? AND project = ?",
+                                             (self.run_id, project))
+        return ProjectResults(self, project)
+
+    def insert(self, smells, instances):
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT INTO smells VALUES (?, ?, ?, ?, ?, ?, ?)", smells)
+            self._connection.executemany("INSERT INTO smell_instances VALUES (?, ?, ?, ?, ?, ?)", instances)
+
+    def query(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def close(self):
+        self._connection.close()
+
+
+class ProjectResults:
+    """
+    Buffers the rows and details of the files of a project and inserts them in batches of BATCH_SIZE rows.
+    """
+
+    def __init__(self, store, project, batch_size=BATCH_SIZE):
+        self.store = store
+        self.project = project
+        self.batch_size = batch_size
+        self._smells = []
+        self._instances = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def add(self, rows, details):
+        prefix = (self.store.run_id, self.project)
+        self._smells.extend(prefix + tuple(row) for row in rows)
+        self._instances.extend(prefix + (smell["filename"], smell["function_name"], smell["smell_name"], smell["line"])
+                               for smell_list in details for smell in smell_list)
+        if len(self._smells) + len(self._instances) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._smells or self._instances:
+            self.store.insert(self._smells, self._instances)
+            self._smells = []
+            self._instances = []
@@ -0,0 +1,127 @@
+import datetime
+import json
+import os
+from collections import Counter
+
+HISTORY_FILE = "run_history.jsonl"
+# bytes read at a time from the end of the history to find its last run
+TAIL_CHUNK = 4096
+
+
+def run_record(duration, files, project_rows):
+    """
+    Record of a run that analyzed files files in duration seconds, project_rows maps each project to the rows of its
+    to_save file: the total smells, the smells of each type and the smells of each project.
+    """
+    smell_counts = Counter()
+    projects = {}
+    for project, rows in project_rows.items():
+        projects[project] = 0
+        for row in rows:
+            smell_counts[row[3]] += int(row[2])
+            projects[project] += int(row[2])
+    return {"date": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "duration": round(duration, 3),
+            "files": files, "smells": sum(projects.values()), "smell_counts": dict(sorted(smell_counts.items())),
+            "projects": projects}
+
+
+def combine_records(records, duration):
+    # record of a run made of the runs of several projects
+    smell_counts = Counter()
+    projects = {}
+    for record in records:
+        smell_counts.update(record["smell_counts"])
+        projects.update(record["projects"])
+    return {"date": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "duration": round(duration, 3),
+            "files": sum(record["files"] for record in records), "smells": sum(projects.values()),
+            "smell_counts": dict(sorted(smell_counts.items())), "projects": projects}
+
+
+class RunHistory:
+    """
+    History of the runs of an analysis, saved in output_path/run_history.jsonl: one JSON line per run, appended
+    in date order and never rewritten. Appending only reads the end of the file for the id of the last run, and the
+    runs between two dates are found by a binary search on the file offsets, so neither depends on the number of runs.
+    """
+
+    def __init__(self, output_path, filename=HISTORY_FILE):
+        self.path = os.path.join(output_path, filename)
+
+    def append(self, record):
+        """
+        Append record to the history with the next run id, returning it.
+        """
+        last, end = self._tail()
+        record = dict(id=last["id"] + 1 if last is not None else 1, **record)
+        with open(self.path, "ab") as file:
+            # a line left incomplete by an interrupted append is dropped
+            file.truncate(end)
+            file.write(json.dumps(record).encode() + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+        return record
+
+    def last(self):
+        return self._tail()[0]
+
+    def _tail(self):
+        # last complete run of the history and the offset where it ends
+        if not os.path.exists(self.path):
+            return None, 0
+        with open(self.path, "rb") as file:
+            end = file.seek(0, os.SEEK_END)
+            data = b""
+            while end > 0:
+                start = max(0, end - TAIL_CHUNK)
+                file.seek(start)
+                data = file.read(end - start) + data
+                end = start
+                lines = data.split(b"\n")
+                # the first piece may be the end of an earlier line, unless the start of the file was read
+                complete = lines[1:-1] if start > 0 else lines[:-1]
+                if complete:
+                    return json.loads(complete[-1]), start + len(data) - len(lines[-1])
+        return None, 0
+
+    def runs(self, start=None, end=None):
+        """
+        The runs dated between start and end, both included. Dates are compared as strings, so they can be given
+        with any precision ('2024-05', '2024-05-01 10:00').
+        """
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, "rb") as file:
+            if start is not None:
+                seek_date(file, start)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                run = json.loads(line)
+                if end is not None and run["date"][:len(end)] > end:
+                    break
+                runs.append(run)
+        return runs
+
+
+def seek_date(file, date):
+    # move file, whose lines are in date order, to the first line dated date or later
+    low, high = 0, file.seek(0, os.SEEK_END)
+    while low < high:
+        middle = (low + high) // 2
+        line_at(file, middle)
+        line = file.readline()
+        if line.endswith(b"\n") and json.loads(line)["date"] < date:
+            low = middle + 1
+        else:
+            high = middle
+    line_at(file, low)
+
+
+def line_at(file, offset):
+    # move file to the start of the first line starting at offset or later
+    if offset == 0:
+        file.seek(0)
+        return
+    file.seek(offset - 1)
+    file.readline()
@@ -1,66 +1,66 @@
+import multiprocessing
 import os
-import pandas as pd
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
 import time
 from components import detector
+from components.result_cache import ResultCache
+from components.detail_writer import DetailWriter
+from components.pipeline import read_ahead, BackgroundWriter
+from components.checkpoint import Checkpoint, FileJournal
+from components.incremental import IncrementalIndex
+from components.overview_merger import OverviewMerger
+from components.results_store import ResultsStore
+from components.run_history import HISTORY_FILE, RunHistory, combine_records, run_record
+from components.output_format import OUTPUT_FORMATS, EXTENSIONS, TableWriter, check_output_format, output_file
+from components.profiler import Profiler, FileProfile, NULL_PROFILE, print_report
+from components.discovery import FileDiscovery, DEFAULT_EXCLUDE, DEFAULT_MAX_FILE_SIZE
+from components.git_source import BlobReader, revision_files
+from cs_detector.detection_rules.registry import RULES
 import argparse
-import datetime
 import shutil
 
+# number of files sent to a worker process at a time
+CHUNK_SIZE = 16
 
-def temporal_results(output_path):
+
+def temporal_results(output_path, project, rows, files, duration):
     """
-    Creates or updates a .csv file named smell_count_dates, which contains
-    the number of total smells of the analysis and the datetime of the analysis
+    Appends the analysis of project to the run history of output_path (run_history.jsonl), with the number of
+    files analyzed, the total smells and the smells of each type
     """
+    record = RunHistory(output_path).append(run_record(duration, files, {project: rows}))
 
-    df = pd.read_csv(output_path + "/to_save.csv")
-
-    # Ensure the file has the correct column
-    if 'smell' not in df.columns:
-        print("Error: 'to_save.csv' must contain a 'smell' column.")
-        return
-
-    total_smells = df['smell'].sum()
-
-    current_date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    new_row = {'smells': total_smells, 'date': current_date}
-
-    smell_count_dates_path = os.path.join(output_path, 'smell_count_dates.csv')
-
-    if os.path.exists(smell_count_dates_path):
-        # File exists, append the new row
-        smell_count_dates = pd.read_csv(smell_count_dates_path)
-        smell_count_dates.loc[len(smell_count_dates)] = new_row
-    else:
-        # File does not exist, create a new DataFrame and save it
-        smell_count_dates = pd.DataFrame([new_row])
-
-    smell_count_dates.to_csv(smell_count_dates_path, index=False)
-
-    print(f"Smell count recorded. Total smells: {total_smells}")
-
-
-def merge_results(input_dir="../output", output_dir="../general_output"):
-    dataframes = []
-    for subdir, dirs, files in os.walk(input_dir):
-        if "to_save.csv" in files:
-            df = pd.read_csv(os.path.join(subdir, "to_save.csv"))
-            if len(df) > 0:
-                dataframes.append(df)
-
-    if dataframes:
-        combined_df = pd.concat(dataframes)
-        #rimuovi tutti le linee contenti filename,function_name,smell,name_smell,message tranne la prima
-        combined_df = combined_df[combined_df["filename"] != "filename"]
-        combined_df = combined_df.reset_index()
+    print(f"Smell count recorded. Total smells: {record['smells']}")
 
 
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        combined_df.to_csv(os.path.join(output_dir, "overview_output.csv"), index=False)
-    else:
+def projects_history(output_path, duration):
+    """
+    Appends a run made of the projects analyzed in the subfolders of output_path to its run history, with the
+    smells of each project
+    """
+    records = []
+    for dirname in sorted(os.listdir(output_path)):
+        if os.path.isdir(os.path.join(output_path, dirname)):
+            record = RunHistory(os.path.join(output_path, dirname)).last()
+            if record is not None:
+                records.append(record)
+    record = RunHistory(output_path).append(combine_records(records, duration))
+
+    print(f"Smell count recorded. Total smells: {record['smells']}")
+
+
+def merge_results(input_dir="../output", output_dir="../general_output", output_format="csv"):
+    # the to_save files are streamed into the overview, none of them is loaded in memory
+    to_save = "to_save" + EXTENSIONS[output_format]
+    with OverviewMerger(output_dir, output_format) as merger:
+        for subdir, dirs, files in os.walk(input_dir):
+            if to_save in files:
+                merger.add(os.path.join(subdir, to_save))
+    if merger.rows == 0:
         print("Error.")
 
 
@@ -81,101 +81,462 @@ def find_python_files(url):
         print(f"Errore durante la ricerca dei file Python: {e}")
 
 
-def get_python_files(path):
-    result = []
-    if os.path.isfile(path):
-        if path.endswith(".py"):
-            result.append(path)
-            return result
-    for root, dirs, files in os.walk(path):
-        if "venv" in dirs:
-            dirs.remove("venv")
-        if "lib" in dirs:
-            dirs.remove("lib")
-        for file in files:
-            if file.endswith(".py"):
-                result.append(os.path.abspath(os.path.join(root, file)))
-    return result
-
-
-def analyze_project(project_path, output_path="."):
-    col = ["filename", "function_name", "smell", "name_smell", "message"]
-    to_save = pd.DataFrame(columns=col)
-    filenames = get_python_files(project_path)
-
-    for filename in filenames:
-        if "tests/" not in filename:  # ignore test files
+def get_python_files(path, discovery=None):
+    """
+    Yield the Python files of path as they are found, excluding the files ignored by discovery
+    (a FileDiscovery, the default one skips virtualenvs, build folders, tests and .gitignore'd files).
+    """
+    if discovery is None:
+        discovery = FileDiscovery()
+    return discovery.files(path)
+
+
+def write_error(output_path, message):
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    with open(f"{output_path}/error.txt", "a") as error_file:
+        error_file.write(message)
+
+
+def write_prescreen_misses(output_path, filename, smells):
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    with open(f"{output_path}/prescreen_misses.txt", "a") as misses_file:
+        misses_file.write(f"{filename}: {', '.join(smells)}\n")
+
+
+# outcome of the analysis of a file: cache_hit is None when no cache is used,
+# cache_bytes is the size of the cache entry read or written, profile is the FileProfile when profiling,
+# prescreen_misses are the smells the pre-parse screening would have missed (only checked in verify mode)
+FileResult = namedtuple("FileResult", ["filename", "rows", "details", "error", "cache_hit", "cache_bytes", "profile",
+                                       "prescreen_misses"], defaults=(None, ()))
+
+# pre-parse screening modes: off, on (files and rules without trigger tokens are skipped) and verify (every file is
+# fully analyzed and the smells the screening would have missed are reported)
+PRESCREEN_MODES = ("off", "on", "verify")
+
+
+def inspect_file(filename, cache=None, source=None, profile=None, prescreen="off"):
+    """
+    Detect the smells of a single file, reusing the cached results if the file did not change.
+    source is read from filename if not given, the time of each phase is recorded in profile if given.
+    prescreen is one of PRESCREEN_MODES.
+    It runs in the worker processes when more jobs are used, so parsing and missing file errors are
+    returned instead of raised.
+    """
+    timer = NULL_PROFILE if profile is None else profile
+    try:
+        if source is None and (cache is not None or prescreen == "verify"):
+            timer.start()
+            source = detector.read_source(filename)
+            timer.stop("read")
+        result = _inspect_source(filename, cache, source, profile, timer, prescreen == "on")
+        if prescreen == "verify":
+            timer.start()
+            result = result._replace(prescreen_misses=detector.prescreen_misses(source, result.rows))
+            timer.stop("prescreen")
+        return result
+    except (SyntaxError, FileNotFoundError) as e:
+        return FileResult(filename, None, None, str(e), None, 0, profile)
+
+
+def _inspect_source(filename, cache, source, profile, timer, prescreen):
+    if cache is None:
+        rows, details = detector.detect(filename, source, timer, prescreen)
+        return FileResult(filename, rows, details, None, None, 0, profile)
+    timer.start()
+    entry = cache.load(filename, source, prescreen)
+    timer.stop("cache")
+    if entry is not None:
+        rows, details, size = entry
+        return FileResult(filename, rows, details, None, True, size, profile)
+    rows, details = detector.detect(filename, source, timer, prescreen)
+    timer.start()
+    size = cache.store(source, rows, details, prescreen)
+    timer.stop("cache")
+    return FileResult(filename, rows, details, None, False, size, profile)
+
+
+def inspect_chunk(filenames, cache=None, profile=False, prescreen="off"):
+    return [inspect_file(filename, cache, profile=FileProfile(filename) if profile else None, prescreen=prescreen)
+            for filename in filenames]
+
+
+def read_file(filename, profile=False):
+    """
+    Read filename ahead of its analysis, return its source and, when profiling, the FileProfile with the read time.
+    """
+    file_profile = FileProfile(filename) if profile else None
+    timer = NULL_PROFILE if file_profile is None else file_profile
+    timer.start()
+    source = detector.read_source(filename)
+    timer.stop("read")
+    return source, file_profile
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def inspect_files(filenames, jobs=1, executor=None, chunk_size=CHUNK_SIZE, cache=None, profile=False,
+                  prescreen="off"):
+    """
+    Yield the result of inspect_file for each file, in the same order as filenames.
+    With a single job the files are read ahead by a few threads while the current one is analyzed.
+    With more than one job the files are sent in chunks to a process pool (the given executor, or a new one),
+    keeping at most two chunks per job in flight, so results are streamed back while the workers are busy.
+    If profile is True each result has the FileProfile of the file, prescreen is the screening mode of inspect_file.
+    """
+    if executor is None and jobs <= 1:
+        for filename, read in read_ahead(filenames, partial(read_file, profile=profile)):
+            if read is None:
+                # the file could not be read, inspect_file reads it again and reports the error
+                yield inspect_file(filename, cache, profile=FileProfile(filename) if profile else None,
+                                   prescreen=prescreen)
+            else:
+                yield inspect_file(filename, cache, *read, prescreen=prescreen)
+        return
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from inspect_files(filenames, jobs, executor, chunk_size, cache, profile, prescreen)
+        return
+    pending = deque()
+    for chunk in chunks(filenames, chunk_size):
+        pending.append(executor.submit(inspect_chunk, chunk, cache, profile, prescreen))
+        if len(pending) >= 2 * max(jobs, 1):
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def inspect_sources(items, cache=None, profile=False, prescreen="off"):
+    # (filename, source) pairs analyzed in a worker process
+    return [inspect_file(filename, cache, source, FileProfile(filename) if profile else None, prescreen)
+            for filename, source in items]
+
+
+def read_blob(item, reader, profile=False):
+    # read_file for the (filename, GitFile) of a revision
+    filename, git_file = item
+    file_profile = FileProfile(filename) if profile else None
+    timer = NULL_PROFILE if file_profile is None else file_profile
+    timer.start()
+    source = reader.read(git_file.blob)
+    timer.stop("read")
+    return source, file_profile
+
+
+def inspect_blobs(items, reader, jobs=1, executor=None, chunk_size=CHUNK_SIZE, cache=None, profile=False,
+                  prescreen="off"):
+    """
+    inspect_files for the (filename, GitFile) items of a revision, whose source is read from their blob by reader
+    (a BlobReader) instead of a file. With more jobs the sources are read here and sent to the workers.
+    """
+    if executor is None and jobs <= 1:
+        for (filename, git_file), read in read_ahead(items, partial(read_blob, reader=reader, profile=profile)):
+            if read is None:
+                yield unread_blob(filename, git_file)
+            else:
+                yield inspect_file(filename, cache, *read, prescreen=prescreen)
+        return
+    if executor is None:
+        # spawned, a forked worker would keep the pipe of the reader open (see revisions_analysis)
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+            yield from inspect_blobs(items, reader, jobs, executor, chunk_size, cache, profile, prescreen)
+        return
+    pending = deque()
+    for chunk in chunks(items, chunk_size):
+        # the blobs that cannot be read are not sent to the workers, their error takes their place in the chunk
+        sources = []
+        errors = {}
+        for position, (filename, git_file) in enumerate(chunk):
             try:
-                result = detector.inspect(filename, output_path)
-                to_save = to_save.merge(result, how='outer')
-            except SyntaxError as e:
-                message = e.msg
-                error_path = output_path
-                if not os.path.exists(error_path):
-                    os.makedirs(error_path)
-                with open(f"{error_path}/error.txt", "a") as error_file:
-                    error_file.write(message)
-                continue
-            except FileNotFoundError as e:
-                message = e
-                error_path = output_path
-                if not os.path.exists(error_path):
-                    os.makedirs(error_path)
-                with open(f"{error_path}/error.txt", "a") as error_file:
-                    error_file.write(str(message))
-                continue
-
-    to_save.to_csv(output_path + "/to_save.csv", index=False, mode='a')
-
-    temporal_results(output_path)
-
-
-
-def projects_analysis(base_path='../input/projects', output_path='../output/projects_analysis',resume=False):
+                sources.append((filename, reader.read(git_file.blob)))
+            except Exception:
+                errors[position] = unread_blob(filename, git_file)
+        pending.append((executor.submit(inspect_sources, sources, cache, profile, prescreen), errors))
+        if len(pending) >= 2 * max(jobs, 1):
+            yield from chunk_results(*pending.popleft())
+    while pending:
+        yield from chunk_results(*pending.popleft())
+
+
+def unread_blob(filename, git_file):
+    return FileResult(filename, None, None, f"Error in file {filename}: blob {git_file.blob} could not be read", None,
+                      0, None)
+
+
+def chunk_results(future, errors):
+    # results of the files of a chunk in their order, errors maps the positions of the unread files to their result
+    results = future.result()
+    analyzed = iter(results)
+    for position in range(len(results) + len(errors)):
+        yield errors[position] if position in errors else next(analyzed)
+
+
+def renamed_result(file_result, filename):
+    # result of the same blob found at another path, nothing of its analysis (time, cache) is counted again
+    file_result = file_result._replace(cache_hit=None, cache_bytes=0, profile=None)
+    if file_result.filename == filename:
+        return file_result
+    if file_result.error is not None:
+        return file_result._replace(filename=filename, error=file_result.error.replace(file_result.filename, filename))
+    return file_result._replace(filename=filename, rows=[[filename] + list(row[1:]) for row in file_result.rows],
+                                details=[[dict(smell, filename=filename) for smell in smell_list]
+                                         for smell_list in file_result.details])
+
+
+def inspect_revision(repo, revision, reader, blob_results, discovery=None, jobs=1, executor=None,
+                     chunk_size=CHUNK_SIZE, cache=None, profile=False, prescreen="off"):
+    """
+    Yield the result of inspect_file for each Python file of repo at revision, in the order of revision_files,
+    reading them from their blobs with reader (a BlobReader of repo) without checking the revision out.
+    blob_results maps the blob ids already analyzed to their FileResult: a file whose blob is in it (the file did
+    not change since an earlier revision, or is a copy of another file) is not analyzed again. New blobs are added.
+    """
+    files = revision_files(repo, revision, discovery)
+    new = []
+    queued = set()
+    for git_file in files:
+        if git_file.blob not in blob_results and git_file.blob not in queued:
+            queued.add(git_file.blob)
+            new.append((os.path.join(repo, git_file.path), git_file))
+    # the new blobs are analyzed in the order of their first file
+    analyzed = inspect_blobs(new, reader, jobs, executor, chunk_size, cache, profile, prescreen)
+    for git_file in files:
+        filename = os.path.join(repo, git_file.path)
+        if git_file.blob in blob_results:
+            yield renamed_result(blob_results[git_file.blob], filename)
+        else:
+            blob_results[git_file.blob] = next(analyzed)
+            yield blob_results[git_file.blob]
+
+
+def remove_results(output_path):
+    # results of an interrupted analysis of a project, they are written again from its journal
+    names = ["error.txt", "prescreen_misses.txt"]
+    names += [name + extension for name in ["to_save"] + [rule.name for rule in RULES]
+              for extension in EXTENSIONS.values()]
+    for name in names:
+        path = os.path.join(output_path, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def analyze_project(project_path, output_path=".", jobs=1, executor=None, cache=None, discovery=None, profiler=None,
+                    prescreen="off", output_format="csv", store=None, incremental=False, base=None, resume=False,
+                    revision=None, reader=None, blob_results=None):
+    """
+    Analyze the Python files of project_path and write their smells in output_path.
+    The results of each file are recorded in a FileJournal as soon as they are written: with resume, the files
+    recorded by an interrupted analysis of the project are not analyzed again.
+    With incremental, the journal is kept as an IncrementalIndex of the project: the next incremental analysis only
+    analyzes the files changed (git diff) since the commit base, by default the commit of the last analysis, and
+    takes the results of the other files from the index.
+    With revision, project_path is a git repository analyzed at that revision by inspect_revision, without a
+    checkout: reader is a BlobReader of the repository and blob_results the results of its blobs already analyzed.
+    The results are written in output_format (one of OUTPUT_FORMATS), and also in store (a ResultsStore) if given.
+    """
+    start = time.time()
+    project = os.path.basename(os.path.abspath(project_path))
+    if revision is not None:
+        project += "@" + revision
+    # rows are collected in a list and turned into a DataFrame only once, at the end of the project
+    rows = []
+    files = 0
+    journal = FileJournal(output_path)
+    index = IncrementalIndex(output_path, project_path, prescreen) if incremental else None
+    recorded = []
+    if resume:
+        recorded = journal.load()
+        remove_results(output_path)
+    elif incremental:
+        recorded = index.unchanged(base)
+        remove_results(output_path)
+    finished = {entry["filename"] for entry in recorded}
+    project_results = nullcontext()
+    if store is not None:
+        project_results = store.project(project, clear=resume)
+    if revision is not None:
+        file_results = (file_result for file_result in
+                        inspect_revision(project_path, revision, reader, {} if blob_results is None else blob_results,
+                                         discovery, jobs, executor, cache=cache, profile=profiler is not None,
+                                         prescreen=prescreen)
+                        if file_result.filename not in finished)
+    else:
+        # files are analyzed while the project is scanned, test files are excluded by the discovery
+        filenames = (filename for filename in get_python_files(project_path, discovery) if filename not in finished)
+        file_results = inspect_files(filenames, jobs, executor, cache=cache, profile=profiler is not None,
+                                     prescreen=prescreen)
+
+    def write(file_result):
+        nonlocal files
+        files += 1
+        if file_result.error is not None:
+            write_error(output_path, file_result.error)
+            return
+        if file_result.prescreen_misses:
+            write_prescreen_misses(output_path, file_result.filename, file_result.prescreen_misses)
+        rows.extend(file_result.rows)
+        for smell_list in file_result.details:
+            details_writer.write(smell_list)
+        if store is not None:
+            project_results.add(file_result.rows, file_result.details)
+
+    def save(file_result):
+        if file_result.profile is not None:
+            profiler.add(file_result.profile)
+        if file_result.cache_hit is not None:
+            cache.stats.record(file_result.cache_hit, file_result.cache_bytes)
+        write(file_result)
+        journal.record(file_result.filename, file_result.rows, file_result.details, file_result.error,
+                       file_result.prescreen_misses)
+
+    with journal, project_results, DetailWriter(output_path, output_format=output_format) as details_writer:
+        for entry in recorded:
+            write(FileResult(entry["filename"], entry["rows"], entry["details"], entry["error"], None, 0, None,
+                             entry["prescreen_misses"]))
+        journal.open(resume)
+        if not resume:
+            # the unchanged files of an incremental analysis are part of its results
+            for entry in recorded:
+                journal.record(**entry)
+        # results are written by a separate thread while the next files are analyzed
+        with BackgroundWriter(save) as results_writer:
+            for file_result in file_results:
+                results_writer.put(file_result)
+
+    with TableWriter(output_file(output_path, "to_save", output_format), detector.COLUMNS, output_format) as writer:
+        writer.write(rows)
+
+    temporal_results(output_path, project, rows, files, time.time() - start)
+    if index is not None:
+        index.save(journal)
+    else:
+        journal.remove()
+
+
+def process_pool(jobs, mp_context=None):
+    """
+    Return a process pool shared by all the projects of the analysis, or a null context if jobs <= 1.
+    Its processes are started with mp_context (a multiprocessing context), by default the one of the platform.
+    """
+    if jobs > 1:
+        return ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context)
+    return nullcontext()
+
+
+def checkpointed_analysis(checkpoint, project, project_path, output_path, resume, *args, merger=None):
+    """
+    Run analyze_project on a project unless the checkpoint says it is already done, recording its progress.
+    Its results are added to merger (an OverviewMerger) when given. Returns False if the project was skipped.
+    A project whose analysis raises an error is marked failed, it is analyzed again on resume.
+    """
+    if resume and checkpoint.is_done(project):
+        print(f"{project} already analyzed, skipped.")
+        return False
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    checkpoint.start(project)
+    try:
+        analyze_project(project_path, output_path, *args, resume=resume)
+    except Exception:
+        checkpoint.fail(project)
+        raise
+    checkpoint.finish(project)
+    if merger is not None:
+        merger.add(output_file(output_path, "to_save", merger.output_format))
+    return True
+
+
+def projects_analysis(base_path='../input/projects', output_path='../output/projects_analysis',resume=False, jobs=1, cache=None,
+                      discovery=None, profiler=None, prescreen="off", merger=None, output_format="csv", store=None,
+                      incremental=False, base=None):
     start = time.time()
     if not os.path.exists(output_path):
         os.makedirs(output_path)
     dirpath = os.listdir(base_path)
-    if not os.path.exists("./config/execution_log.txt"):
-        #get abs path of execution_log.txt
-        execution_log_path = os.path.abspath("./config/execution_log.txt")
-        print("Path:"+execution_log_path)
-        open("./config/execution_log.txt", "w").close()
-        resume = False
-    execution_log = open("./config/execution_log.txt", "a")
-    #get last project analyzed in execution_log.txt
-    if resume:
-        with open("./config/execution_log.txt", "r") as f:
-            last_project = f.readlines()[-1]
-    for dirname in dirpath:
-        if resume:
-            if dirname <= last_project:
-                continue
-        new_path = os.path.join(base_path, dirname)
-        if not os.path.exists(f"{output_path}/{dirname}"):
-            os.makedirs(f"{output_path}/{dirname}")
-        print(f"Analyzing {dirname}...")
-
-        analyze_project(new_path, f"{output_path}/{dirname}")
-        print(f"{dirname} analyzed successfully.")
-        execution_log.write(dirname + "\n")
+    # projects and files already analyzed are recorded in the checkpoint, they are skipped on resume
+    checkpoint = Checkpoint(output_path, resume)
+    with process_pool(jobs) as executor:
+        for dirname in dirpath:
+            new_path = os.path.join(base_path, dirname)
+            print(f"Analyzing {dirname}...")
+            if checkpointed_analysis(checkpoint, dirname, new_path, f"{output_path}/{dirname}", resume, jobs, executor,
+                                     cache, discovery, profiler, prescreen, output_format, store, incremental, base,
+                                     merger=merger):
+                print(f"{dirname} analyzed successfully.")
     end = time.time()
     print(f"Sequential Exec Time completed in: {end - start}")
 
 
-def parallel_projects_analysis(base_path='../input/projects', output_path='../output/projects_analysis', max_workers=5,resume=False):
+def parallel_projects_analysis(base_path='../input/projects', output_path='../output/projects_analysis', max_workers=5,resume=False, jobs=1, cache=None,
+                               discovery=None, profiler=None, prescreen="off", merger=None, output_format="csv",
+                               store=None, incremental=False, base=None):
+    """
+    Analyze the projects of base_path on max_workers threads. A project whose analysis fails does not stop the
+    others, the error is printed and the failed projects are returned.
+    """
     start = time.time()
     if not os.path.exists(output_path):
         os.makedirs(output_path)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    checkpoint = Checkpoint(output_path, resume)
+    failed = []
+    # projects are distributed over threads, their files over a single process pool shared by all the threads
+    with process_pool(jobs) as files_executor, ThreadPoolExecutor(max_workers=max_workers) as executor:
         dirpath = os.listdir(base_path)
+        futures = {}
         for dirname in dirpath:
             new_path = os.path.join(base_path, dirname)
-            if not os.path.exists(f"{output_path}/{dirname}"):
-                os.makedirs(f"{output_path}/{dirname}")
-            executor.submit(analyze_project, new_path, f"{output_path}/{dirname}")
+            futures[executor.submit(checkpointed_analysis, checkpoint, dirname, new_path, f"{output_path}/{dirname}",
+                                    resume, jobs, files_executor, cache, discovery, profiler, prescreen,
+                                    output_format, store, incremental, base, merger=merger)] = dirname
+        for future in as_completed(futures):
+            dirname = futures[future]
+            try:
+                if future.result():
+                    print(f"{dirname} analyzed successfully.")
+            except Exception as e:
+                print(f"{dirname} failed: {e!r}")
+                failed.append(dirname)
     end = time.time()
     print(f"Parallel Exec Time completed in: {end - start}")
+    return sorted(failed)
+
+
+def revision_folder(revision):
+    # folder of the results of a revision, revisions such as origin/main or HEAD~1 are not valid names as they are
+    return "".join(character if character.isalnum() or character in "-_.@" else "_" for character in revision)
+
+
+def revisions_analysis(repo, revisions, output_path, jobs=1, cache=None, discovery=None, profiler=None,
+                       prescreen="off", merger=None, output_format="csv", store=None):
+    """
+    Analyze the git repository repo at each of revisions without checking them out, the results of each revision
+    are written in a subfolder of output_path (see revision_folder). The blobs are read by a single BlobReader and
+    each one is analyzed once: a file that did not change between revisions is only analyzed at the first one.
+    """
+    start = time.time()
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    blob_results = {}
+    # the workers are spawned rather than forked, a forked worker would keep the pipe of the reader open and git
+    # would not exit when the reader is closed
+    with process_pool(jobs, multiprocessing.get_context("spawn")) as executor, BlobReader(repo) as reader:
+        for revision in revisions:
+            print(f"Analyzing {revision}...")
+            revision_path = os.path.join(output_path, revision_folder(revision))
+            analyze_project(repo, revision_path, jobs, executor, cache, discovery, profiler, prescreen, output_format,
+                            store, revision=revision, reader=reader, blob_results=blob_results)
+            if merger is not None:
+                merger.add(output_file(revision_path, "to_save", output_format))
+            print(f"{revision} analyzed successfully, {len(blob_results)} distinct files so far.")
+    end = time.time()
+    print(f"Revisions Exec Time completed in: {end - start}")
 
 
 def clean(output_path="../output/projects_analysis"):
@@ -191,13 +552,13 @@ def clean(output_path="../output/projects_analysis"):
             os.system(f"rm -r {output_path}")
 
 
-def clean_except_file(output_path, keep_file="smell_count_dates.csv"):
+def clean_except_file(output_path, keep_files=(HISTORY_FILE, "smell_count_dates.csv")):
     # Iterate through the contents of the directory
     for filename in os.listdir(output_path):
         file_path = os.path.join(output_path, filename)
 
-        # Check if the current item is the file to keep
-        if filename == keep_file:
+        # Check if the current item is a file to keep (the history of the runs)
+        if filename in keep_files:
             continue
 
         # Check if it's a directory or a file, and remove accordingly
@@ -215,28 +576,84 @@ def main(args):
         print("Please specify input and output folders")
         exit(0)
 
-    if not args.resume:
+    if args.revisions and (args.resume or args.incremental or args.multiple):
+        print("--revisions cannot be used with --resume, --incremental or --multiple")
+        exit(0)
+
+    # fail before the analysis if the output format cannot be written
+    check_output_format(args.output_format)
+
+    start = time.time()
+    # an incremental analysis takes the results of the unchanged files from the previous one
+    if not args.resume and not args.incremental:
         clean_except_file(args.output)
 
     if not os.path.exists(args.output):
         os.makedirs(args.output)
 
+    cache = None
+    if args.cache is not None:
+        cache = ResultCache(args.cache, args.cache_size * 1024 * 1024)
+
+    exclude = [] if args.no_default_exclude else list(DEFAULT_EXCLUDE)
+    exclude += args.exclude or []
+    max_file_size = args.max_file_size * 1024 if args.max_file_size > 0 else None
+    discovery = FileDiscovery(exclude, max_file_size, not args.no_gitignore)
+    profiler = Profiler() if args.profile else None
+    store = None
+    if args.db is not None:
+        store = ResultsStore(args.db)
+        store.start_run(os.path.abspath(args.input), args.resume)
+
+    # projects are merged into the overview as soon as they are analyzed, except on resume: the projects analyzed
+    # before the interruption are only merged by a full merge at the end
+    merger = None
+    failed = []
     multiple = args.multiple
-    if multiple:
-        if not args.resume:
-            resume = False
-            clean(args.output)
+    if (multiple or args.revisions) and not args.resume:
+        resume = False
+        merger = OverviewMerger(args.output + "/overview", args.output_format)
+    if args.revisions:
+        revisions_analysis(args.input, args.revisions, args.output, args.jobs, cache, discovery, profiler,
+                           args.prescreen, merger, args.output_format, store)
+    elif multiple:
         if args.parallel:
-            parallel_projects_analysis(args.input, args.output, args.max_workers,args.resume)
+            failed = parallel_projects_analysis(args.input, args.output, args.max_workers,args.resume, args.jobs, cache,
+                                                discovery, profiler, args.prescreen, merger, args.output_format, store,
+                                                args.incremental, args.base)
         else:
             if not os.path.exists(f"{args.output}"):
                 os.makedirs(f"{args.output}")
-            projects_analysis(args.input, args.output, args.resume)
+            projects_analysis(args.input, args.output, args.resume, args.jobs, cache, discovery, profiler, args.prescreen,
+                              merger, args.output_format, store, args.incremental, args.base)
     else:
-
-        analyze_project(args.input, args.output)
-    merge_results(args.output, args.output+"/overview")
-
+        checkpoint = Checkpoint(args.output, args.resume)
+        project = os.path.basename(os.path.abspath(args.input))
+        checkpointed_analysis(checkpoint, project, args.input, args.output, args.resume, args.jobs, None, cache,
+                              discovery, profiler, args.prescreen, args.output_format, store, args.incremental,
+                              args.base)
+    if multiple or args.revisions:
+        # the run history of each project only has the runs of this analysis, they are combined in one run
+        projects_history(args.output, time.time() - start)
+    if store is not None:
+        # a run with failed projects stays unfinished, it is completed by a run with --resume
+        if not failed:
+            store.finish_run()
+        store.close()
+    if cache is not None:
+        cache.evict()
+        print(f"Cache: {cache.stats}")
+    if profiler is not None:
+        print_report(profiler.write(args.output))
+    if merger is None:
+        merge_results(args.output, args.output+"/overview", args.output_format)
+    else:
+        merger.close()
+        if merger.rows == 0:
+            print("Error.")
+    if failed:
+        print(f"{len(failed)} projects failed: {', '.join(failed)}. Run again with --resume to analyze them.")
+        exit(1)
 
 
 if __name__ == "__main__":
@@ -245,6 +662,34 @@ if __name__ == "__main__":
     parser.add_argument("--input", type=str, help="Path to the input folder")
     parser.add_argument("--output", type=str, help="Path to the output folder")
     parser.add_argument("--max_workers", type=int, default=5,help="Number of workers for parallel execution")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of processes analyzing the files of each project")
+    parser.add_argument("--cache", type=str, help="Folder of the results cache, unchanged files are not analyzed again")
+    parser.add_argument("--cache_size", type=int, default=512, help="Maximum size of the results cache in MB")
+    parser.add_argument("--exclude", type=str, nargs="+", help="Additional .gitignore-style patterns of the files and "
+                                                               "folders to skip (e.g. 'vendor/' 'gen_*.py')")
+    parser.add_argument("--no_default_exclude", action="store_true",
+                        help="Do not skip virtualenvs, site-packages, .tox, node_modules, build folders and tests")
+    parser.add_argument("--no_gitignore", action="store_true", help="Do not skip the files ignored by .gitignore")
+    parser.add_argument("--max_file_size", type=int, default=DEFAULT_MAX_FILE_SIZE // 1024,
+                        help="Files bigger than this size in KB are skipped, 0 for no limit")
+    parser.add_argument("--profile", action="store_true", help="Record the time spent on each file, phase and rule "
+                                                                 "and write profile.json and profile_files.csv")
+    parser.add_argument("--prescreen", choices=PRESCREEN_MODES, default="off",
+                        help="Scan the files for the trigger tokens of the rules before parsing them: 'on' skips the "
+                             "files and rules that cannot report a smell, 'verify' analyzes every file and writes the "
+                             "smells the screening would have missed to prescreen_misses.txt")
+    parser.add_argument("--db", type=str, help="SQLite database where the results of every analysis are also stored "
+                                               "for the report tools, keep it out of the output folder")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only analyze the files changed (git diff) since the last incremental analysis of each "
+                             "project, the results of the other files are taken from it")
+    parser.add_argument("--base", type=str, help="With --incremental, commit the changes are taken from instead of "
+                                                 "the commit of the last analysis")
+    parser.add_argument("--revisions", type=str, nargs="+",
+                        help="Analyze the git repository --input at these revisions (commits, branches or tags) "
+                             "without checking them out, the files unchanged between revisions are analyzed once")
+    parser.add_argument("--output_format", choices=OUTPUT_FORMATS, default="csv",
+                        help="Format of the results: csv, or parquet and feather (columnar, they need pyarrow)")
     parser.add_argument('--parallel', action='store_true', help='Enable parallel execution')
     parser.add_argument('--resume', action='store_true', help='Continue previous execution. Clears output folder if omitted')
     parser.add_argument('--multiple', action='store_true', help='Enable multiple projects analysis')
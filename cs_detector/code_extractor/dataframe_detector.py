@@ -1,78 +1,90 @@
 import ast
+from collections import deque
 
-import pandas as pd
+from .dictionaries import DataFrameDictionary
+from .function_context import function_context
+from .libraries import ImportTable
+
+
+def pandas_aliases(libraries):
+    """
+    Return the sorted names the pandas module is imported as, ['pandas'] if pandas is only imported with
+    from imports, None if it is not imported.
+    """
+    libraries = ImportTable.of(libraries)
+    if not libraries.imports('pandas'):
+        return None
+    return sorted(libraries.aliases('pandas')) or ['pandas']
 
 
 def search_pandas_library(libraries):
-    for lib in libraries:
-        if 'pandas' in lib:
-            short = extract_lib_object(lib)
-            if short is None:
-                short = 'pandas'
-            return short
-    return None
+    aliases = pandas_aliases(libraries)
+    if aliases is None:
+        return None
+    return aliases[0]
 
 def load_dataframe_dict(path):
-    return pd.read_csv(path, dtype={'id': 'string', 'library': 'string', 'method': 'string'})
+    return DataFrameDictionary.from_csv(path)
 
 def dataframe_check(fun_node, libraries,df_dict):
-    short = search_pandas_library(libraries)
-    list = [short]
-    if short is None:
+    aliases = pandas_aliases(libraries)
+    if aliases is None:
         return None
-    return recursive_search_variables(fun_node,list,df_dict)
-        # extract_variables([short])
+    # the variables are computed once per function and shared by all the rules, each rule gets its own copy
+    variables = function_context(fun_node).cached(("dataframe_variables", tuple(aliases), df_dict.methods),
+                                                  lambda: recursive_search_variables(fun_node, aliases, df_dict))
+    return variables.copy()
 
 
-def recursive_search_variables(fun_node,init_list,df_dict):
-    list = init_list.copy()
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.Assign):
-            # check if the right side contains a dataframe
-            if isinstance(node.value, ast.Expr):
-                expr = node.value
-                if isinstance(expr.value, ast.Name):
-                    name = expr.value
-                    if name.id in list:
-                        if hasattr(node.targets[0], 'id'):
-                            if node.targets[0].id not in list:
-                                list.append(node.target.id)
-            if isinstance(node.value, ast.Name):
+def dataframe_flows(fun_node, df_dict):
+    """
+    Single pass over the assignments of the function: for each variable, collect the variables
+    that are assigned from it and are dataframes if it is a dataframe.
+    """
+    flows = {}
+    for node in function_context(fun_node).nodes(ast.Assign):
+        if not isinstance(node.targets[0], ast.Name):
+            continue
+        source = None
+        value = node.value
+        if isinstance(value, ast.Name):
+            # df2 = df
+            source = value.id
+        elif isinstance(value, ast.Call):
+            # df2 = df.method(...) or df2 = df[...].method(...), with method returning a dataframe
+            name_func = value.func
+            if isinstance(name_func, ast.Attribute) and name_func.attr in df_dict.methods:
+                if isinstance(name_func.value, ast.Subscript):
+                    if isinstance(name_func.value.value, ast.Name):
+                        source = name_func.value.value.id
+                elif isinstance(name_func.value, ast.Name):
+                    source = name_func.value.id
+        elif isinstance(value, ast.Subscript):
+            # df2 = df[...]
+            if isinstance(value.value, ast.Name):
+                source = value.value.id
+        if source is not None:
+            flows.setdefault(source, []).append(node.targets[0].id)
+    return flows
 
-                name = node.value
-                if name.id in list:
-                    if hasattr(node.targets[0], 'id'):
-                        if node.targets[0].id not in list:
-                            list.append(node.targets[0].id)
 
-            if isinstance(node.value, ast.Call):
-                name_func = node.value.func
-                if isinstance(name_func, ast.Attribute):
-                    id = name_func.value
-                    if isinstance(name_func.value, ast.Subscript):
-                        if isinstance(name_func.value.value, ast.Name):
-                            id = name_func.value.value.id
-                    else:
-                        if(isinstance(name_func.value,ast.Name)):
-                            id = name_func.value.id
-                        else:
-                            continue
-                    if id in list:
-                        if name_func.attr in df_dict['method'].tolist():
-                            if hasattr(node.targets[0], 'id'):
-                                if node.targets[0].id not in list:
-                                    list.append(node.targets[0].id)
-            else:
-                if isinstance(node.value, ast.Subscript):
-                    if isinstance(node.value.value, ast.Name):
-                        if node.value.value.id in list:
-                            if hasattr(node.targets[0], 'id'):
-                                if node.targets[0].id not in list:
-                                    list.append(node.targets[0].id)
-    if list == init_list:
-        return list
-    else:
-        return recursive_search_variables(fun_node,list,df_dict)
+def recursive_search_variables(fun_node,init_list,df_dict):
+    """
+    Return init_list extended with all the variables that are derived from its dataframes.
+    The flows between variables are collected once, then propagated from init_list with a worklist.
+    """
+    flows = function_context(fun_node).cached(("dataframe_flows", df_dict.methods),
+                                              lambda: dataframe_flows(fun_node, df_dict))
+    variables = init_list.copy()
+    found = set(variables)
+    worklist = deque(variables)
+    while worklist:
+        for target in flows.get(worklist.popleft(), ()):
+            if target not in found:
+                found.add(target)
+                variables.append(target)
+                worklist.append(target)
+    return variables
 
 def extract_lib_object(lib):
     try:
@@ -0,0 +1,142 @@
+import csv
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+
+DICTIONARIES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../obj_dictionaries'))
+DICTIONARY_FILES = {"dataframes": "dataframes.csv", "models": "models.csv", "tensors": "tensors.csv"}
+
+
+def read_columns(path):
+    """
+    Read a csv file and return its content column by column (column name -> list of values), skipping blank lines.
+    """
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    return {column: [row[i] if i < len(row) else '' for row in rows] for i, column in enumerate(header)}
+
+
+class ObjDictionary(Mapping):
+    """
+    Read-only view of one of the obj_dictionaries (column name -> tuple of values).
+    Subclasses precompute once the lookups used by the detection rules.
+    """
+
+    def __init__(self, columns):
+        self._columns = {column: tuple(values) for column, values in columns.items()}
+
+    def __getitem__(self, column):
+        return self._columns[column]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    @classmethod
+    def of(cls, dictionary):
+        """
+        Return dictionary as an instance of cls, so that rules also accept plain dicts of lists.
+        """
+        if isinstance(dictionary, cls):
+            return dictionary
+        return cls(dictionary)
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(read_columns(path))
+
+
+class DataFrameDictionary(ObjDictionary):
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.methods = frozenset(self['method'])
+        self.dataframe_methods = frozenset(method for method, return_type in zip(self['method'], self['return_type'])
+                                           if return_type == 'DataFrame')
+
+
+class ModelDictionary(ObjDictionary):
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.libraries = frozenset(self['library'])
+        self.methods = frozenset(self['method'])
+        # required hyperparameters of each model method, the first definition wins
+        hyperparameters = {}
+        for method, parameters in zip(self['method'], self.get('hyperparameters', ())):
+            if method not in hyperparameters:
+                hyperparameters[method] = tuple(parameter.strip() for parameter in str(parameters).split(","))
+        self.hyperparameters = hyperparameters
+
+
+class TensorDictionary(ObjDictionary):
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.methods = frozenset(self['method_name'])
+
+    @classmethod
+    def from_csv(cls, path):
+        # only operations that combine more than one tensor are relevant for the detection
+        columns = read_columns(path)
+        keep = [int(number) > 1 for number in columns['number_of_tensors_input']]
+        return cls({column: [value for value, k in zip(values, keep) if k] for column, values in columns.items()})
+
+
+Dictionaries = namedtuple("Dictionaries", ["dataframes", "models", "tensors", "version", "mtimes"])
+
+_dictionaries = None
+_lock = threading.Lock()
+
+
+def dictionary_mtimes(path=DICTIONARIES_PATH):
+    return {name: os.path.getmtime(os.path.join(path, file)) for name, file in DICTIONARY_FILES.items()}
+
+
+def build_dictionaries(path=DICTIONARIES_PATH):
+    """
+    Load and precompile all the obj_dictionaries stored in path.
+    version is a digest of the csv contents, it changes whenever one of the dictionaries changes.
+    """
+    digest = hashlib.sha1()
+    for file in DICTIONARY_FILES.values():
+        with open(os.path.join(path, file), "rb") as f:
+            digest.update(f.read())
+    return Dictionaries(
+        dataframes=DataFrameDictionary.from_csv(os.path.join(path, DICTIONARY_FILES["dataframes"])),
+        models=ModelDictionary.from_csv(os.path.join(path, DICTIONARY_FILES["models"])),
+        tensors=TensorDictionary.from_csv(os.path.join(path, DICTIONARY_FILES["tensors"])),
+        version=digest.hexdigest(),
+        mtimes=dictionary_mtimes(path),
+    )
+
+
+def get_dictionaries():
+    """
+    Return the process-wide dictionaries, loading them on first use.
+    """
+    global _dictionaries
+    if _dictionaries is None:
+        with _lock:
+            if _dictionaries is None:
+                _dictionaries = build_dictionaries()
+    return _dictionaries
+
+
+def reload_dictionaries(only_if_changed=False):
+    """
+    Reload the process-wide dictionaries from disk.
+    With only_if_changed the csv files are reloaded only if one of them was modified since the last load.
+    """
+    global _dictionaries
+    with _lock:
+        if only_if_changed and _dictionaries is not None and _dictionaries.mtimes == dictionary_mtimes():
+            return _dictionaries
+        _dictionaries = build_dictionaries()
+    return _dictionaries
@@ -0,0 +1,139 @@
+import ast
+from collections import deque
+
+# node types that open a new scope, they are analyzed on their own and not as part of the enclosing function
+SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+MODULE_SCOPE_NAME = "<module>"
+
+
+def scoped_walk(node):
+    """
+    Like ast.walk (same breadth-first order), but does not enter the functions defined inside node.
+    Only the parts of a nested function evaluated in the enclosing scope (decorators and default values)
+    are visited.
+    """
+    todo = deque([node])
+    while todo:
+        current = todo.popleft()
+        if current is not node and isinstance(current, SCOPE_TYPES):
+            todo.extend(current.decorator_list)
+            todo.extend(current.args.defaults)
+            todo.extend(default for default in current.args.kw_defaults if default is not None)
+        else:
+            todo.extend(ast.iter_child_nodes(current))
+        yield current
+
+
+def module_scope(tree):
+    """
+    Return a synthetic function named MODULE_SCOPE_NAME whose body is the module-level code of tree,
+    so that the rules can analyze it like any other function.
+    """
+    arguments = ast.arguments(posonlyargs=[], args=[], vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None,
+                              defaults=[])
+    return ast.FunctionDef(name=MODULE_SCOPE_NAME, args=arguments, body=tree.body, decorator_list=[], returns=None,
+                           type_comment=None, lineno=1, col_offset=0)
+
+
+def analysis_scopes(tree):
+    """
+    Return the scopes of the module to analyze: the module-level code followed by every function and async
+    function in ast.walk order. Each body is analyzed exactly once, nested functions are excluded from the scope
+    of the enclosing one.
+    """
+    return [module_scope(tree)] + [node for node in ast.walk(tree) if isinstance(node, SCOPE_TYPES)]
+
+
+class FunctionContext:
+    """
+    Per-function view shared by all the detection rules.
+    The function is walked once and its nodes are indexed by type, so every rule only
+    iterates over the nodes it is interested in instead of walking the whole function again.
+    Nested functions are not part of the walk, they have their own context.
+    """
+
+    def __init__(self, fun_node):
+        self.fun_node = fun_node
+        # keep the ast.walk order, rules rely on it when they compare node positions
+        self.walk = list(scoped_walk(fun_node))
+        self.by_type = {}
+        for node in self.walk:
+            self.by_type.setdefault(type(node), []).append(node)
+        self._selections = {}
+        self._cache = {}
+        # SourceLines of the file, attached by the detector when the original source is available
+        self.source = None
+
+    def nodes(self, *node_types):
+        """
+        Return the nodes of the given types in walk order. The returned list is shared, do not modify it.
+        """
+        if len(node_types) == 1:
+            return self.by_type.get(node_types[0], [])
+        selection = self._selections.get(node_types)
+        if selection is None:
+            selection = [node for node in self.walk if type(node) in node_types]
+            self._selections[node_types] = selection
+        return selection
+
+    def has_nodes(self, node_types):
+        for node_type in node_types:
+            if node_type in self.by_type:
+                return True
+        return False
+
+    def cached(self, key, compute):
+        """
+        Return the result of compute(), computed only the first time it is requested for key.
+        Used to share the analyses of the function (e.g. the dataframe variables) between the rules.
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def statement_source(self, node):
+        """
+        Return the source of node, without what surrounds it on its lines (comments, other statements).
+        It is sliced from the original source when it is attached, otherwise node is unparsed once.
+        """
+        if self.source is not None:
+            return self.source.segment(node)
+        return self.cached(("statement_source", id(node)), lambda: ast.unparse(node))
+
+
+class SourceLines:
+    """
+    Lines of a source file shared by all its functions, split only when a rule asks for one of them.
+    """
+
+    def __init__(self, source):
+        self.source = source if isinstance(source, bytes) else source.encode("utf-8")
+        self._lines = None
+
+    def segment(self, node):
+        """
+        Like ast.get_source_segment, the source of node from its start to its end position. The column offsets
+        of the AST count UTF-8 bytes, the lines are sliced before being decoded.
+        """
+        if self._lines is None:
+            # bytes.splitlines only splits on the line terminators used by the tokenizer, so lineno matches
+            self._lines = self.source.splitlines()
+        if node.lineno == node.end_lineno:
+            segment = self._lines[node.lineno - 1][node.col_offset:node.end_col_offset]
+        else:
+            segment = b"\n".join([self._lines[node.lineno - 1][node.col_offset:]] +
+                                 self._lines[node.lineno:node.end_lineno - 1] +
+                                 [self._lines[node.end_lineno - 1][:node.end_col_offset]])
+        return segment.decode("utf-8", errors="replace")
+
+
+def function_context(fun_node):
+    """
+    Return the FunctionContext of fun_node, building it on first use.
+    The context is stored on the node itself so that every rule checking the same function reuses it.
+    """
+    context = getattr(fun_node, "_function_context", None)
+    if context is None:
+        context = FunctionContext(fun_node)
+        fun_node._function_context = context
+    return context
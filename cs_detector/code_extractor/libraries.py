@@ -1,17 +1,118 @@
 import ast
 
+# libraries whose import marks a file as a test file, the rules do not analyze test files
+TEST_LIBRARIES = frozenset(["pytest", "robot", "unittest", "doctest", "nose2", "testify", "pytest-cov",
+                            "pytest-xdist"])
+
+
+def module_prefixes(module):
+    # "a.b.c" -> ["a", "a.b", "a.b.c"]
+    parts = module.split(".")
+    return [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+class ImportTable(frozenset):
+    """
+    Imports of a file, computed once and shared by all the rules.
+    It is the set of the imports as strings ("pandas as pd", "sklearn.ensemble.RandomForestClassifier"),
+    as extract_libraries always returned, indexed by module and by local name so that the rules can ask
+    "is pandas imported, under which aliases" without scanning the strings.
+    Modules are matched by their dotted components: torchvision does not import torch.
+    """
+
+    def __new__(cls, entries=()):
+        """
+        entries is a list of (import string, local name, imported object), e.g. ("pandas as pd", "pd", "pandas")
+        or ("sklearn.cluster.KMeans", "KMeans", "sklearn.cluster.KMeans").
+        """
+        table = super().__new__(cls, [entry[0] for entry in entries])
+        modules = {}
+        names = {}
+        strings = {}
+        packages = set()
+        for string, name, origin in entries:
+            modules.setdefault(origin, set()).add(name)
+            names.setdefault(name, origin)
+            strings.setdefault(name, string)
+            packages.update(module_prefixes(extract_library_name(string)))
+        table.modules = {module: frozenset(aliases) for module, aliases in modules.items()}
+        table.names = names
+        table._strings = strings
+        table.packages = frozenset(packages)
+        # same check as the rules always did: the file imports one of the test libraries, without alias
+        table.has_test_library = not TEST_LIBRARIES.isdisjoint(table)
+        return table
+
+    @classmethod
+    def of(cls, libraries):
+        """
+        Return libraries as an ImportTable, libraries can also be a plain list of import strings.
+        """
+        if isinstance(libraries, ImportTable):
+            return libraries
+        entries = []
+        for library in libraries:
+            if " as " in library:
+                origin, name = library.split(" as ")[:2]
+            else:
+                # "pandas" (import pandas) or "sklearn.cluster.KMeans" (from sklearn.cluster import KMeans)
+                origin = library
+                name = library.rsplit(".", 1)[-1]
+            entries.append((library, name, origin))
+        return cls(entries)
+
+    def imports(self, package):
+        """
+        Return True if package (e.g. "pandas" or "torch.nn") or one of its modules is imported.
+        """
+        return package in self.packages
+
+    def aliases(self, module):
+        """
+        Return the local names bound to module, e.g. {"pd"} for import pandas as pd.
+        """
+        return self.modules.get(module, frozenset())
+
+    def origin(self, name):
+        """
+        Return the imported module or object bound to the local name, None if name is not imported.
+        """
+        return self.names.get(name)
+
+    def library_of(self, name):
+        """
+        Return the import string that binds the local name, None if name is not imported.
+        """
+        return self._strings.get(name)
+
+
+def import_statements(tree):
+    # imports are statements, expressions cannot contain them, so only statements are visited
+    todo = [tree]
+    while todo:
+        node = todo.pop()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+            continue
+        children = [child for child in ast.iter_child_nodes(node)
+                    if isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case))]
+        todo.extend(reversed(children))
+
+
 def extract_libraries(tree):
     """
-    Given a tree obtained from ast.parse command, extract a list of libraries used in the tree.
+    Given a tree obtained from ast.parse command, extract the libraries used in the tree as an ImportTable.
     """
-    libraries = []
-    for node in ast.walk(tree):
+    entries = []
+    for node in import_statements(tree):
         if isinstance(node, ast.Import):
             for alias in node.names:
                 if alias.asname:
-                    libraries.append(alias.name + ' as ' + alias.asname)
+                    entries.append((alias.name + ' as ' + alias.asname, alias.asname, alias.name))
                 else:
-                    libraries.append(alias.name)
+                    # import a.b binds a
+                    name = alias.name.split(".")[0]
+                    entries.append((alias.name, name, name))
         elif isinstance(node, ast.ImportFrom):
             if node.module:
                 if node.module != "*":
@@ -20,13 +121,15 @@ def extract_libraries(tree):
                         #module_name += ' as ' + node.asname
                     for alias in node.names:
                         if alias.asname:
-                            libraries.append(module_name + '.' + alias.name + ' as ' + alias.asname)
+                            entries.append((module_name + '.' + alias.name + ' as ' + alias.asname, alias.asname,
+                                            module_name + '.' + alias.name))
                         else:
-                            libraries.append(module_name + '.' + alias.name)
+                            entries.append((module_name + '.' + alias.name, alias.name,
+                                            module_name + '.' + alias.name))
                 else:
-                    libraries.append(node.module)
+                    entries.append((node.module, node.module, node.module))
 
-    return set(libraries)
+    return ImportTable(entries)
 
 
 def extract_library_name(library):
@@ -55,12 +158,9 @@ def get_library_of_node(node, libraries):
             from_object = True
             n = n.value
         if isinstance(n, ast.Name):
-            method_name = n.id
-        else:
-            method_name = ""
-        for lib in libraries:
-            if method_name in lib:
-                return lib
+            library = ImportTable.of(libraries).library_of(n.id)
+            if library is not None:
+                return library
     if from_object:
         return "Unknown"
     else:
@@ -1,22 +1,18 @@
-import os
+from .dictionaries import ModelDictionary, get_dictionaries
+
 
-import pandas as pd
 def check_model_method(model,model_dict,libraries):
-    # get model_dict part in which library is in libraries
+    # the model is defined if one of the libraries is in the dictionary and the model is one of its methods
+    model_dict = ModelDictionary.of(model_dict)
+    if model not in model_dict.methods:
+        return False
     for lib in libraries:
-        if lib in model_dict['library']:
-            # take part of dict in which model_dict['library'] is in lib
-            # get model_dict part in which model is in library
-            for model_part in model_dict['method']:
-                if model_part == model and lib in model_dict['library']:
-                    return True
+        if lib in model_dict.libraries:
+            return True
     return False
 
 def load_model_dict():
-    dict = pd.read_csv(os.path.join(os.path.dirname(__file__), '../../obj_dictionaries/models.csv')).to_dict(orient='list')
-    return dict
+    return get_dictionaries().models
 
 def load_tensor_operations_dict():
-    dict = pd.read_csv(os.path.join(os.path.dirname(__file__), '../../obj_dictionaries/tensors.csv'))
-    dict = dict[dict['number_of_tensors_input'] > 1]
-    return dict.to_dict(orient='list')
\ No newline at end of file
+    return get_dictionaries().tensors
@@ -1,5 +1,8 @@
 import re
 import ast
+from bisect import bisect_right
+
+from .function_context import function_context
 
 
 def get_variable_def(line):
@@ -20,22 +23,52 @@ def get_all_set_variables(lines):
     return set(variables)
 
 
+class DefinitionIndex:
+    """
+    Def-use index of a function: for every variable the assignments that define it, in ast.walk order.
+    Built once per function, it answers "latest definition before node X" with a binary search.
+    """
+
+    def __init__(self, fun_node):
+        walk = function_context(fun_node).walk
+        self._end = len(walk)
+        # first walk position of every (lineno, col_offset), the position where a linear scan would stop
+        self._stops = {}
+        self._definitions = {}
+        for position, node in enumerate(walk):
+            if hasattr(node, 'lineno'):
+                self._stops.setdefault((node.lineno, getattr(node, 'col_offset', None)), position)
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        positions, nodes = self._definitions.setdefault(target.id, ([], []))
+                        if not positions or positions[-1] != position:
+                            positions.append(position)
+                            nodes.append(node)
+
+    def latest_definition(self, var, limit_node):
+        definitions = self._definitions.get(var)
+        if definitions is None:
+            return None
+        positions, nodes = definitions
+        stop = self._end
+        if hasattr(limit_node, 'lineno'):
+            stop = self._stops.get((limit_node.lineno, getattr(limit_node, 'col_offset', None)), self._end)
+        index = bisect_right(positions, stop)
+        return nodes[index - 1] if index else None
+
+
+def definition_index(fun_node):
+    return function_context(fun_node).cached("definition_index", lambda: DefinitionIndex(fun_node))
+
+
 def search_variable_definition(var, fun_node, limit_node):
     # search for the variable definition
     # if the variable is defined in the same function, return the definition
     # if the variable is defined in the same file, return the definition
     # if the variable is defined in another file, return None
     # limit the node
-    last_node_definition = None
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    if target.id == var:
-                        last_node_definition = node
-        if equal_node(node, limit_node):
-            return last_node_definition
-    return last_node_definition
+    return definition_index(fun_node).latest_definition(var, limit_node)
 
 
 def equal_node(node1, node2):
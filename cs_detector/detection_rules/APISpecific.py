@@ -1,34 +1,27 @@
 import ast
-import re
 
 from cs_detector.code_extractor.dataframe_detector import dataframe_check
 from cs_detector.code_extractor.variables import search_variable_definition
-from cs_detector.code_extractor.libraries import extract_library_as_name
-
-test_libraries = ["pytest", "robot", "unittest", "doctest", "nose2", "testify", "pytest-cov", "pytest-xdist"]
+from cs_detector.code_extractor.function_context import function_context, scoped_walk
 
 
 def Chain_Indexing(libraries, filename, fun_node,df_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
-    if [x for x in libraries if 'pandas' in x]:
+    if libraries.imports('pandas'):
         smell_instance_list = []
         function_name = fun_node.name
         variables = dataframe_check(fun_node, libraries,df_dict)
-        function_body = ast.unparse(fun_node.body).strip()
-        pattern = r'([a-zA-Z]+[a-zA-Z_0-9]*)(\[[a-zA-Z0-9\']*\]){2,}'
-        matches = re.findall(pattern, function_body)
         message = "Using chain indexing may cause performance issues."
         num_matches = 0
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Subscript):
-                if hasattr(node, 'value') and isinstance(node.value, ast.Subscript):
-                    if hasattr(node.value, 'id'):
-                        if node.value.id in variables:
-                            new_smell = {'filename': filename, 'function_name': function_name,
-                                            'smell_name': 'Chain_Indexing', 'line': node.lineno}
-                            smell_instance_list.append(new_smell)
-                            num_matches += 1
+        for node in function_context(fun_node).nodes(ast.Subscript):
+            if hasattr(node, 'value') and isinstance(node.value, ast.Subscript):
+                if hasattr(node.value, 'id'):
+                    if node.value.id in variables:
+                        new_smell = {'filename': filename, 'function_name': function_name,
+                                        'smell_name': 'Chain_Indexing', 'line': node.lineno}
+                        smell_instance_list.append(new_smell)
+                        num_matches += 1
         if num_matches > 0:
             name_smell = "Chain_Indexing"
             return [f"{filename}", f"{function_name}", num_matches, name_smell, message], smell_instance_list
@@ -37,24 +30,23 @@ def Chain_Indexing(libraries, filename, fun_node,df_dict):
 
 
 def dataframe_conversion_api_misused(libraries, filename, fun_node, df_dict):
-    if [x for x in libraries if 'pandas' in x]:
+    if libraries.imports('pandas'):
         function_name = fun_node.name
         variables = dataframe_check(fun_node, libraries, df_dict)
         number_of_apply = 0
         smell_instance_list = []
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Attribute):
-                if hasattr(node, 'value'):
-                    if hasattr(node, 'attr'):
-                        if node.attr == 'values':
-                            if hasattr(node, 'value'):
-                                if hasattr(node.value, 'id'):
-                                    if node.value.id in variables:
-                                        new_smell = {'filename': filename, 'function_name': function_name,
-                                                     'smell_name': 'dataframe_conversion_api_misused',
-                                                     'line': node.lineno}
-                                        smell_instance_list.append(new_smell)
-                                        number_of_apply += 1
+        for node in function_context(fun_node).nodes(ast.Attribute):
+            if hasattr(node, 'value'):
+                if hasattr(node, 'attr'):
+                    if node.attr == 'values':
+                        if hasattr(node, 'value'):
+                            if hasattr(node.value, 'id'):
+                                if node.value.id in variables:
+                                    new_smell = {'filename': filename, 'function_name': function_name,
+                                                 'smell_name': 'dataframe_conversion_api_misused',
+                                                 'line': node.lineno}
+                                    smell_instance_list.append(new_smell)
+                                    number_of_apply += 1
         if number_of_apply > 0:
             message = "Please consider to use numpy instead values to convert dataframe. The function 'values' is deprecated." \
                   "The value return of this function is unclear."
@@ -68,45 +60,58 @@ def dataframe_conversion_api_misused(libraries, filename, fun_node, df_dict):
 
 def matrix_multiplication_api_misused(libraries, filename, fun_node):
     number_of_apply = 0
-    library_name = ""
+    library_names = frozenset()
     function_name = ""
     smell_instance_list = []
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
-    if [x for x in libraries if 'numpy' in x]:
-        for x in libraries:
-            if 'numpy' in x:
-                library_name = extract_library_as_name(x)
-                function_name = fun_node.name
-        if library_name == "":
+    if libraries.imports('numpy'):
+        library_names = libraries.aliases('numpy')
+        function_name = fun_node.name
+        if not library_names:
             return [], []
-        for node in ast.walk(fun_node):
-            # search for dot function usages
-            if isinstance(node, ast.Call):
-                if hasattr(node, 'func'):
-                    if hasattr(node.func, 'attr'):
-                        if hasattr(node.func, 'value'):
-                            if hasattr(node.func.value, 'id'):
-                                if node.func.attr == 'dot' and node.func.value.id == library_name:
-                                    # if dot function used with constant matrices, increase number of apply
-                                    if hasattr(node, 'args'):
-                                        if len(node.args) > 1:
-                                            arguments = []
-                                            matrix_multiplication = False
-                                            for arg in node.args:
-                                                # check if each argument is a list
-                                                if isinstance(arg, ast.List):
-
-                                                    # check if each list contains a list, so it is a matrix
-                                                    for el in arg.elts:
-
-                                                        if isinstance(el, ast.List):
-                                                            matrix_multiplication = True
-
-                                                else:
-                                                    if isinstance(arg, ast.Name):
-                                                        # in this case we have to extract variables and see if it is a matrix
-                                                        arguments.append(arg.id)
+        # search for dot function usages
+        for node in function_context(fun_node).nodes(ast.Call):
+            if hasattr(node, 'func'):
+                if hasattr(node.func, 'attr'):
+                    if hasattr(node.func, 'value'):
+                        if hasattr(node.func.value, 'id'):
+                            if node.func.attr == 'dot' and node.func.value.id in library_names:
+                                # if dot function used with constant matrices, increase number of apply
+                                if hasattr(node, 'args'):
+                                    if len(node.args) > 1:
+                                        arguments = []
+                                        matrix_multiplication = False
+                                        for arg in node.args:
+                                            # check if each argument is a list
+                                            if isinstance(arg, ast.List):
+
+                                                # check if each list contains a list, so it is a matrix
+                                                for el in arg.elts:
+
+                                                    if isinstance(el, ast.List):
+                                                        matrix_multiplication = True
+
+                                            else:
+                                                if isinstance(arg, ast.Name):
+                                                    # in this case we have to extract variables and see if it is a matrix
+                                                    arguments.append(arg.id)
+                                        if matrix_multiplication:
+                                            new_smell = {'filename': filename, 'function_name': function_name,
+                                                            'smell_name': 'matrix_multiplication_api_misused',
+                                                            'line': node.lineno}
+                                            smell_instance_list.append(new_smell)
+                                            number_of_apply += 1
+
+                                        else:
+                                            for arg in arguments:
+                                                node_def = search_variable_definition(arg, fun_node, node)
+                                                if node_def is not None:
+                                                    constant = node_def.value
+                                                    if isinstance(constant, ast.List):
+                                                        for el in constant.elts:
+                                                            if isinstance(el, ast.List):
+                                                                matrix_multiplication = True
                                             if matrix_multiplication:
                                                 new_smell = {'filename': filename, 'function_name': function_name,
                                                                 'smell_name': 'matrix_multiplication_api_misused',
@@ -114,22 +119,6 @@ def matrix_multiplication_api_misused(libraries, filename, fun_node):
                                                 smell_instance_list.append(new_smell)
                                                 number_of_apply += 1
 
-                                            else:
-                                                for arg in arguments:
-                                                    node_def = search_variable_definition(arg, fun_node, node)
-                                                    if node_def is not None:
-                                                        constant = node_def.value
-                                                        if isinstance(constant, ast.List):
-                                                            for el in constant.elts:
-                                                                if isinstance(el, ast.List):
-                                                                    matrix_multiplication = True
-                                                if matrix_multiplication:
-                                                    new_smell = {'filename': filename, 'function_name': function_name,
-                                                                    'smell_name': 'matrix_multiplication_api_misused',
-                                                                    'line': node.lineno}
-                                                    smell_instance_list.append(new_smell)
-                                                    number_of_apply += 1
-
         if number_of_apply > 0:
             message = "Please consider to use np.matmul to multiply matrix. The function dot() not return a scalar value, " \
                       "but a matrix."
@@ -141,32 +130,29 @@ def matrix_multiplication_api_misused(libraries, filename, fun_node):
 
 
 def gradients_not_cleared_before_backward_propagation(libraries, filename, fun_node):
-    library_name = ""
-    if [x for x in libraries if x in test_libraries]:
+    library_names = frozenset()
+    if libraries.has_test_library:
         return [], []
-    if [x for x in libraries if 'torch' in x]:
-        for x in libraries:
-            if 'torch' in x:
-                library_name = extract_library_as_name(x)
+    if libraries.imports('torch'):
+        library_names = libraries.aliases('torch')
         function_name = fun_node.name
         number_of_apply = 0
         smell_instance_list = []
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.For) or isinstance(node,ast.While):
-                zero_grad_called = False
-                for node2 in ast.walk(node):
-                    if isinstance(node2, ast.Call):
-                        if hasattr(node2, 'func'):
-                            if hasattr(node2.func, 'attr'):
-                                if node2.func.attr == 'zero_grad':
-                                    zero_grad_called = True
-                                if node2.func.attr == 'backward':
-                                    if not zero_grad_called:
-                                        new_smell = {'filename': filename, 'function_name': function_name,
-                                                        'smell_name': 'gradients_not_cleared_before_backward_propagation',
-                                                        'line': node2.lineno}
-                                        smell_instance_list.append(new_smell)
-                                        number_of_apply += 1
+        for node in function_context(fun_node).nodes(ast.For, ast.While):
+            zero_grad_called = False
+            for node2 in scoped_walk(node):
+                if isinstance(node2, ast.Call):
+                    if hasattr(node2, 'func'):
+                        if hasattr(node2.func, 'attr'):
+                            if node2.func.attr == 'zero_grad':
+                                zero_grad_called = True
+                            if node2.func.attr == 'backward':
+                                if not zero_grad_called:
+                                    new_smell = {'filename': filename, 'function_name': function_name,
+                                                    'smell_name': 'gradients_not_cleared_before_backward_propagation',
+                                                    'line': node2.lineno}
+                                    smell_instance_list.append(new_smell)
+                                    number_of_apply += 1
 
         if number_of_apply > 0:
             message = "Please consider to use zero_grad() before backward()."
@@ -179,31 +165,26 @@ def gradients_not_cleared_before_backward_propagation(libraries, filename, fun_n
 
 
 def tensor_array_not_used(libraries, filename, fun_node):
-    library_name = ""
-    if [x for x in libraries if x in test_libraries]:
+    library_names = frozenset()
+    if libraries.has_test_library:
         return [], []
-    if [x for x in libraries if 'tensorflow' in x]:
+    if libraries.imports('tensorflow'):
         function_name = fun_node.name
-        function_body = ast.unparse(fun_node.body).strip()
-        for x in libraries:
-            if 'tensorflow' in x:
-                library_name = extract_library_as_name(x)
+        library_names = libraries.aliases('tensorflow')
         number_of_apply = 0
         smell_instance_list = []
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Attribute):
-                    if hasattr(node.func.value, "id"):
-                        if node.func.attr == "constant" and node.func.value.id == library_name:
-                            if len(node.args) >= 1:
-                                parameter = ast.unparse(node.args[0])
-                                for arg_node in node.args:
-                                    if isinstance(arg_node, ast.List):
-                                        new_smell = {'filename': filename, 'function_name': function_name,
-                                                        'smell_name': 'tensor_array_not_used',
-                                                        'line': node.lineno}
-                                        smell_instance_list.append(new_smell)
-                                        number_of_apply += 1
+        for node in function_context(fun_node).nodes(ast.Call):
+            if isinstance(node.func, ast.Attribute):
+                if hasattr(node.func.value, "id"):
+                    if node.func.attr == "constant" and node.func.value.id in library_names:
+                        if len(node.args) >= 1:
+                            for arg_node in node.args:
+                                if isinstance(arg_node, ast.List):
+                                    new_smell = {'filename': filename, 'function_name': function_name,
+                                                    'smell_name': 'tensor_array_not_used',
+                                                    'line': node.lineno}
+                                    smell_instance_list.append(new_smell)
+                                    number_of_apply += 1
         if number_of_apply > 0:
             message = "If the developer initializes an array using tf.constant() and tries to assign a new value to " \
                       "it in the loop to keep it growing, the code will run into an error." \
@@ -218,24 +199,21 @@ def tensor_array_not_used(libraries, filename, fun_node):
 
 
 def pytorch_call_method_misused(libraries, filename, fun_node):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
-    if [x for x in libraries if 'torch' in x]:
+    if libraries.imports('torch'):
         function_name = fun_node.name
-        function_body = ast.unparse(fun_node.body).strip()
-        lines = function_body.split('\n')
         number_of_forward = 0
         smell_instance_list = []
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Call):
-                if hasattr(node, 'func'):
-                    if hasattr(node.func, 'attr') and hasattr(node.func, 'value') and hasattr(node.func.value, 'id'):
-                        if node.func.attr == 'forward' and node.func.value.id == 'self':
-                            new_smell = {'filename': filename, 'function_name': function_name,
-                                            'smell_name': 'pytorch_call_method_misused',
-                                            'line': node.lineno}
-                            smell_instance_list.append(new_smell)
-                            number_of_forward += 1
+        for node in function_context(fun_node).nodes(ast.Call):
+            if hasattr(node, 'func'):
+                if hasattr(node.func, 'attr') and hasattr(node.func, 'value') and hasattr(node.func.value, 'id'):
+                    if node.func.attr == 'forward' and node.func.value.id == 'self':
+                        new_smell = {'filename': filename, 'function_name': function_name,
+                                        'smell_name': 'pytorch_call_method_misused',
+                                        'line': node.lineno}
+                        smell_instance_list.append(new_smell)
+                        number_of_forward += 1
         if number_of_forward > 0:
             message = "is recommended to use self.net()"
             name_smell = "pytorch_call_method_misused"
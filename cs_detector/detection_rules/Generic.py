@@ -1,44 +1,35 @@
 import ast
 import re
 from ..code_extractor.models import check_model_method
-from ..code_extractor.libraries import get_library_of_node, extract_library_name, extract_library_as_name
+from ..code_extractor.dictionaries import ModelDictionary, TensorDictionary
+from ..code_extractor.libraries import get_library_of_node, extract_library_name
 
 from ..code_extractor.dataframe_detector import dataframe_check
 from ..code_extractor.variables import search_variable_definition
-
-test_libraries = ["pytest", "robot", "unittest", "doctest", "nose2", "testify", "pytest-cov", "pytest-xdist"]
-
-
-def get_lines_of_code(node):
-    function_name = node.name
-
-    function_body = ast.unparse(node.body).strip()
-    lines = function_body.split('\n')
-    return function_name, lines
+from ..code_extractor.function_context import function_context, scoped_walk
 
 
 def deterministic_algorithm_option_not_used(libraries, filename, node):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
     deterministic_algorithms = 0
     smell_instance_list = []
     message = "Please consider to remove the option 'torch.use_deterministic_algorithms(True)'. It can cause " \
               "performance issues"
-    if [x for x in libraries if 'torch' in x]:
+    if libraries.imports('torch'):
         function_name = node.name
 
-        for node in ast.walk(node):
-            if isinstance(node, ast.Call):
-                if hasattr(node, 'func'):
-                    if hasattr(node.func, 'id'):
-                        if node.func.id == 'use_deterministic_algorithms':
-                            if hasattr(node, 'args'):
-                                if len(node.args) == 1:
-                                    if hasattr(node.args[0], 'value'):
-                                        if node.args[0].value:
-                                            new_smell = {'filename': filename, 'function_name': function_name,'smell_name': 'deterministic_algorithm_option_not_used','line': node.lineno}
-                                            smell_instance_list.append(new_smell)
-                                            deterministic_algorithms += 1
+        for node in function_context(node).nodes(ast.Call):
+            if hasattr(node, 'func'):
+                if hasattr(node.func, 'id'):
+                    if node.func.id == 'use_deterministic_algorithms':
+                        if hasattr(node, 'args'):
+                            if len(node.args) == 1:
+                                if hasattr(node.args[0], 'value'):
+                                    if node.args[0].value:
+                                        new_smell = {'filename': filename, 'function_name': function_name,'smell_name': 'deterministic_algorithm_option_not_used','line': node.lineno}
+                                        smell_instance_list.append(new_smell)
+                                        deterministic_algorithms += 1
     if deterministic_algorithms > 0:
         name_smell = "deterministic_algorithm_option_not_used"
 
@@ -47,36 +38,35 @@ def deterministic_algorithm_option_not_used(libraries, filename, node):
     else:
         return [], []
 def merge_api_parameter_not_explicitly_set(libraries, filename, fun_node, df_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
     smell_instance_list = []
-    if [x for x in libraries if 'pandas' in x]:
-        function_name, lines = get_lines_of_code(fun_node)
+    if libraries.imports('pandas'):
+        function_name = fun_node.name
         number_of_merge_not_explicit = 0
         variables = dataframe_check(fun_node, libraries, df_dict)
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Call):
-                if hasattr(node.func, 'attr'):
-                    if node.func.attr == 'merge':
-                        if hasattr(node.func, 'value'):
-                            if hasattr(node.func.value, 'id'):
-                                if node.func.value.id in variables:
-                                    if not (hasattr(node, 'keywords')) or node.keywords is None:
+        for node in function_context(fun_node).nodes(ast.Call):
+            if hasattr(node.func, 'attr'):
+                if node.func.attr == 'merge':
+                    if hasattr(node.func, 'value'):
+                        if hasattr(node.func.value, 'id'):
+                            if node.func.value.id in variables:
+                                if not (hasattr(node, 'keywords')) or node.keywords is None:
+                                    new_smell = {'filename': filename, 'function_name': function_name,
+                                                 'smell_name': 'merge_api_parameter_not_explicitly_set',
+                                                 'line': node.lineno}
+                                    smell_instance_list.append(new_smell)
+                                    number_of_merge_not_explicit += 1
+                                else:
+                                    args = [x.arg for x in node.keywords]
+                                    if 'how' in args and 'on' in args and 'validate' in args:
+                                        continue
+                                    else:
                                         new_smell = {'filename': filename, 'function_name': function_name,
                                                      'smell_name': 'merge_api_parameter_not_explicitly_set',
                                                      'line': node.lineno}
                                         smell_instance_list.append(new_smell)
                                         number_of_merge_not_explicit += 1
-                                    else:
-                                        args = [x.arg for x in node.keywords]
-                                        if 'how' in args and 'on' in args and 'validate' in args:
-                                            continue
-                                        else:
-                                            new_smell = {'filename': filename, 'function_name': function_name,
-                                                         'smell_name': 'merge_api_parameter_not_explicitly_set',
-                                                         'line': node.lineno}
-                                            smell_instance_list.append(new_smell)
-                                            number_of_merge_not_explicit += 1
         if number_of_merge_not_explicit > 0:
             message = "merge not explicit"
             name_smell = "merge_api_parameter_not_explicitly_set"
@@ -87,42 +77,39 @@ def merge_api_parameter_not_explicitly_set(libraries, filename, fun_node, df_dic
 
 
 def columns_and_datatype_not_explicitly_set(libraries, filename, fun_node, df_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
-    library = None
+    library_names = frozenset()
     smell_instance_list = []
     number_of_columns_and_datatype_not_explicit = 0
-    function_name, lines = get_lines_of_code(fun_node)
-    if [x for x in libraries if 'pandas' in x]:
+    function_name = fun_node.name
+    if libraries.imports('pandas'):
         function_name = fun_node.name
-        for x in libraries:
-            if 'pandas' in x:
-                library = extract_library_as_name(x)
-
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Call):
-                if hasattr(node.func, 'attr'):
-                    if node.func.attr == 'DataFrame' or node.func.attr == 'read_csv':
-                        if hasattr(node.func, 'value'):
-                            if isinstance(node.func.value, ast.Name) and node.func.value.id == library:
-                                if not (hasattr(node, 'keywords')) or node.keywords is None or len(node.keywords) == 0:
+        library_names = libraries.aliases('pandas')
+
+        for node in function_context(fun_node).nodes(ast.Call):
+            if hasattr(node.func, 'attr'):
+                if node.func.attr == 'DataFrame' or node.func.attr == 'read_csv':
+                    if hasattr(node.func, 'value'):
+                        if isinstance(node.func.value, ast.Name) and node.func.value.id in library_names:
+                            if not (hasattr(node, 'keywords')) or node.keywords is None or len(node.keywords) == 0:
+                                new_smell = {'filename': filename, 'function_name': function_name,
+                                             'smell_name': 'columns_and_datatype_not_explicitly_set',
+                                             'line': node.lineno}
+                                smell_instance_list.append(new_smell)
+                                number_of_columns_and_datatype_not_explicit += 1
+
+                            else:
+                                args = [x.arg for x in node.keywords]
+                                if 'dtype' in args:
+                                    continue
+                                else:
                                     new_smell = {'filename': filename, 'function_name': function_name,
                                                  'smell_name': 'columns_and_datatype_not_explicitly_set',
                                                  'line': node.lineno}
                                     smell_instance_list.append(new_smell)
                                     number_of_columns_and_datatype_not_explicit += 1
 
-                                else:
-                                    args = [x.arg for x in node.keywords]
-                                    if 'dtype' in args:
-                                        continue
-                                    else:
-                                        new_smell = {'filename': filename, 'function_name': function_name,
-                                                     'smell_name': 'columns_and_datatype_not_explicitly_set',
-                                                     'line': node.lineno}
-                                        smell_instance_list.append(new_smell)
-                                        number_of_columns_and_datatype_not_explicit += 1
-
         if number_of_columns_and_datatype_not_explicit > 0:
             message = "columns and datatype not explicit"
             name_smell = "columns_and_datatype_not_explicitly_set"
@@ -145,13 +132,14 @@ Examples:
 
 
 def empty_column_misinitialization(libraries, filename, fun_node, df_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
     smell_instance_list = []
     # this is the list of values that are considered as smelly empty values
     empty_values = ['0', "''", '""']
-    function_name, lines = get_lines_of_code(fun_node)
-    if [x for x in libraries if 'pandas' in x]:
+    function_name = fun_node.name
+    context = function_context(fun_node)
+    if libraries.imports('pandas'):
         # get functions call of read_csv
         read_csv = []
         variables = []
@@ -159,23 +147,23 @@ def empty_column_misinitialization(libraries, filename, fun_node, df_dict):
         # get all defined variables that are dataframes
         variables = dataframe_check(fun_node, libraries, df_dict)
         # for each assignment of a variable
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Assign):
-                # check if the variable is a dataframe
-                if hasattr(node.targets[0], 'id'):
-                    if node.targets[0].id in variables:
-                        # check if the line is an assignment of a column of the dataframe
-                        if hasattr(node.targets[0], 'slice'):
-                            # select a line where uses to define a column df.[*] = *
-                            pattern = node.targets[0].id + '\[.*\]'
-                            # check if the line is an assignment of the value is 0 or ''
-                            if re.match(pattern, lines[node.lineno - 1]):
-                                if lines[node.lineno - 1].split('=')[1].strip() in empty_values:
-                                    new_smell = {'filename': filename, 'function_name': function_name,
-                                                    'smell_name': 'empty_column_misinitialization',
-                                                    'line': node.lineno}
-                                    smell_instance_list.append(new_smell)
-                                    number_of_apply += 1
+        for node in context.nodes(ast.Assign):
+            # check if the variable is a dataframe
+            if hasattr(node.targets[0], 'id'):
+                if node.targets[0].id in variables:
+                    # check if the line is an assignment of a column of the dataframe
+                    if hasattr(node.targets[0], 'slice'):
+                        # select a line where uses to define a column df.[*] = *
+                        pattern = node.targets[0].id + '\[.*\]'
+                        # check if the line is an assignment of the value is 0 or ''
+                        line = context.statement_source(node)
+                        if re.match(pattern, line):
+                            if line.split('=')[1].strip() in empty_values:
+                                new_smell = {'filename': filename, 'function_name': function_name,
+                                                'smell_name': 'empty_column_misinitialization',
+                                                'line': node.lineno}
+                                smell_instance_list.append(new_smell)
+                                number_of_apply += 1
 
         if number_of_apply > 0:
             message = "If they use zeros or empty strings to initialize a new empty column in Pandas" \
@@ -189,33 +177,30 @@ def empty_column_misinitialization(libraries, filename, fun_node, df_dict):
 
 
 def nan_equivalence_comparison_misused(libraries, filename, fun_node):
-    library_name = ""
-    if [x for x in libraries if x in test_libraries]:
+    library_names = frozenset()
+    if libraries.has_test_library:
         return [], []
     smell_instance_list = []
-    if [x for x in libraries if 'numpy' in x]:
-        for x in libraries:
-            if 'numpy' in x:
-                library_name = extract_library_as_name(x)
+    if libraries.imports('numpy'):
+        library_names = libraries.aliases('numpy')
         function_name = fun_node.name
         number_of_nan_equivalences = 0
-        for node in ast.walk(fun_node):
-            if isinstance(node, ast.Compare):
-                nan_equivalence = False
-                if hasattr(node.left, "value"):
-                    if hasattr(node.left.value, 'id'):
-                        if isinstance(node.left,
-                                      ast.Attribute) and node.left.attr == 'nan' and node.left.value.id == library_name:
+        for node in function_context(fun_node).nodes(ast.Compare):
+            nan_equivalence = False
+            if hasattr(node.left, "value"):
+                if hasattr(node.left.value, 'id'):
+                    if isinstance(node.left,
+                                  ast.Attribute) and node.left.attr == 'nan' and node.left.value.id in library_names:
+                        nan_equivalence = True
+                    for expr in node.comparators:
+                        if isinstance(expr, ast.Attribute) and expr.attr == 'nan' and expr.value.id in library_names:
                             nan_equivalence = True
-                        for expr in node.comparators:
-                            if isinstance(expr, ast.Attribute) and expr.attr == 'nan' and expr.value.id == library_name:
-                                nan_equivalence = True
-                        if nan_equivalence:
-                            new_smell = {'filename': filename, 'function_name': function_name,
-                                            'smell_name': 'nan_equivalence_comparison_misused',
-                                            'line': node.lineno}
-                            smell_instance_list.append(new_smell)
-                            number_of_nan_equivalences += 1
+                    if nan_equivalence:
+                        new_smell = {'filename': filename, 'function_name': function_name,
+                                        'smell_name': 'nan_equivalence_comparison_misused',
+                                        'line': node.lineno}
+                        smell_instance_list.append(new_smell)
+                        number_of_nan_equivalences += 1
         if number_of_nan_equivalences > 0:
             message = "NaN equivalence comparison misused"
             name_smell = "nan_equivalence_comparison_misused"
@@ -227,7 +212,7 @@ def nan_equivalence_comparison_misused(libraries, filename, fun_node):
 
 def in_place_apis_misused(libraries, filename, fun_node, df_dict):
     function_name = ''
-    if [x for x in libraries if 'pandas' in x]:
+    if libraries.imports('pandas'):
         function_name = fun_node.name
     if function_name == '':
         return [], []
@@ -245,8 +230,7 @@ def in_place_apis_misused(libraries, filename, fun_node, df_dict):
                                     if keyword.value.value == True:
                                         in_place_flag = True
                     if not in_place_flag:
-                        df = df_dict[df_dict['return_type'] == 'DataFrame']
-                        if node.value.func.attr in df['method'].values:
+                        if node.value.func.attr in df_dict.dataframe_methods:
                             new_smell = {'filename': filename, 'function_name': function_name,
                                             'smell_name': 'in_place_apis_misused',
                                             'line': node.lineno}
@@ -264,47 +248,36 @@ def in_place_apis_misused(libraries, filename, fun_node, df_dict):
 
 
 def memory_not_freed(libraries, filename, fun_node, model_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
     smell_instance_list = []
-    if [x for x in libraries if 'tensorflow' in x]:
+    if libraries.imports('tensorflow'):
         model_libs = ['tensorflow']
     else:
         return [], []
     memory_not_freed = 0
-    method_name = ''
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.For):  # add while
-            model_defined = False
-            # check if for contains ml method
-            for n in ast.walk(node):
-                if isinstance(n, ast.Call):
-                    if isinstance(n.func, ast.Attribute):
-                        method_name = n.func.attr + str('()')
-                    else:
-                        if hasattr(n.func, "id"):
-                            method_name = n.func.id + str('()')
-                            if check_model_method(method_name, model_dict, model_libs):
-                                model_defined = True
-            if model_defined:
-                free_memory = False
-                # check if for contains free memory
-                for n in ast.walk(node):
-                    if isinstance(n, ast.Call):
-                        if isinstance(n.func, ast.Attribute):
-                            method_name = n.func.attr
-                        else:
-                            if hasattr(n.func, "id"):
-                                method_name = n.func.id
-
-                        if method_name == 'clear_session':
-                            free_memory = True
-                if not free_memory:
-                    new_smell = {'filename': filename, 'function_name': fun_node.name,
-                                    'smell_name': 'memory_not_freed',
-                                    'line': node.lineno}
-                    smell_instance_list.append(new_smell)
-                    memory_not_freed += 1
+    for node in function_context(fun_node).nodes(ast.For):  # add while
+        model_defined = False
+        free_memory = False
+        method_name = ''
+        # check if for contains ml method and if it frees the memory, in a single pass over the loop
+        for n in scoped_walk(node):
+            if isinstance(n, ast.Call):
+                if isinstance(n.func, ast.Attribute):
+                    method_name = n.func.attr
+                else:
+                    if hasattr(n.func, "id"):
+                        method_name = n.func.id
+                        if check_model_method(method_name + str('()'), model_dict, model_libs):
+                            model_defined = True
+                if method_name == 'clear_session':
+                    free_memory = True
+        if model_defined and not free_memory:
+            new_smell = {'filename': filename, 'function_name': fun_node.name,
+                            'smell_name': 'memory_not_freed',
+                            'line': node.lineno}
+            smell_instance_list.append(new_smell)
+            memory_not_freed += 1
     if memory_not_freed > 0:
         to_return = [filename, fun_node.name, memory_not_freed, "memory_not_freed", "Memory not freed"]
         return to_return, smell_instance_list
@@ -312,40 +285,40 @@ def memory_not_freed(libraries, filename, fun_node, model_dict):
 
 
 def hyperparameters_not_explicitly_set(libraries, filename, fun_node, model_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
     model_libs = []
     smell_instance_list = []
     method_name = ''
-    dict_libs = set(model_dict['library'])
+    model_dict = ModelDictionary.of(model_dict)
+    dict_libs = model_dict.libraries
     for lib in dict_libs:
-        if [x for x in libraries if lib in x]:
+        if libraries.imports(lib):
             model_libs.append(lib)
     hyperparameters_not_explicitly_set = 0
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.Call):
-            while isinstance(node.func, ast.Call):
-                node = node.func
-            model_defined = False
-            if isinstance(node.func, ast.Attribute):
-                method_name = node.func.attr + str('()')
+    for node in function_context(fun_node).nodes(ast.Call):
+        while isinstance(node.func, ast.Call):
+            node = node.func
+        model_defined = False
+        if isinstance(node.func, ast.Attribute):
+            method_name = node.func.attr + str('()')
+        else:
+            if hasattr(node.func, "id"):
+                method_name = node.func.id + str('()')
+        if check_model_method(method_name, model_dict, model_libs):
+            if get_library_of_node(node, libraries) is None:
+                model_defined = True
             else:
-                if hasattr(node.func, "id"):
-                    method_name = node.func.id + str('()')
-            if check_model_method(method_name, model_dict, model_libs):
-                if get_library_of_node(node, libraries) is None:
+                if extract_library_name(get_library_of_node(node, libraries)).split(".")[0] in model_libs:
                     model_defined = True
-                else:
-                    if extract_library_name(get_library_of_node(node, libraries)).split(".")[0] in model_libs:
-                        model_defined = True
-            if model_defined:
-                # check if hyperparameters are set
-                if node.args == []:
-                    new_smell = {'filename': filename, 'function_name': fun_node.name,
-                                    'smell_name': 'hyperparameters_not_explicitly_set',
-                                    'line': node.lineno}
-                    smell_instance_list.append(new_smell)
-                    hyperparameters_not_explicitly_set += 1
+        if model_defined:
+            # check if hyperparameters are set
+            if node.args == []:
+                new_smell = {'filename': filename, 'function_name': fun_node.name,
+                                'smell_name': 'hyperparameters_not_explicitly_set',
+                                'line': node.lineno}
+                smell_instance_list.append(new_smell)
+                hyperparameters_not_explicitly_set += 1
 
     if hyperparameters_not_explicitly_set > 0:
         to_return = [filename, fun_node.name, hyperparameters_not_explicitly_set, "hyperparameters_not_explicitly_set",
@@ -355,59 +328,58 @@ def hyperparameters_not_explicitly_set(libraries, filename, fun_node, model_dict
 
 
 def hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, model_dict):
-    if [x for x in libraries if x in test_libraries]:
+    if libraries.has_test_library:
         return [], []
 
     model_libs = []
     smell_instance_list = []
     method_name = ''
-    dict_libs = set(model_dict['library'])
+    model_dict = ModelDictionary.of(model_dict)
+    dict_libs = model_dict.libraries
 
     for lib in dict_libs:
-        if [x for x in libraries if lib in x]:
+        if libraries.imports(lib):
             model_libs.append(lib)
 
     hyperparameters_not_explicitly_set = 0
 
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.Call):
-            while isinstance(node.func, ast.Call):
-                node = node.func
+    for node in function_context(fun_node).nodes(ast.Call):
+        while isinstance(node.func, ast.Call):
+            node = node.func
 
-            model_defined = False
-            if isinstance(node.func, ast.Attribute):
-                method_name = node.func.attr + str('()')
-            elif hasattr(node.func, "id"):
-                method_name = node.func.id + str('()')
+        model_defined = False
+        if isinstance(node.func, ast.Attribute):
+            method_name = node.func.attr + str('()')
+        elif hasattr(node.func, "id"):
+            method_name = node.func.id + str('()')
 
-            if check_model_method(method_name, model_dict, model_libs):
-                model_defined = True
+        if check_model_method(method_name, model_dict, model_libs):
+            model_defined = True
 
-            if model_defined:
-                # Find the hyperparameters required for the model from model_dict
-                model_index = model_dict['method'].index(method_name)
-                required_hyperparameters = model_dict['hyperparameters'][model_index].split(",")
+        if model_defined:
+            # Find the hyperparameters required for the model from model_dict
+            required_hyperparameters = model_dict.hyperparameters[method_name]
 
-                # Get the provided argument names from the node
-                provided_hyperparameters = [kw.arg for kw in node.keywords if hasattr(kw, 'arg')]
+            # Get the provided argument names from the node
+            provided_hyperparameters = [kw.arg for kw in node.keywords if hasattr(kw, 'arg')]
 
-                missing_hyperparameters = [param.strip() for param in required_hyperparameters if
-                                           param.strip() not in provided_hyperparameters]
+            missing_hyperparameters = [param for param in required_hyperparameters if
+                                       param not in provided_hyperparameters]
 
-                if missing_hyperparameters:
-                    missing_params_str = ", ".join(missing_hyperparameters)
-                    fix_message = f"Hyperparameters not explicitly set. Missing parameters: {missing_params_str}."
-                    if 'random_state' in missing_hyperparameters or 'random_seed' in missing_hyperparameters:
-                        fix_message += " Warning: Randomness is uncontrolled due to missing random_state or random_seed."
+            if missing_hyperparameters:
+                missing_params_str = ", ".join(missing_hyperparameters)
+                fix_message = f"Hyperparameters not explicitly set. Missing parameters: {missing_params_str}."
+                if 'random_state' in missing_hyperparameters or 'random_seed' in missing_hyperparameters:
+                    fix_message += " Warning: Randomness is uncontrolled due to missing random_state or random_seed."
 
-                    new_smell = {
-                        'filename': filename,
-                        'function_name': fun_node.name,
-                        'smell_name': 'hyperparameters_not_explicitly_set',
-                        'line': node.lineno,
-                    }
-                    smell_instance_list.append(new_smell)
-                    hyperparameters_not_explicitly_set += 1
+                new_smell = {
+                    'filename': filename,
+                    'function_name': fun_node.name,
+                    'smell_name': 'hyperparameters_not_explicitly_set',
+                    'line': node.lineno,
+                }
+                smell_instance_list.append(new_smell)
+                hyperparameters_not_explicitly_set += 1
 
     if hyperparameters_not_explicitly_set > 0:
         to_return = [filename, fun_node.name, hyperparameters_not_explicitly_set, "hyperparameters_not_explicitly_set",
@@ -419,61 +391,60 @@ def hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node,
 
 def unnecessary_iteration(libraries, filename, fun_node, df_dict):
     function_name = ''
-    if [x for x in libraries if 'pandas' in x]:
+    if libraries.imports('pandas'):
         function_name = fun_node.name
     if function_name == '':
         return [], []
     smell_instance_list = []
     variables = dataframe_check(fun_node, libraries, df_dict)
     unnecessary_iterations = 0
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.For):
-            if isinstance(node.iter, ast.Call):
-                if hasattr(node.iter, 'func'):
-                    if isinstance(node.iter.func, ast.Attribute):
-                        if node.iter.func.attr == 'iterrows':
-                            # add iterators of the for cycle to variables
-                            if isinstance(node.target, ast.Tuple):
-                                for target in node.target.elts:
-                                    if isinstance(target, ast.Name):
-                                        variables.append(target.id)
-                            # check if for contains pandas method
-                            for n in ast.walk(node):
-                                op_to_analyze = None
-                                if isinstance(n, ast.Call):
-                                    if isinstance(n.func, ast.Attribute):
-                                        if n.func.attr == 'append':
-                                            for arg in n.args:
-                                                if isinstance(arg, ast.BinOp):
-                                                    op_to_analyze = arg
-
-                                if isinstance(n, ast.Assign):
-                                    if isinstance(n.value, ast.BinOp):
-                                        op_to_analyze = n.value
-
-                                if op_to_analyze is not None:
-                                    op_to_analyze_left = op_to_analyze.left
-                                    op_to_analyze_right = op_to_analyze.right
-                                    while isinstance(op_to_analyze_left, ast.Subscript):
-                                        op_to_analyze_left = op_to_analyze_left.value
-                                    while isinstance(op_to_analyze_right, ast.Subscript):
-                                        op_to_analyze_right = op_to_analyze_right.value
-
-                                    if isinstance(op_to_analyze_left, ast.Name):
-                                        if op_to_analyze_left.id in variables:
-                                            new_smell = {'filename': filename, 'function_name': fun_node.name,
-                                                            'smell_name': 'unnecessary_iteration',
-                                                            'line': node.lineno}
-                                            smell_instance_list.append(new_smell)
-                                            unnecessary_iterations += 1
-
-                                    if isinstance(op_to_analyze_right, ast.Name):
-                                        if op_to_analyze_right.id in variables:
-                                            new_smell = {'filename': filename, 'function_name': fun_node.name,
-                                                            'smell_name': 'unnecessary_iteration',
-                                                            'line': node.lineno}
-                                            smell_instance_list.append(new_smell)
-                                            unnecessary_iterations += 1
+    for node in function_context(fun_node).nodes(ast.For):
+        if isinstance(node.iter, ast.Call):
+            if hasattr(node.iter, 'func'):
+                if isinstance(node.iter.func, ast.Attribute):
+                    if node.iter.func.attr == 'iterrows':
+                        # add iterators of the for cycle to variables
+                        if isinstance(node.target, ast.Tuple):
+                            for target in node.target.elts:
+                                if isinstance(target, ast.Name):
+                                    variables.append(target.id)
+                        # check if for contains pandas method
+                        for n in scoped_walk(node):
+                            op_to_analyze = None
+                            if isinstance(n, ast.Call):
+                                if isinstance(n.func, ast.Attribute):
+                                    if n.func.attr == 'append':
+                                        for arg in n.args:
+                                            if isinstance(arg, ast.BinOp):
+                                                op_to_analyze = arg
+
+                            if isinstance(n, ast.Assign):
+                                if isinstance(n.value, ast.BinOp):
+                                    op_to_analyze = n.value
+
+                            if op_to_analyze is not None:
+                                op_to_analyze_left = op_to_analyze.left
+                                op_to_analyze_right = op_to_analyze.right
+                                while isinstance(op_to_analyze_left, ast.Subscript):
+                                    op_to_analyze_left = op_to_analyze_left.value
+                                while isinstance(op_to_analyze_right, ast.Subscript):
+                                    op_to_analyze_right = op_to_analyze_right.value
+
+                                if isinstance(op_to_analyze_left, ast.Name):
+                                    if op_to_analyze_left.id in variables:
+                                        new_smell = {'filename': filename, 'function_name': fun_node.name,
+                                                        'smell_name': 'unnecessary_iteration',
+                                                        'line': node.lineno}
+                                        smell_instance_list.append(new_smell)
+                                        unnecessary_iterations += 1
+
+                                if isinstance(op_to_analyze_right, ast.Name):
+                                    if op_to_analyze_right.id in variables:
+                                        new_smell = {'filename': filename, 'function_name': fun_node.name,
+                                                        'smell_name': 'unnecessary_iteration',
+                                                        'line': node.lineno}
+                                        smell_instance_list.append(new_smell)
+                                        unnecessary_iterations += 1
 
     if unnecessary_iterations > 0:
         message = "Iterating through pandas objects is generally slow. In many cases, iterating manually over the rows is not needed and can be avoided" \
@@ -486,13 +457,10 @@ def unnecessary_iteration(libraries, filename, fun_node, df_dict):
 
 def broadcasting_feature_not_used(libraries, filename, fun_node, tensor_dict):
     function_name = ''
-    library_name = ''
     smell_instance_list = []
-    if [x for x in libraries if 'tensorflow' in x]:
+    if libraries.imports('tensorflow'):
         function_name = fun_node.name
-    for x in libraries:
-        if 'tensorflow' in x:
-            library_name = extract_library_as_name(x)
+    library_names = libraries.aliases('tensorflow')
     if function_name == '':
         return [], []
     broadcasting_features_not_used_counter = 0
@@ -500,16 +468,15 @@ def broadcasting_feature_not_used(libraries, filename, fun_node, tensor_dict):
     tensor_variables = dict()
 
     # search for all tf.constant tensors used
-    for node in ast.walk(fun_node):
+    for node in function_context(fun_node).nodes(ast.Assign):
         n = None
-        if isinstance(node, ast.Assign):
-            if isinstance(node.value, ast.Call):
-                if isinstance(node.value.func, ast.Attribute):
+        if isinstance(node.value, ast.Call):
+            if isinstance(node.value.func, ast.Attribute):
 
-                    if (node.value.func.attr == 'constant' or node.value.func.attr == 'Variable') and\
-                            hasattr(node.value.func.value,'id') and\
-                            node.value.func.value.id == library_name:
-                        n = node.value
+                if (node.value.func.attr == 'constant' or node.value.func.attr == 'Variable') and\
+                        hasattr(node.value.func.value,'id') and\
+                        node.value.func.value.id in library_names:
+                    n = node.value
         if n:
             if hasattr(n,'args') and len(n.args) > 0:
                 if isinstance(n.args[0], ast.Name):
@@ -528,7 +495,7 @@ def broadcasting_feature_not_used(libraries, filename, fun_node, tensor_dict):
                         continue
     tensor_variables_with_tiling = tensor_check_tiling(fun_node,tensor_variables)
     #filter operation with tensor variables with tiling
-    operations = search_tensor_combination_operation(fun_node, tensor_dict, tensor_variables)
+    operations = search_tensor_combination_operation(fun_node, TensorDictionary.of(tensor_dict), tensor_variables)
     #check if the operations are compatible with broadcasting
     broadcasting_checking_tensors = []
     for operation in operations:
@@ -586,40 +553,38 @@ def broadcast(tensor1,tensor2):
 def tensor_check_tiling(fun_node,tensor_variables):
     variable_with_tiling = []
 
-    for node in ast.walk(fun_node):
+    for node in function_context(fun_node).nodes(ast.Assign):
         n = None
-        if isinstance(node, ast.Assign):
-            if isinstance(node.value, ast.Call):
-                n = node.value
-            if n:
-                if isinstance(n.func, ast.Attribute):
-                    if isinstance(n.func.value, ast.Name):
-                        if n.func.value.id == 'tf':
-                            if n.func.attr == 'tile':
-                                if hasattr(node.value, "args") and len(node.value.args) > 0:
-                                    if isinstance(node.value.args[0], ast.Name):
-                                        if node.value.args[0].id in tensor_variables.keys():
-                                            variable_with_tiling.append(node.targets[0].id)
-                                            tensor_variables.update({node.targets[0].id: tensor_variables[node.value.args[0].id]})
+        if isinstance(node.value, ast.Call):
+            n = node.value
+        if n:
+            if isinstance(n.func, ast.Attribute):
+                if isinstance(n.func.value, ast.Name):
+                    if n.func.value.id == 'tf':
+                        if n.func.attr == 'tile':
+                            if hasattr(node.value, "args") and len(node.value.args) > 0:
+                                if isinstance(node.value.args[0], ast.Name):
+                                    if node.value.args[0].id in tensor_variables.keys():
+                                        variable_with_tiling.append(node.targets[0].id)
+                                        tensor_variables.update({node.targets[0].id: tensor_variables[node.value.args[0].id]})
     return variable_with_tiling
 
 
 
 def search_tensor_combination_operation(fun_node,tensor_dict, tensor_variables):
     operation_between_tensors = []
-    for node in ast.walk(fun_node):
-        if isinstance(node, ast.Call):
-            tensors_used = 0
-            if isinstance(node.func, ast.Attribute):
-                if node.func.attr in tensor_dict['method_name']:
-                    for arg in node.args:
-                        if isinstance(arg, ast.List):
+    for node in function_context(fun_node).nodes(ast.Call):
+        tensors_used = 0
+        if isinstance(node.func, ast.Attribute):
+            if node.func.attr in tensor_dict.methods:
+                for arg in node.args:
+                    if isinstance(arg, ast.List):
+                        tensors_used += 1
+                    if isinstance(arg, ast.Name):
+                        if arg.id in tensor_variables:
                             tensors_used += 1
-                        if isinstance(arg, ast.Name):
-                            if arg.id in tensor_variables:
-                                tensors_used += 1
-            if tensors_used > 1:
-                operation_between_tensors.append(node)
+        if tensors_used > 1:
+            operation_between_tensors.append(node)
     return operation_between_tensors
 
 
@@ -631,38 +596,34 @@ def search_tensor_combination_operation(fun_node,tensor_dict, tensor_variables):
 
 def search_for_tensor_variables(libraries, filename, fun_node, tensor_dict):
     function_name = ''
-    library_name = ''
-    if [x for x in libraries if 'tensorflow' in x]:
+    if libraries.imports('tensorflow'):
         function_name = fun_node.name
-    for x in libraries:
-        if 'tensorflow' in x:
-            library_name = extract_library_as_name(x)
+    library_names = libraries.aliases('tensorflow')
     if function_name == '':
         return []
     broadcasting_features_not_used = 0
     tensor_variables = dict()
-    for node in ast.walk(fun_node):
+    for node in function_context(fun_node).nodes(ast.Assign):
         collected_list = None
-        if isinstance(node, ast.Assign):
-            if isinstance(node.value, ast.Call):
-                if isinstance(node.value.func, ast.Attribute):
-                    if (node.value.func.attr == 'constant' or node.value.func.attr == 'Variable') and node.value.func.value.id == library_name:
+        if isinstance(node.value, ast.Call):
+            if isinstance(node.value.func, ast.Attribute):
+                if (node.value.func.attr == 'constant' or node.value.func.attr == 'Variable') and node.value.func.value.id in library_names:
+                    if hasattr(node.value, 'args') and (len(node.value.args) > 0):
+                        collected_list = search_tensor_constants(node.value.args[0])
+                    if collected_list:
+                        tensor_variables.update({node.targets[0].id: collected_list})
+                    else:
                         if hasattr(node.value, 'args') and (len(node.value.args) > 0):
-                            collected_list = search_tensor_constants(node.value.args[0])
-                        if collected_list:
-                            tensor_variables.update({node.targets[0].id: collected_list})
-                        else:
-                            if hasattr(node.value, 'args') and (len(node.value.args) > 0):
-                                if isinstance(node.value.args[0], ast.Name):
-                                    if hasattr(node.value.args[0], 'id'):
-                                        variable = search_variable_definition(node.value.args[0].id,fun_node,node)
-                                        if variable:
-                                            if isinstance(variable, ast.Assign):
-                                                if isinstance(variable.value, ast.List):
-                                                    tensor_variables.update({node.targets[0].id: search_tensor_constants(variable.value)})
+                            if isinstance(node.value.args[0], ast.Name):
+                                if hasattr(node.value.args[0], 'id'):
+                                    variable = search_variable_definition(node.value.args[0].id,fun_node,node)
+                                    if variable:
+                                        if isinstance(variable, ast.Assign):
+                                            if isinstance(variable.value, ast.List):
+                                                tensor_variables.update({node.targets[0].id: search_tensor_constants(variable.value)})
 
 
-            return tensor_variables
+        return tensor_variables
 
 def search_tensor_constants(node):
     try:
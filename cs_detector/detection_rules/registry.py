@@ -0,0 +1,135 @@
+import ast
+import re
+from collections import namedtuple
+
+from .Generic import *
+from .APISpecific import *
+
+# A detection rule and the node types it is interested in: the detector builds the node index of a function once
+# and skips every rule whose node types do not occur in it.
+# function is called as function(libraries, filename, fun_node[, dictionary]), where libraries is an ImportTable
+# and no longer a list of import strings: rule_check converts its libraries once for all the rules, a rule called
+# directly needs ImportTable.of(libraries).
+# dictionary is the name of the obj_dictionary passed to the rule as last argument (None if it takes no dictionary).
+# libraries are the packages the rule applies to, it is skipped in files importing none of them
+# (None for the libraries listed in its dictionary).
+# triggers are the tokens the rule cannot report a smell without, used by the optional pre-parse screening
+# (None for the method names listed in its dictionary).
+Rule = namedtuple("Rule", ["name", "function", "node_types", "dictionary", "libraries", "triggers"])
+
+# rules are listed in the order in which their results are reported
+RULES = [
+    Rule("deterministic_algorithm_option_not_used", deterministic_algorithm_option_not_used, (ast.Call,), None,
+         ("torch",), ("use_deterministic_algorithms",)),
+    Rule("merge_api_parameter_not_explicitly_set", merge_api_parameter_not_explicitly_set, (ast.Call,), "dataframes",
+         ("pandas",), ("merge",)),
+    Rule("columns_and_datatype_not_explicitly_set", columns_and_datatype_not_explicitly_set, (ast.Call,), "dataframes",
+         ("pandas",), ("DataFrame", "read_csv")),
+    Rule("empty_column_misinitialization", empty_column_misinitialization, (ast.Assign,), "dataframes", ("pandas",),
+         ("[",)),
+    Rule("nan_equivalence_comparison_misused", nan_equivalence_comparison_misused, (ast.Compare,), None, ("numpy",),
+         ("nan",)),
+    Rule("in_place_apis_misused", in_place_apis_misused, (ast.Call,), "dataframes", ("pandas",), None),
+    Rule("memory_not_freed", memory_not_freed, (ast.For,), "models", ("tensorflow",), None),
+    Rule("Chain_Indexing", Chain_Indexing, (ast.Subscript,), "dataframes", ("pandas",), ("[",)),
+    Rule("dataframe_conversion_api_misused", dataframe_conversion_api_misused, (ast.Attribute,), "dataframes",
+         ("pandas",), ("values",)),
+    Rule("matrix_multiplication_api_misused", matrix_multiplication_api_misused, (ast.Call,), None, ("numpy",),
+         ("dot",)),
+    Rule("gradients_not_cleared_before_backward_propagation", gradients_not_cleared_before_backward_propagation,
+         (ast.For, ast.While), None, ("torch",), ("backward",)),
+    Rule("tensor_array_not_used", tensor_array_not_used, (ast.Call,), None, ("tensorflow",), ("constant",)),
+    Rule("pytorch_call_method_misused", pytorch_call_method_misused, (ast.Call,), None, ("torch",), ("forward",)),
+    Rule("unnecessary_iteration", unnecessary_iteration, (ast.For,), "dataframes", ("pandas",), ("iterrows",)),
+    Rule("broadcasting_feature_not_used", broadcasting_feature_not_used, (ast.Call,), "tensors", ("tensorflow",),
+         ("constant", "Variable")),
+    Rule("hyperparameters_not_explicitly_set", hyperparameters_randomness_not_explicitly_set, (ast.Call,), "models",
+         None, None),
+]
+
+
+def rule_libraries(rule, dictionaries):
+    if rule.libraries is not None:
+        return rule.libraries
+    return getattr(dictionaries, rule.dictionary).libraries
+
+
+def applicable_rules(libraries, dictionaries):
+    """
+    Return the rules that apply to a file with the given ImportTable, in reporting order.
+    """
+    return [rule for rule in RULES
+            if any(libraries.imports(library) for library in rule_libraries(rule, dictionaries))]
+
+
+def library_pattern(dictionaries):
+    """
+    Regular expression matching the top-level name of any library the rules apply to, compiled once for
+    each version of the dictionaries.
+    """
+    pattern = _library_patterns.get(dictionaries.version)
+    if pattern is None:
+        names = sorted({library.split(".")[0] for rule in RULES for library in rule_libraries(rule, dictionaries)})
+        pattern = re.compile(rb"\b(?:" + b"|".join(re.escape(name.encode()) for name in names) + rb")\b")
+        _library_patterns[dictionaries.version] = pattern
+    return pattern
+
+
+_library_patterns = {}
+
+
+def may_apply(source, dictionaries):
+    """
+    Cheap check on the source of a file, before it is parsed: a rule can only apply if the name of one of its
+    libraries occurs somewhere in the source. The source is scanned once and imports are usually at the top,
+    so the scan stops early on files that use the libraries.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    return library_pattern(dictionaries).search(source) is not None
+
+
+# identifiers of a source file, non-ASCII identifiers are split but never hide an ASCII token
+IDENTIFIER = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def rule_triggers(rule, dictionaries):
+    if rule.triggers is not None:
+        return rule.triggers
+    methods = getattr(dictionaries, rule.dictionary).methods
+    return [method[:-2] if method.endswith("()") else method for method in methods]
+
+
+def screening_table(dictionaries):
+    """
+    For each rule, the top-level names of its libraries, its identifier triggers and its other (symbol) triggers,
+    built once for each version of the dictionaries.
+    """
+    table = _screening_tables.get(dictionaries.version)
+    if table is None:
+        table = []
+        for rule in RULES:
+            triggers = [trigger.encode() for trigger in rule_triggers(rule, dictionaries)]
+            words = frozenset(trigger for trigger in triggers if IDENTIFIER.fullmatch(trigger))
+            symbols = tuple(trigger for trigger in triggers if trigger not in words)
+            libraries = frozenset(library.split(".")[0].encode() for library in rule_libraries(rule, dictionaries))
+            table.append((rule, libraries, words, symbols))
+        _screening_tables[dictionaries.version] = table
+    return table
+
+
+_screening_tables = {}
+
+
+def screen_rules(source, dictionaries):
+    """
+    Pre-parse screening of the raw source of a file: return the rules that may report a smell on it, that is the
+    rules whose library names and at least one of whose triggers occur in the source. The identifiers are
+    collected in a single scan, the file does not need to be parsed when no rule is returned.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    words = set(IDENTIFIER.findall(source))
+    return [rule for rule, libraries, triggers, symbols in screening_table(dictionaries)
+            if not libraries.isdisjoint(words)
+            and (not triggers.isdisjoint(words) or any(symbol in source for symbol in symbols))]
@@ -1,19 +1,26 @@
 import argparse
+import os
+import sqlite3
 import sys
 import pandas as pd
 
+# the script is run from any folder, the overview is read with the modules of the analyzer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.output_format import read_table
 
+# last finished analysis stored in a results database
+LAST_RUN = "(SELECT MAX(id) FROM runs WHERE finished IS NOT NULL)"
 
 
 def smell_report(input_file):
-    df = pd.read_csv(input_file)
+    df = read_table(input_file, ['name_smell', 'smell'], categories=False)
     #filter dataframe with only the columns we need
     df = df[[ 'name_smell', 'smell']]
     a = df.groupby('name_smell').sum()
     a.to_csv('general_overview.csv')
 
 def project_report(input_file):
-    df = pd.read_csv(input_file)
+    df = read_table(input_file, ['filename', 'name_smell', 'smell'], categories=False)
     #filter dataframe with only the columns we need
     df = df[['filename', 'name_smell', 'smell']]
     #cut first part of filename to get project name
@@ -23,13 +30,45 @@ def project_report(input_file):
     df['smell'] = df['smell'].astype(int)
     a = df.groupby('project_name').sum()
     a.to_csv('project_overview.csv')
+
+
+def query_results(db, sql, run=None):
+    """
+    Run a query on the results database written by the analyzer with --db, ? stands for the run to report
+    (the last finished one if run is None).
+    """
+    with sqlite3.connect(f"file:{db}?mode=ro", uri=True) as connection:
+        run_id = run if run is not None else connection.execute(f"SELECT {LAST_RUN}").fetchone()[0]
+        return pd.read_sql_query(sql, connection, params=[run_id] * sql.count("?"))
+
+
+def smell_report_db(db, run=None):
+    a = query_results(db, "SELECT name_smell, SUM(smell) AS smell FROM smells WHERE run_id = ? "
+                          "GROUP BY name_smell ORDER BY name_smell", run)
+    a.to_csv('general_overview.csv', index=False)
+
+
+def project_report_db(db, run=None):
+    # the database knows the project of each smell, there is no need to extract it from the filename
+    a = query_results(db, "SELECT project AS project_name, SUM(smell) AS smell FROM smells WHERE run_id = ? "
+                          "GROUP BY project ORDER BY project", run)
+    a.to_csv('project_overview.csv', index=False)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate a ausiliary charts ")
-    parser.add_argument('--input', type=str, default="./overview_output.csv", help="Path to the input .csv file")
+    parser.add_argument('--input', type=str, default="./overview_output.csv", help="Path to the input .csv, .parquet or .feather file")
+
+    parser.add_argument('--db', type=str, help="Results database of the analyzer (--db), used instead of --input")
+    parser.add_argument('--run', type=int, help="Run of the database to report, the last finished one by default")
 
     args = parser.parse_args()
-    project_report(args.input)
-    smell_report(args.input)
+    if args.db is not None:
+        project_report_db(args.db, args.run)
+        smell_report_db(args.db, args.run)
+    else:
+        project_report(args.input)
+        smell_report(args.input)
 
     print("Ausiliary charts generated")
     sys.exit(0)
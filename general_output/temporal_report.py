@@ -1,28 +1,73 @@
 import argparse
+import os
+import sqlite3
 import sys
 
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.run_history import RunHistory
 
-def temporal_chart(input_file):
+
+def smell_counts_db(db):
+    """
+    Number of smells and start date of every finished run of a results database written by the analyzer with --db.
+    """
+    with sqlite3.connect(f"file:{db}?mode=ro", uri=True) as connection:
+        return pd.read_sql_query("SELECT runs.started AS date, COALESCE(SUM(smells.smell), 0) AS smells FROM runs "
+                                 "LEFT JOIN smells ON smells.run_id = runs.id WHERE runs.finished IS NOT NULL "
+                                 "GROUP BY runs.id", connection)
+
+
+def smell_counts_history(input_file, by="smell", start=None, end=None):
     """
-    Given a .csv file with smells and date columns, creates a temporal chart which
+    Total smells and date of the runs of a run history (run_history.jsonl) dated between start and end, with a
+    column for the smells of each type (by="smell") or of each project (by="project").
+    """
+    runs = RunHistory(os.path.dirname(os.path.abspath(input_file)), os.path.basename(input_file)).runs(start, end)
+    counts = "smell_counts" if by == "smell" else "projects"
+    df = pd.DataFrame([dict(run[counts], date=run["date"], smells=run["smells"]) for run in runs])
+    # a smell type or project missing from a run has no smells in it
+    return df.fillna(0)
+
+
+def temporal_chart(input_file="./run_history.jsonl", db=None, by="total", start=None, end=None):
+    """
+    Given the run history of the analyzer (.jsonl), creates a temporal chart which
     highlights the number of smells between different dates/executions.
+    The runs between start and end are charted, with a line for each smell type (by="smell")
+    or project (by="project") besides the total.
+    A .csv file with smells and date columns can be given instead, or the counts are queried
+    from the results database db when given.
     """
 
-    try:
-        df = pd.read_csv(input_file)
-    except FileNotFoundError:
-        print(f"Error: File '{input_file}' not found.")
-        sys.exit(1)
-    except pd.errors.EmptyDataError:
-        print("Error: The input CSV file is empty.")
-        sys.exit(1)
-    except pd.errors.ParserError:
-        print("Error: The input file is not a valid CSV format.")
-        sys.exit(1)
+    columns = ['smells']
+    if db is not None:
+        df = smell_counts_db(db)
+    elif input_file.endswith(".jsonl"):
+        if not os.path.exists(input_file):
+            print(f"Error: File '{input_file}' not found.")
+            sys.exit(1)
+        df = smell_counts_history(input_file, by, start, end)
+        if df.empty:
+            print("Error: No runs in the run history.")
+            sys.exit(1)
+        if by != "total":
+            columns += [column for column in df.columns if column not in ("date", "smells")]
+    else:
+        try:
+            df = pd.read_csv(input_file)
+        except FileNotFoundError:
+            print(f"Error: File '{input_file}' not found.")
+            sys.exit(1)
+        except pd.errors.EmptyDataError:
+            print("Error: The input CSV file is empty.")
+            sys.exit(1)
+        except pd.errors.ParserError:
+            print("Error: The input file is not a valid CSV format.")
+            sys.exit(1)
 
     # Convert 'date' column to datetime
     df['date'] = pd.to_datetime(df['date'])
@@ -36,8 +81,11 @@ def temporal_chart(input_file):
     # Start the plot
     fig, ax1 = plt.subplots(figsize=(10, 6))
 
-    # Plot using the index for x-axis and smells for y-axis
-    ax1.plot(df.index + 1, df['smells'], marker='o', linestyle='-')  # adding 1 to start index from 1
+    # Plot using the index for x-axis and smells for y-axis, a line for each column
+    for column in columns:
+        ax1.plot(df.index + 1, df[column], marker='o', linestyle='-', label=column)  # adding 1 to start index from 1
+    if len(columns) > 1:
+        ax1.legend()
     ax1.set_title('Number of Smells Over Time')
     ax1.set_xlabel('Execution Index')
     ax1.set_ylabel('Number of Smells')
@@ -64,11 +112,17 @@ def temporal_chart(input_file):
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a temporal chart of smells over time")
-    parser.add_argument('--input', type=str, required=True, help="Path to the input .csv file")
+    parser.add_argument('--input', type=str, default="./run_history.jsonl",
+                        help="Path to the run_history.jsonl of the analyzer, or to a .csv file with smells and date "
+                             "columns")
+    parser.add_argument('--db', type=str, help="Results database of the analyzer (--db), used instead of --input")
+    parser.add_argument('--by', choices=["total", "smell", "project"], default="smell",
+                        help="Lines of the chart of a run history besides the total: one per smell type or project")
+    parser.add_argument('--start', type=str, help="First date of the runs charted from a run history, e.g. 2024-05")
+    parser.add_argument('--end', type=str, help="Last date of the runs charted from a run history, e.g. 2024-06-30")
 
     args = parser.parse_args()
-
-    temporal_chart(args.input)
+    temporal_chart(args.input, args.db, args.by, args.start, args.end)
 
     print("Temporal chart generated")
     sys.exit(0)
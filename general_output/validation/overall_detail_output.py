@@ -1,7 +1,13 @@
+import csv
 import os
+import sqlite3
+import sys
 
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from components.output_format import EXTENSIONS, read_table
+
 # this function creates a unique file for each smell report identified in the output folder
 smells_names=['deterministic_algorithm_option_not_used','merge_api_parameter_not_explicitly_set','columns_and_datatype_not_explicitly_set','empty_column_misinitialization','nan_equivalence_comparison_misused','in_place_apis_misused','memory_not_freed','Chain_Indexing','dataframe_conversion_api_misused','matrix_multiplication_api_misused','gradients_not_cleared_before_backward_propagation','tensor_array_not_used','pytorch_call_method_misused','unnecessary_iteration','broadcasting_feature_not_used']
 def merge_detail_files(input_path,output_path):
@@ -11,14 +17,26 @@ def merge_detail_files(input_path,output_path):
             #get list of file of each dir
             for file in os.listdir(input_path + dir):
                 #open each csv file
-                if file.endswith(".csv") and file.split(".")[0] in smells_names:
+                if os.path.splitext(file)[1] in EXTENSIONS.values() and file.split(".")[0] in smells_names:
 
-                    report = pd.read_csv(input_path + dir+"/"+file)
+                    report = read_table(input_path + dir+"/"+file, categories=False)
                     for index, row in report.iterrows():
                         f.write(row["filename"] + "," + row["function_name"] + "," + row["smell_name"] + "," + str(row["line"]) + "\n")
         f.close()
         return
 
+def merge_detail_files_db(db, output_path, run=None):
+    # same file as merge_detail_files, read from the results database of the analyzer (last finished run by default)
+    with sqlite3.connect(f"file:{db}?mode=ro", uri=True) as connection, \
+            open(output_path + "overall_detail_output.csv", "w", newline="") as f:
+        if run is None:
+            run = connection.execute("SELECT MAX(id) FROM runs WHERE finished IS NOT NULL").fetchone()[0]
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["filename", "function_name", "smell_name", "line"])
+        writer.writerows(connection.execute("SELECT filename, function_name, smell_name, line FROM smell_instances "
+                                            "WHERE run_id = ?", (run,)))
+
+
 def diff_files():
     df = pd.read_csv("overall_detail_output.csv")
     df2 = pd.read_csv("../overview_output.csv")
@@ -4,6 +4,7 @@ import math
 from datetime import datetime
 
 import os
+import sqlite3
 
 smells_names=['deterministic_algorithm_option_not_used','merge_api_parameter_not_explicitly_set','columns_and_datatype_not_explicitly_set','empty_column_misinitialization','nan_equivalence_comparison_misused','in_place_apis_misused','memory_not_freed','Chain_Indexing','dataframe_conversion_api_misused','matrix_multiplication_api_misused','gradients_not_cleared_before_backward_propagation','tensor_array_not_used','pytorch_call_method_misused','unnecessary_iteration','broadcasting_feature_not_used']
 
@@ -37,9 +38,19 @@ def calculate_sample_size(population_size, confidence_level, margin_error, popul
     return math.ceil(sample_size)
 
 
-def stratifying(input_dataset, smell_name, confidence_level=0.95, margin_error=0.05):
+def read_smell_instances(input_dataset, smell_name):
+    # input_dataset is overall_detail_output.csv or the results database of the analyzer (last finished run)
+    if input_dataset.endswith((".db", ".sqlite")):
+        with sqlite3.connect(f"file:{input_dataset}?mode=ro", uri=True) as connection:
+            return pd.read_sql_query("SELECT filename, function_name, smell_name, line FROM smell_instances "
+                                     "WHERE smell_name = ? AND run_id = (SELECT MAX(id) FROM runs "
+                                     "WHERE finished IS NOT NULL)", connection, params=[smell_name])
     df = pd.read_csv(input_dataset)
-    df = df[df['smell_name'] == smell_name]
+    return df[df['smell_name'] == smell_name]
+
+
+def stratifying(input_dataset, smell_name, confidence_level=0.95, margin_error=0.05):
+    df = read_smell_instances(input_dataset, smell_name)
 
     # Parametri di esempio
     population_size = len(df)
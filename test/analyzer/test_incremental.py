@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from components.incremental import changed_files
+from controller import analyzer
+from test.helpers import SMELLY_SOURCE, git, result_files
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        self.output = tempfile.mkdtemp()
+        for i in range(5):
+            self.write(f"module_{i}.py", SMELLY_SOURCE.format(n=i))
+        git(self.project, "init", "-q")
+        git(self.project, "add", "-A")
+        git(self.project, "commit", "-q", "-m", "first")
+
+    def tearDown(self):
+        shutil.rmtree(self.project)
+        shutil.rmtree(self.output)
+
+    def write(self, name, content):
+        with open(os.path.join(self.project, name), "w") as file:
+            file.write(content)
+
+    def analyzed(self, output_path):
+        # names of the files analyzed by an incremental analysis
+        analyzed = []
+        inspect_file = analyzer.inspect_file
+        with mock.patch.object(analyzer, "inspect_file", side_effect=lambda filename, *args, **kwargs:
+                               analyzed.append(os.path.basename(filename)) or
+                               inspect_file(filename, *args, **kwargs)):
+            analyzer.analyze_project(self.project, output_path, incremental=True)
+        return sorted(analyzed)
+
+    def test_only_changed_files_are_analyzed(self):
+        self.assertEqual(len(self.analyzed(self.output)), 5)
+
+        self.write("module_0.py", SMELLY_SOURCE.format(n=10))
+        git(self.project, "rm", "-q", "module_1.py")
+        git(self.project, "mv", "module_2.py", "renamed.py")
+        git(self.project, "commit", "-q", "-am", "second")
+        # changes not committed and new files are analyzed too
+        self.write("module_3.py", "import pandas as pd\n")
+        self.write("new.py", SMELLY_SOURCE.format(n=11))
+
+        self.assertEqual(self.analyzed(self.output), ["module_0.py", "module_3.py", "new.py", "renamed.py"])
+        full = os.path.join(self.output, "full")
+        analyzer.analyze_project(self.project, full)
+        self.assertEqual(result_files(self.output), result_files(full))
+
+        # module_3.py was not committed, its results are not kept once it is restored
+        git(self.project, "checkout", "--", "module_3.py")
+        self.assertEqual(self.analyzed(self.output), ["module_3.py", "new.py"])
+
+    def test_changed_files(self):
+        self.write("module_0.py", "x = 1\n")
+        git(self.project, "mv", "module_1.py", "renamed.py")
+        self.write("new.py", "x = 1\n")
+
+        self.assertEqual({os.path.basename(path) for path in changed_files(self.project, "HEAD")},
+                         {"module_0.py", "module_1.py", "renamed.py", "new.py"})
+        self.assertIsNone(changed_files(self.project, "unknown"))
+
+    def test_without_git_every_file_is_analyzed(self):
+        shutil.rmtree(os.path.join(self.project, ".git"))
+        self.analyzed(self.output)
+
+        self.assertEqual(len(self.analyzed(self.output)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
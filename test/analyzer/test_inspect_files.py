@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from controller.analyzer import inspect_files
+from test.helpers import SMELLY_SOURCE
+
+class TestInspectFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        self.filenames = []
+        for i in range(7):
+            filename = os.path.join(self.project, f"module_{i}.py")
+            with open(filename, "w") as file:
+                file.write(SMELLY_SOURCE.format(n=i) if i % 2 == 0 else "import pandas as pd\n\ndef broken(:\n")
+            self.filenames.append(filename)
+        self.filenames.append(os.path.join(self.project, "missing.py"))
+
+    def tearDown(self):
+        shutil.rmtree(self.project)
+
+    def summary(self, results):
+        return [(r.filename, r.rows, r.details, r.error is None) for r in results]
+
+    def test_results_follow_input_order(self):
+        results = list(inspect_files(self.filenames))
+
+        self.assertEqual([result.filename for result in results], self.filenames)
+
+    def test_errors_are_returned(self):
+        results = list(inspect_files(self.filenames))
+
+        self.assertIsNone(results[0].error)
+        self.assertIn("Error in file", results[1].error)
+        self.assertIn("Error in file", results[-1].error)
+
+    def test_process_pool_gives_same_results(self):
+        sequential = self.summary(inspect_files(self.filenames))
+        parallel = self.summary(inspect_files(self.filenames, jobs=2, chunk_size=2))
+
+        self.assertEqual(sequential, parallel)
+
+    def test_prescreen_gives_same_results(self):
+        full = self.summary(inspect_files(self.filenames))
+        verified = list(inspect_files(self.filenames, prescreen="verify"))
+        screened = self.summary(inspect_files(self.filenames, prescreen="on"))
+
+        self.assertEqual(self.summary(verified), full)
+        self.assertFalse(any(result.prescreen_misses for result in verified))
+        # the broken files have no trigger tokens, so they are not parsed and their errors are not reported
+        self.assertEqual(screened[::2], full[::2])
+        self.assertEqual([result[1] for result in screened[1:-1:2]], [[], [], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
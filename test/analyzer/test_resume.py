@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from components.checkpoint import JOURNAL_FILE
+from components.results_store import ResultsStore
+from controller import analyzer
+from test.helpers import SMELLY_SOURCE, result_files
+
+def interrupted(files):
+    # inspect_files stopping with an error after the given number of files
+    inspect_files = analyzer.inspect_files
+
+    def inspect(*args, **kwargs):
+        for i, file_result in enumerate(inspect_files(*args, **kwargs)):
+            if i == files:
+                raise KeyboardInterrupt
+            yield file_result
+    return inspect
+
+
+class TestResume(unittest.TestCase):
+
+    def setUp(self):
+        self.input = tempfile.mkdtemp()
+        self.output = tempfile.mkdtemp()
+        for project in ("first", "second"):
+            os.makedirs(os.path.join(self.input, project))
+            for i in range(6):
+                with open(os.path.join(self.input, project, f"module_{i}.py"), "w") as file:
+                    file.write(SMELLY_SOURCE.format(n=i) if i != 3 else "import pandas as pd\n\ndef broken(:\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.input)
+        shutil.rmtree(self.output)
+
+    def test_interrupted_project_is_resumed(self):
+        with mock.patch.object(analyzer, "inspect_files", interrupted(4)):
+            with self.assertRaises(KeyboardInterrupt):
+                analyzer.analyze_project(os.path.join(self.input, "first"), self.output)
+
+        analyzed = []
+        with mock.patch.object(analyzer, "inspect_file", side_effect=lambda filename, *args, **kwargs:
+                               analyzed.append(filename) or analyzer.FileResult(filename, [], [], None, None, 0)):
+            analyzer.analyze_project(os.path.join(self.input, "first"), self.output, resume=True)
+
+        self.assertEqual([os.path.basename(filename) for filename in analyzed], ["module_4.py", "module_5.py"])
+        # header and the two smells of each of the three recorded files that parse
+        results = result_files(self.output)
+        self.assertEqual(len(results["to_save.csv"]), 7)
+        self.assertEqual("\n".join(results["error.txt"]).count("Error in file"), 1)
+
+    def test_resumed_run_gives_same_results(self):
+        expected = os.path.join(self.output, "expected")
+        analyzer.projects_analysis(self.input, expected)
+        resumed = os.path.join(self.output, "resumed")
+        with mock.patch.object(analyzer, "inspect_files", interrupted(4)):
+            with self.assertRaises(KeyboardInterrupt):
+                analyzer.projects_analysis(self.input, resumed)
+
+        analyzer.parallel_projects_analysis(self.input, resumed, max_workers=2, resume=True)
+
+        self.assertEqual(result_files(resumed, recursive=True, ordered=True),
+                         result_files(expected, recursive=True, ordered=True))
+        self.assertFalse(any(name == JOURNAL_FILE for _, _, names in os.walk(resumed) for name in names))
+
+    def test_store_has_no_duplicates_after_resume(self):
+        with ResultsStore(os.path.join(self.output, "results.db")) as store:
+            store.start_run(self.input)
+            with mock.patch.object(analyzer, "inspect_files", interrupted(4)):
+                with self.assertRaises(KeyboardInterrupt):
+                    analyzer.analyze_project(os.path.join(self.input, "first"), self.output, store=store)
+            store.start_run(self.input, resume=True)
+            analyzer.analyze_project(os.path.join(self.input, "first"), self.output, store=store, resume=True)
+
+            # the two smells of each of the five files that parse
+            self.assertEqual(store.query("SELECT project, COUNT(*) FROM smells GROUP BY project"), [("first", 10)])
+
+    def test_finished_projects_are_skipped(self):
+        analyzer.projects_analysis(self.input, self.output)
+
+        with mock.patch.object(analyzer, "analyze_project") as analyze_project:
+            analyzer.projects_analysis(self.input, self.output, resume=True)
+
+        analyze_project.assert_not_called()
+
+    def test_failed_projects_are_reported(self):
+        analyze_project = analyzer.analyze_project
+
+        def fail_second(project_path, *args, **kwargs):
+            if os.path.basename(project_path) == "second":
+                raise ValueError("analysis failed")
+            return analyze_project(project_path, *args, **kwargs)
+
+        with mock.patch.object(analyzer, "analyze_project", side_effect=fail_second):
+            failed = analyzer.parallel_projects_analysis(self.input, self.output)
+        self.assertEqual(failed, ["second"])
+
+        with mock.patch.object(analyzer, "analyze_project") as resumed:
+            self.assertEqual(analyzer.parallel_projects_analysis(self.input, self.output, resume=True), [])
+        self.assertEqual([call.args[0] for call in resumed.call_args_list], [os.path.join(self.input, "second")])
+
+
+if __name__ == '__main__':
+    unittest.main()
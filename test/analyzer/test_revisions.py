@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from components.git_source import GitFile
+from controller import analyzer
+from test.helpers import SMELLY_SOURCE, git, result_files
+
+class TestRevisions(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self.output = tempfile.mkdtemp()
+        git(self.repo, "init", "-q")
+        for i in range(4):
+            self.write(f"module_{i}.py", SMELLY_SOURCE.format(n=i))
+        self.write("broken.py", "import pandas as pd\n\ndef broken(:\n")
+        self.commit("first")
+        self.write("module_0.py", SMELLY_SOURCE.format(n=10))
+        git(self.repo, "mv", "module_1.py", "renamed.py")
+        self.commit("second")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo)
+        shutil.rmtree(self.output)
+
+    def write(self, name, content):
+        with open(os.path.join(self.repo, name), "w") as file:
+            file.write(content)
+
+    def commit(self, message):
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", message)
+
+    def test_revisions_match_checkouts(self):
+        analyzed = []
+        inspect_file = analyzer.inspect_file
+        with mock.patch.object(analyzer, "inspect_file", side_effect=lambda filename, *args, **kwargs:
+                               analyzed.append(os.path.basename(filename)) or
+                               inspect_file(filename, *args, **kwargs)):
+            analyzer.revisions_analysis(self.repo, ["HEAD~1", "HEAD"], self.output)
+
+        # the files unchanged at the second revision, renamed.py included, are not analyzed again
+        self.assertEqual(sorted(analyzed), ["broken.py", "module_0.py", "module_0.py", "module_1.py", "module_2.py",
+                                            "module_3.py"])
+        for revision, folder in [("HEAD", "HEAD"), ("HEAD~1", "HEAD_1")]:
+            git(self.repo, "checkout", "-q", revision)
+            checkout = os.path.join(self.output, "checkout_" + folder)
+            analyzer.analyze_project(self.repo, checkout)
+            self.assertEqual(result_files(os.path.join(self.output, folder)), result_files(checkout))
+
+    def test_revisions_with_processes(self):
+        analyzer.revisions_analysis(self.repo, ["HEAD~1", "HEAD"], os.path.join(self.output, "sequential"))
+        analyzer.revisions_analysis(self.repo, ["HEAD~1", "HEAD"], os.path.join(self.output, "processes"), jobs=2)
+
+        for folder in ("HEAD", "HEAD_1"):
+            self.assertEqual(result_files(os.path.join(self.output, "processes", folder)),
+                             result_files(os.path.join(self.output, "sequential", folder)))
+
+    def test_unread_blobs_keep_their_place(self):
+        class Reader:
+            def read(self, blob):
+                if blob == "missing":
+                    raise FileNotFoundError(blob)
+                return SMELLY_SOURCE.format(n=blob).encode()
+
+        items = [(f"module_{i}.py", GitFile(f"module_{i}.py", "missing" if i in (1, 2, 5) else str(i), 0))
+                 for i in range(6)]
+        sequential = list(analyzer.inspect_blobs(items, Reader()))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chunked = list(analyzer.inspect_blobs(items, Reader(), 2, executor, chunk_size=2))
+
+        self.assertEqual([result.filename for result in chunked], [filename for filename, _ in items])
+        self.assertEqual([result.error is not None for result in chunked], [False, True, True, False, False, True])
+        self.assertEqual([(result.rows, result.error) for result in chunked],
+                         [(result.rows, result.error) for result in sequential])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import ast
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmark.corpus import generate_corpus
+from components.detector import detect
+
+
+class TestGenerateCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def sources(self, path):
+        sources = {}
+        for root, _, files in os.walk(path):
+            for file in files:
+                with open(os.path.join(root, file)) as source:
+                    sources[os.path.relpath(os.path.join(root, file), path)] = source.read()
+        return sources
+
+    def test_corpus_is_valid_and_reproducible(self):
+        stats = generate_corpus(os.path.join(self.path, "a"), files=5, functions=3, function_length=20, seed=1)
+        generate_corpus(os.path.join(self.path, "b"), files=5, functions=3, function_length=20, seed=1)
+        sources = self.sources(os.path.join(self.path, "a"))
+
+        self.assertEqual(sources, self.sources(os.path.join(self.path, "b")))
+        self.assertEqual((stats.files, stats.functions), (5, 15))
+        self.assertEqual(stats.loc, sum(source.count("\n") for source in sources.values()))
+        for source in sources.values():
+            functions = [node for node in ast.parse(source).body if isinstance(node, ast.FunctionDef)]
+            self.assertEqual(len(functions), 3)
+
+    def smells(self, path):
+        return [row for filename, source in self.sources(path).items() for row in detect(filename, source)[0]]
+
+    def test_density(self):
+        generate_corpus(os.path.join(self.path, "plain"), files=2, density=0.0)
+        generate_corpus(os.path.join(self.path, "smelly"), files=2, density=1.0, libraries=["pandas"])
+
+        self.assertEqual(self.smells(os.path.join(self.path, "plain")), [])
+        self.assertGreater(len(self.smells(os.path.join(self.path, "smelly"))), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.checkpoint import Checkpoint, FileJournal
+
+ROWS = [["a.py", "load", 1, "dataframe_conversion_api_misused", "message"]]
+DETAILS = [[{"filename": "a.py", "function_name": "load", "smell_name": "dataframe_conversion_api_misused",
+             "line": 5}]]
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_state_is_loaded_on_resume(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start("first")
+        checkpoint.finish("first")
+        checkpoint.start("second")
+
+        resumed = Checkpoint(self.path, resume=True)
+
+        self.assertTrue(resumed.is_done("first"))
+        self.assertFalse(resumed.is_done("second"))
+        self.assertFalse(Checkpoint(self.path).is_done("first"))
+        self.assertEqual(os.listdir(self.path), ["checkpoint.json"])
+
+
+class TestFileJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_entries_are_loaded_in_order(self):
+        with FileJournal(self.path) as journal:
+            journal.open()
+            journal.record("a.py", ROWS, DETAILS)
+            journal.record("b.py", None, None, "Error in file b.py")
+
+        entries = FileJournal(self.path).load()
+
+        self.assertEqual([entry["filename"] for entry in entries], ["a.py", "b.py"])
+        self.assertEqual(entries[0]["rows"], ROWS)
+        self.assertEqual(entries[0]["details"], DETAILS)
+        self.assertEqual(entries[1]["error"], "Error in file b.py")
+
+    def test_incomplete_last_line_is_dropped(self):
+        with FileJournal(self.path) as journal:
+            journal.open()
+            journal.record("a.py", ROWS, DETAILS)
+        with open(os.path.join(self.path, "checkpoint_files.jsonl"), "a") as file:
+            file.write('{"filename": "b.py", "ro')
+
+        journal = FileJournal(self.path)
+        self.assertEqual([entry["filename"] for entry in journal.load()], ["a.py"])
+        with journal:
+            journal.open(resume=True)
+            journal.record("c.py", [], [])
+
+        self.assertEqual([entry["filename"] for entry in FileJournal(self.path).load()], ["a.py", "c.py"])
+
+    def test_new_analysis_discards_the_journal(self):
+        with FileJournal(self.path) as journal:
+            journal.open()
+            journal.record("a.py", ROWS, DETAILS)
+            journal.close()
+            journal.open()
+
+        self.assertEqual(FileJournal(self.path).load(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.cloner import get_repo, get_repos
+from test.helpers import git
+
+
+class TestCloner(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        # bare repositories standing in for the GitHub ones, cloned through file:// URLs like remote ones
+        self.host = "file://" + os.path.join(self.path, "remote") + "/"
+        self.base_path = os.path.join(self.path, "projects")
+        work = os.path.join(self.path, "work")
+        git(self.path, "init", "-q", work)
+        for i in range(3):
+            with open(os.path.join(work, "module.py"), "w") as file:
+                file.write(f"x = {i}\n")
+            git(work, "add", "-A")
+            git(work, "commit", "-q", "-m", f"commit {i}")
+        for repo in ("owner/first", "owner/second", "other/third"):
+            git(self.path, "clone", "-q", "--bare", work, os.path.join(self.path, "remote", repo))
+        git(os.path.join(self.path, "remote", "owner/first"), "config", "uploadpack.allowFilter", "true")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_repos_are_cloned_shallow(self):
+        results = get_repos(["owner/first", "owner/second", "other/third"], self.base_path, max_workers=2,
+                            host=self.host)
+
+        self.assertEqual([result.status for result in results], ["cloned"] * 3)
+        self.assertEqual([os.path.basename(result.path) for result in results], ["ownerfirst", "ownersecond",
+                                                                                 "otherthird"])
+        self.assertEqual(git(results[0].path, "rev-list", "--count", "HEAD"), "1")
+        with open(os.path.join(results[0].path, "module.py")) as file:
+            self.assertEqual(file.read(), "x = 2\n")
+
+    def test_blobless_clone_with_history(self):
+        result = get_repo("owner/first", self.base_path, depth=None, blobless=True, host=self.host)
+
+        self.assertEqual(git(result.path, "rev-list", "--count", "HEAD"), "3")
+        self.assertEqual(git(result.path, "config", "remote.origin.partialclonefilter"), "blob:none")
+
+    def test_checkouts_are_skipped(self):
+        get_repos(["owner/first"], self.base_path, host=self.host)
+        # left by an interrupted clone
+        os.makedirs(os.path.join(self.base_path, "ownersecond"))
+
+        results = get_repos(["owner/first", "owner/second"], self.base_path, host=self.host)
+
+        self.assertEqual([result.status for result in results], ["skipped", "cloned"])
+
+    def test_folders_inside_a_repository_are_not_checkouts(self):
+        git(self.path, "init", "-q", self.base_path)
+        os.makedirs(os.path.join(self.base_path, "ownerfirst"))
+        os.makedirs(os.path.join(self.base_path, "ownersecond"))
+        with open(os.path.join(self.base_path, "ownersecond", "notes.txt"), "w") as file:
+            file.write("not a clone\n")
+
+        results = get_repos(["owner/first", "owner/second"], self.base_path, host=self.host)
+
+        self.assertEqual([result.status for result in results], ["cloned", "failed"])
+        self.assertEqual(os.listdir(os.path.join(self.base_path, "ownersecond")), ["notes.txt"])
+
+    def test_failed_clone_is_retried(self):
+        result = get_repo("owner/missing", self.base_path, retries=2, backoff=0, host=self.host)
+
+        self.assertEqual((result.status, result.attempts), ("failed", 3))
+        self.assertTrue(result.error)
+        self.assertEqual(os.listdir(self.base_path) if os.path.exists(self.base_path) else [], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
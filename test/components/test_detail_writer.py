@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.detail_writer import DetailWriter, _close_open_writers
+
+
+def smell(line, smell_name="Chain_Indexing"):
+    return {"filename": "a.py", "function_name": "load", "smell_name": smell_name, "line": line}
+
+
+class TestDetailWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_path)
+
+    def read(self, smell_name="Chain_Indexing"):
+        with open(os.path.join(self.output_path, f"{smell_name}.csv")) as file:
+            return file.read().splitlines()
+
+    def test_rows_are_buffered_until_flush(self):
+        writer = DetailWriter(self.output_path, buffer_size=10)
+        writer.write([smell(1), smell(2)])
+
+        self.assertFalse(os.path.exists(os.path.join(self.output_path, "Chain_Indexing.csv")))
+        writer.close()
+        self.assertEqual(self.read(), ["filename,function_name,smell_name,line", "a.py,load,Chain_Indexing,1",
+                                       "a.py,load,Chain_Indexing,2"])
+
+    def test_full_buffer_is_written(self):
+        with DetailWriter(self.output_path, buffer_size=2) as writer:
+            writer.write([smell(1), smell(2, "unnecessary_iteration")])
+
+            self.assertEqual(len(self.read()), 2)
+            self.assertEqual(len(self.read("unnecessary_iteration")), 2)
+
+    def test_existing_files_are_appended(self):
+        with DetailWriter(self.output_path) as writer:
+            writer.write([smell(1)])
+        with DetailWriter(self.output_path) as writer:
+            writer.write([smell(2)])
+
+        self.assertEqual(self.read(), ["filename,function_name,smell_name,line", "a.py,load,Chain_Indexing,1",
+                                       "a.py,load,Chain_Indexing,2"])
+
+    def test_open_writers_are_flushed_at_exit(self):
+        writer = DetailWriter(self.output_path)
+        writer.write([smell(1)])
+
+        _close_open_writers()
+
+        self.assertEqual(len(self.read()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import ast
+import unittest
+
+from components.detector import detect, prescreen_misses
+from cs_detector.code_extractor.dictionaries import get_dictionaries
+from cs_detector.code_extractor.libraries import extract_libraries
+from cs_detector.detection_rules.registry import applicable_rules, may_apply, screen_rules
+
+NESTED_SOURCE = b"""
+import pandas as pd
+
+df = pd.read_csv('module.csv')
+
+
+def outer():
+    def inner():
+        return pd.read_csv('inner.csv')
+    return inner
+
+
+async def load():
+    return pd.read_csv('async.csv')
+"""
+
+
+class TestDetect(unittest.TestCase):
+
+    def setUp(self):
+        rows, self.details = detect("nested.py", NESTED_SOURCE)
+        self.functions = {row[1]: row[2] for row in rows if row[3] == "columns_and_datatype_not_explicitly_set"}
+
+    def test_nested_function_is_analyzed_once(self):
+        self.assertNotIn("outer", self.functions)
+        self.assertEqual(self.functions["inner"], 1)
+
+    def test_async_function_and_module_code(self):
+        self.assertEqual(self.functions["load"], 1)
+        self.assertEqual(self.functions["<module>"], 1)
+
+
+class TestRuleSelection(unittest.TestCase):
+
+    def test_rules_of_imported_libraries(self):
+        libraries = extract_libraries(ast.parse("import numpy as np\nimport torchvision"))
+
+        names = [rule.name for rule in applicable_rules(libraries, get_dictionaries())]
+
+        self.assertEqual(names, ["nan_equivalence_comparison_misused", "matrix_multiplication_api_misused"])
+
+    def test_prefilter(self):
+        self.assertTrue(may_apply(b"from torch import nn", get_dictionaries()))
+        self.assertTrue(may_apply(b"import sklearn.cluster", get_dictionaries()))
+        self.assertFalse(may_apply(b"import torchvision, os", get_dictionaries()))
+
+    def test_files_without_ml_libraries_are_not_analyzed(self):
+        self.assertEqual(detect("script.py", b"import os\ndef f(df):\n    return df.merge(df)\n"), ([], []))
+
+    def test_syntax_errors_of_files_without_ml_libraries(self):
+        with self.assertRaises(SyntaxError):
+            detect("broken.py", b"import os\ndef broken(:\n")
+
+
+class TestPrescreen(unittest.TestCase):
+
+    def test_rules_without_triggers_are_skipped(self):
+        source = b"import pandas as pd\n\ndef f(df):\n    return df.iterrows()\n"
+
+        names = [rule.name for rule in screen_rules(source, get_dictionaries())]
+
+        self.assertIn("unnecessary_iteration", names)
+        self.assertNotIn("merge_api_parameter_not_explicitly_set", names)
+        self.assertNotIn("gradients_not_cleared_before_backward_propagation", names)
+
+    def test_dictionary_triggers(self):
+        source = b"from sklearn.cluster import KMeans\nmodel = KMeans()\n"
+
+        names = [rule.name for rule in screen_rules(source, get_dictionaries())]
+
+        self.assertEqual(names, ["hyperparameters_not_explicitly_set"])
+
+    def test_files_without_triggers_are_not_parsed(self):
+        self.assertEqual(detect("broken.py", b"import torch\ndef broken(:\n", prescreen=True), ([], []))
+        with self.assertRaises(SyntaxError):
+            detect("broken.py", b"import torch\ndef broken(:\n")
+
+    def test_same_smells_as_full_detection(self):
+        rows, details = detect("nested.py", NESTED_SOURCE)
+
+        self.assertEqual(detect("nested.py", NESTED_SOURCE, prescreen=True), (rows, details))
+        self.assertEqual(prescreen_misses(NESTED_SOURCE, rows), [])
+
+    def test_misses_are_reported(self):
+        rows = [["nested.py", "load", 1, "merge_api_parameter_not_explicitly_set", "message"]]
+
+        self.assertEqual(prescreen_misses(NESTED_SOURCE, rows), ["merge_api_parameter_not_explicitly_set"])
+
+
+if __name__ == '__main__':
+    unittest.main()
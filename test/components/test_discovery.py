@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.discovery import FileDiscovery, IgnorePattern
+
+
+class TestFileDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        for relative_path in ["main.py", "README.md", "pkg/model.py", "pkg/generated/big.py", "pkg/keep.py",
+                              "venv/lib/python3.11/site-packages/numpy/core.py", "tests/test_model.py",
+                              "node_modules/tool/setup.py", "notebooks/out_1.py"]:
+            path = os.path.join(self.project, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write("x = 1\n")
+        with open(os.path.join(self.project, "pkg/generated/big.py"), "w") as file:
+            file.write("x = 1\n" * 100)
+        with open(os.path.join(self.project, ".gitignore"), "w") as file:
+            file.write("# generated notebooks\nnotebooks/out_*.py\n")
+        with open(os.path.join(self.project, "pkg/.gitignore"), "w") as file:
+            file.write("*.py\n!model.py\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.project)
+
+    def files(self, discovery):
+        return [os.path.relpath(path, self.project) for path in discovery.files(self.project)]
+
+    def test_default_exclude_and_gitignore(self):
+        self.assertEqual(self.files(FileDiscovery()), ["main.py", "pkg/model.py"])
+
+    def test_without_exclude_and_gitignore(self):
+        files = self.files(FileDiscovery(exclude=[], max_file_size=100, use_gitignore=False))
+
+        self.assertIn("venv/lib/python3.11/site-packages/numpy/core.py", files)
+        self.assertIn("notebooks/out_1.py", files)
+        self.assertNotIn("pkg/generated/big.py", files)
+
+    def test_single_file(self):
+        path = os.path.join(self.project, "main.py")
+
+        self.assertEqual(list(FileDiscovery().files(path)), [path])
+
+    def test_is_excluded(self):
+        discovery = FileDiscovery(exclude=["venv/", "/docs/*.py"], max_file_size=100)
+
+        self.assertTrue(discovery.is_excluded("venv/lib/core.py"))
+        self.assertTrue(discovery.is_excluded("docs/conf.py"))
+        self.assertFalse(discovery.is_excluded("src/docs/conf.py"))
+        self.assertTrue(discovery.is_excluded("main.py", 101))
+        self.assertFalse(discovery.is_excluded("main.py", 100))
+
+    def test_patterns(self):
+        self.assertTrue(IgnorePattern("build/").match("src/build", True))
+        self.assertFalse(IgnorePattern("build/").match("src/build", False))
+        self.assertTrue(IgnorePattern("/docs/*.py").match("docs/conf.py", False))
+        self.assertFalse(IgnorePattern("/docs/*.py").match("src/docs/conf.py", False))
+        self.assertTrue(IgnorePattern("docs/**/gen_?.py").match("docs/a/b/gen_1.py", False))
+        self.assertTrue(IgnorePattern("gen_[0-9].py", "src/").match("src/x/gen_3.py", False))
+        self.assertFalse(IgnorePattern("gen_[0-9].py", "src/").match("gen_3.py", False))
+
+
+if __name__ == '__main__':
+    unittest.main()
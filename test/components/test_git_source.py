@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.git_source import BlobReader, revision_files
+from test.helpers import git
+
+
+class TestGitSource(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        for path, content in [("main.py", "x = 1\n"), ("pkg/util.py", "y = 2\n"), ("README.md", "readme\n"),
+                              ("tests/test_main.py", "z = 3\n"), ("pkg/big.py", "#" * 2000 + "\n")]:
+            os.makedirs(os.path.dirname(os.path.join(self.repo, path)), exist_ok=True)
+            with open(os.path.join(self.repo, path), "w") as file:
+                file.write(content)
+        os.symlink("main.py", os.path.join(self.repo, "link.py"))
+        git(self.repo, "init", "-q")
+        git(self.repo, "add", "-A")
+        git(self.repo, "commit", "-q", "-m", "first")
+        # changes after the commit are not seen at the revision
+        os.remove(os.path.join(self.repo, "main.py"))
+
+    def tearDown(self):
+        shutil.rmtree(self.repo)
+
+    def test_revision_files(self):
+        files = revision_files(self.repo, "HEAD")
+
+        self.assertEqual([git_file.path for git_file in files], ["main.py", "pkg/big.py", "pkg/util.py"])
+        self.assertEqual(files[0].blob, git(self.repo, "rev-parse", "HEAD:main.py"))
+        self.assertRaises(ValueError, revision_files, self.repo, "unknown")
+
+    def test_blobs_are_read_through_one_process(self):
+        files = revision_files(self.repo, "HEAD")
+
+        with BlobReader(self.repo) as reader:
+            self.assertEqual(reader.read(files[0].blob), b"x = 1\n")
+            self.assertEqual(reader.read(files[1].blob), b"#" * 2000 + b"\n")
+            self.assertRaises(FileNotFoundError, reader.read, "0" * 40)
+            self.assertEqual(reader.read(files[2].blob), b"y = 2\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
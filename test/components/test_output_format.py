@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.output_format import TableWriter, pa, read_table
+from components.overview_merger import OverviewMerger
+
+COLUMNS = ["filename", "function_name", "smell", "name_smell", "message"]
+ROWS = [["a.py", "load", 1, "in_place_apis_misused", "a long message, with a comma"],
+        ["b.py", "fit", 2, "memory_not_freed", "Memory not freed"]]
+
+
+class TestCsvWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_header_is_written_once(self):
+        path = os.path.join(self.path, "to_save.csv")
+        for rows in (ROWS[:1], ROWS[1:]):
+            with TableWriter(path, COLUMNS) as writer:
+                writer.write(rows)
+
+        with open(path) as file:
+            self.assertEqual(file.read().count("filename"), 1)
+        self.assertEqual(read_table(path).values.tolist(), ROWS)
+
+    def test_empty_table(self):
+        path = os.path.join(self.path, "to_save.csv")
+        with TableWriter(path, COLUMNS) as writer:
+            writer.write([])
+
+        self.assertEqual(list(read_table(path).columns), COLUMNS)
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestColumnarWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_batches_share_the_dictionaries(self):
+        for output_format in ("parquet", "feather"):
+            path = os.path.join(self.path, "to_save." + output_format)
+            with TableWriter(path, COLUMNS, output_format) as writer:
+                writer.write(ROWS[:1])
+                writer.write(ROWS[1:] + ROWS[:1])
+
+            table = read_table(path)
+            self.assertEqual(table.astype(object).values.tolist(), ROWS + ROWS[:1])
+            self.assertEqual(str(table["message"].dtype), "category")
+            self.assertEqual(str(table["smell"].dtype), "int64")
+            self.assertEqual(list(read_table(path, columns=["smell"]).columns), ["smell"])
+            self.assertNotEqual(str(read_table(path, categories=False)["message"].dtype), "category")
+
+    def test_overview(self):
+        for project in ("first", "second"):
+            with TableWriter(os.path.join(self.path, project, "to_save.parquet"), COLUMNS, "parquet") as writer:
+                writer.write(ROWS)
+
+        with OverviewMerger(os.path.join(self.path, "overview"), "parquet") as merger:
+            merger.add(os.path.join(self.path, "first", "to_save.parquet"))
+            merger.add(os.path.join(self.path, "second", "to_save.parquet"))
+
+        overview = read_table(os.path.join(self.path, "overview", "overview_output.parquet"))
+        self.assertEqual(list(overview.columns), ["index"] + COLUMNS)
+        self.assertEqual(overview["index"].tolist(), [0, 1, 0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.overview_merger import OverviewMerger
+
+HEADER = "filename,function_name,smell,name_smell,message\n"
+
+
+class TestOverviewMerger(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, name, content):
+        path = os.path.join(self.path, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def overview(self):
+        with open(os.path.join(self.path, "overview", "overview_output.csv")) as file:
+            return file.read()
+
+    def test_rows_are_streamed_with_one_header(self):
+        first = self.write("first.csv", HEADER + 'a.py,load,1,in_place_apis_misused,"message, with comma"\n')
+        # to_save.csv is appended to by every analysis, so it can repeat its header
+        second = self.write("second.csv", HEADER + "b.py,f,2,memory_not_freed,m\n\n" + HEADER +
+                            "c.py,g,1,memory_not_freed,m\n")
+
+        with OverviewMerger(os.path.join(self.path, "overview")) as merger:
+            self.assertEqual(merger.add(first), 1)
+            self.assertEqual(merger.add(second), 2)
+
+        self.assertEqual(merger.rows, 3)
+        self.assertEqual(self.overview(), "index," + HEADER +
+                         '0,a.py,load,1,in_place_apis_misused,"message, with comma"\n'
+                         "0,b.py,f,2,memory_not_freed,m\n"
+                         "2,c.py,g,1,memory_not_freed,m\n")
+
+    def test_columns_are_matched_by_name(self):
+        first = self.write("first.csv", HEADER + "a.py,load,1,in_place_apis_misused,m\n")
+        second = self.write("second.csv", "smell,filename\n3,b.py\n")
+
+        with OverviewMerger(os.path.join(self.path, "overview")) as merger:
+            merger.add(first)
+            merger.add(second)
+
+        self.assertEqual(self.overview().splitlines()[-1], "0,b.py,,3,,")
+
+    def test_no_overview_without_rows(self):
+        empty = self.write("empty.csv", HEADER)
+
+        with OverviewMerger(os.path.join(self.path, "overview")) as merger:
+            self.assertEqual(merger.add(empty), 0)
+
+        self.assertFalse(os.path.exists(os.path.join(self.path, "overview")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+
+from components.pipeline import read_ahead, BackgroundWriter
+
+
+def read(item):
+    if item == "missing":
+        raise FileNotFoundError(item)
+    time.sleep(0.01 * (item % 3))
+    return item * 2
+
+
+class TestReadAhead(unittest.TestCase):
+
+    def test_results_follow_input_order(self):
+        self.assertEqual(list(read_ahead(range(10), read, readers=3, depth=4)), [(i, i * 2) for i in range(10)])
+
+    def test_failed_read(self):
+        self.assertEqual(list(read_ahead([1, "missing"], read)), [(1, 2), ("missing", None)])
+
+    def test_reads_are_bounded(self):
+        started = []
+
+        def track(item):
+            started.append(item)
+            return item
+
+        results = read_ahead(range(100), track, readers=2, depth=4)
+        next(results)
+        time.sleep(0.05)
+
+        self.assertLessEqual(len(started), 5)
+
+
+class TestBackgroundWriter(unittest.TestCase):
+
+    def test_items_are_consumed_in_order_by_another_thread(self):
+        consumed = []
+        threads = set()
+
+        def consume(item):
+            consumed.append(item)
+            threads.add(threading.current_thread())
+
+        with BackgroundWriter(consume, maxsize=2) as writer:
+            for i in range(20):
+                writer.put(i)
+
+        self.assertEqual(consumed, list(range(20)))
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_consumer_error_is_raised(self):
+        def consume(item):
+            raise OSError("disk full")
+
+        writer = BackgroundWriter(consume)
+        writer.put(1)
+
+        with self.assertRaises(OSError):
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.detector import detect
+from components.profiler import FileProfile, Profiler, percentile
+
+SOURCE = b"""
+import pandas as pd
+
+def load(path):
+    return pd.read_csv(path)
+"""
+
+
+def file_profile(filename, parse_time):
+    profile = FileProfile(filename)
+    profile.phases = {"parse": [1, parse_time, parse_time], "rule:merge": [2, 1.0, 0.5]}
+    return profile
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_path)
+
+    def test_detect_records_phases_and_rules(self):
+        profile = FileProfile("a.py")
+        detect("a.py", SOURCE, profile)
+
+        self.assertIn("parse", profile.phases)
+        self.assertIn("libraries", profile.phases)
+        self.assertEqual(profile.phases["rule:columns_and_datatype_not_explicitly_set"][0], 1)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_report(self):
+        profiler = Profiler()
+        for i in range(10):
+            profiler.add(file_profile(f"{i}.py", float(i)))
+
+        report = profiler.write(self.output_path)
+
+        self.assertEqual(report["files"], 10)
+        self.assertEqual(report["slowest_files"][0]["filename"], "9.py")
+        self.assertEqual([phase["phase"] for phase in report["phases"]], ["parse", "rule:merge"])
+        self.assertEqual(report["phases"][1]["calls"], 20)
+        self.assertEqual(report["phases"][0]["p50"], 4.0)
+        with open(os.path.join(self.output_path, "profile.json")) as file:
+            self.assertEqual(json.load(file)["files"], 10)
+        with open(os.path.join(self.output_path, "profile_files.csv")) as file:
+            self.assertEqual(len(file.read().splitlines()), 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
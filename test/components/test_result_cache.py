@@ -0,0 +1,78 @@
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+
+from components.result_cache import ResultCache
+
+ROWS = [["a.py", "load", 1, "dataframe_conversion_api_misused", "message"]]
+DETAILS = [[{"filename": "a.py", "function_name": "load", "smell_name": "dataframe_conversion_api_misused",
+             "line": 5}]]
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = ResultCache(self.path, version="test")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.load("a.py", b"source"))
+
+    def test_entry_is_reused_for_another_filename(self):
+        size = self.cache.store(b"source", ROWS, DETAILS)
+        rows, details, read = self.cache.load("b.py", b"source")
+
+        self.assertEqual(size, read)
+        self.assertEqual(rows, [["b.py", "load", 1, "dataframe_conversion_api_misused", "message"]])
+        self.assertEqual(details[0][0]["filename"], "b.py")
+        self.assertEqual(details[0][0]["line"], 5)
+
+    def test_changed_source_or_version_misses(self):
+        self.cache.store(b"source", ROWS, DETAILS)
+
+        self.assertIsNone(self.cache.load("a.py", b"source changed"))
+        self.assertIsNone(ResultCache(self.path, version="new rules").load("a.py", b"source"))
+
+    def test_prescreened_results_are_kept_apart(self):
+        self.cache.store(b"source", ROWS[:0], DETAILS[:0], prescreen=True)
+
+        self.assertIsNone(self.cache.load("a.py", b"source"))
+        self.cache.store(b"source", ROWS, DETAILS)
+        self.assertEqual(len(self.cache.load("a.py", b"source")[0]), 1)
+        self.assertEqual(self.cache.load("a.py", b"source", prescreen=True)[0], [])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        size = self.cache.store(b"old", ROWS, DETAILS)
+        self.cache.store(b"new", ROWS, DETAILS)
+        past = time.time() - 100
+        os.utime(self.cache.entry_path(self.cache.key(b"old")), (past, past))
+        self.cache.max_bytes = size
+
+        self.cache.evict()
+
+        self.assertIsNone(self.cache.load("a.py", b"old"))
+        self.assertIsNotNone(self.cache.load("a.py", b"new"))
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_stats(self):
+        self.cache.stats.record(True, 10)
+        self.cache.stats.record(False, 20)
+
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+        self.assertEqual((self.cache.stats.bytes_read, self.cache.stats.bytes_written), (10, 20))
+
+    def test_cache_can_be_sent_to_workers(self):
+        copy = pickle.loads(pickle.dumps(self.cache))
+
+        self.assertEqual(copy.version, self.cache.version)
+        self.assertEqual(copy.stats.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
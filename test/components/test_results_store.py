@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.results_store import ProjectResults, ResultsStore
+
+ROW = ["a.py", "load", 1, "in_place_apis_misused", "message"]
+DETAILS = [[{"filename": "a.py", "function_name": "load", "smell_name": "in_place_apis_misused", "line": 3}]]
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = ResultsStore(os.path.join(self.path, "results.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.path)
+
+    def count(self, table):
+        return self.store.query(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    def test_resume_continues_the_unfinished_run(self):
+        first = self.store.start_run("input")
+        self.assertEqual(self.store.start_run("input", resume=True), first)
+        self.store.finish_run()
+        self.assertNotEqual(self.store.start_run("input", resume=True), first)
+        self.assertEqual(self.store.query("SELECT finished IS NOT NULL FROM runs WHERE id = ?", (first,)), [(1,)])
+
+    def test_rows_are_inserted_in_batches(self):
+        self.store.start_run("input")
+        results = ProjectResults(self.store, "project", batch_size=4)
+        results.add([ROW], DETAILS)
+        self.assertEqual(self.count("smells"), 0)
+        results.add([ROW], DETAILS)
+        self.assertEqual(self.count("smells"), 2)
+        with results:
+            results.add([ROW], [])
+        self.assertEqual(self.count("smells"), 3)
+        self.assertEqual(self.store.query("SELECT * FROM smell_instances LIMIT 1"),
+                         [(self.store.run_id, "project", "a.py", "load", "in_place_apis_misused", 3)])
+
+    def test_clear_deletes_the_rows_of_the_project(self):
+        self.store.start_run("input")
+        for project in ("first", "second"):
+            with self.store.project(project) as results:
+                results.add([ROW], DETAILS)
+
+        self.store.project("first", clear=True)
+
+        self.assertEqual(self.store.query("SELECT DISTINCT project FROM smells"), [("second",)])
+        self.assertEqual(self.store.query("SELECT DISTINCT project FROM smell_instances"), [("second",)])
+
+    def test_queries_use_the_indexes(self):
+        plan = self.store.query("EXPLAIN QUERY PLAN SELECT * FROM smell_instances WHERE smell_name = ?",
+                                ("in_place_apis_misused",))
+        self.assertIn("smell_instances_smell", plan[0][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
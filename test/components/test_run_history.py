@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from components import run_history
+from components.run_history import RunHistory, combine_records, run_record
+
+ROWS = [["a.py", "load", 2, "in_place_apis_misused", "m"],
+        ["b.py", "fit", 1, "memory_not_freed", "m"],
+        ["b.py", "save", 1, "in_place_apis_misused", "m"]]
+
+
+def record(date):
+    return {"date": date, "duration": 1.0, "files": 1, "smells": 0, "smell_counts": {}, "projects": {}}
+
+
+class TestRunHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.history = RunHistory(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_run_record_counts_smells_by_type_and_project(self):
+        first = run_record(1.5, 2, {"first": ROWS})
+        self.assertEqual(first["smells"], 4)
+        self.assertEqual(first["smell_counts"], {"in_place_apis_misused": 3, "memory_not_freed": 1})
+
+        combined = combine_records([first, run_record(1, 3, {"second": ROWS[1:]})], 4)
+        self.assertEqual(combined["files"], 5)
+        self.assertEqual(combined["projects"], {"first": 4, "second": 2})
+        self.assertEqual(combined["smell_counts"], {"in_place_apis_misused": 4, "memory_not_freed": 2})
+
+    def test_runs_are_appended_with_increasing_ids(self):
+        self.assertIsNone(self.history.last())
+        for day in range(1, 4):
+            self.history.append(record(f"2024-01-0{day} 10:00:00"))
+
+        self.assertEqual(self.history.last()["id"], 3)
+        self.assertEqual([run["id"] for run in self.history.runs()], [1, 2, 3])
+
+    def test_incomplete_run_is_dropped(self):
+        self.history.append(record("2024-01-01 10:00:00"))
+        with open(self.history.path, "a") as file:
+            file.write('{"id": 2, "date": "2024-01-02')
+
+        self.assertEqual(self.history.last()["id"], 1)
+        self.assertEqual(len(self.history.runs()), 1)
+        self.assertEqual(self.history.append(record("2024-01-03 10:00:00"))["id"], 2)
+        self.assertEqual([run["date"] for run in self.history.runs()], ["2024-01-01 10:00:00", "2024-01-03 10:00:00"])
+
+    def test_date_range(self):
+        dates = [f"2024-{month:02d}-{day:02d} 10:00:00" for month in range(1, 13) for day in range(1, 29)]
+        for date in dates:
+            self.history.append(record(date))
+
+        self.assertEqual(len(self.history.runs("2024-03", "2024-03")), 28)
+        self.assertEqual([run["date"] for run in self.history.runs("2024-05-27", "2024-06-02")],
+                         dates[4 * 28 + 26:5 * 28 + 2])
+        self.assertEqual(len(self.history.runs(start="2024-12-28")), 1)
+        self.assertEqual(self.history.runs(start="2025"), [])
+        self.assertEqual(len(self.history.runs(end="2024-01-01")), 1)
+
+    def test_last_run_longer_than_a_chunk(self):
+        self.history.append(record("2024-01-01 10:00:00"))
+        long_run = dict(record("2024-01-02 10:00:00"), projects={f"project_{i}": i for i in range(1000)})
+        self.history.append(long_run)
+
+        self.assertGreater(os.path.getsize(self.history.path), run_history.TAIL_CHUNK)
+        self.assertEqual(self.history.last()["projects"], long_run["projects"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,39 @@ def process_data():
         self.assertIn('df2', result)
         self.assertIn('df3', result)
 
+    def test_dataframe_defined_after_use(self):
+        # Test case where the assignments are not in dataflow order (e.g. inside a loop)
+        source_code = """
+def process_data():
+    for i in range(3):
+        if i > 0:
+            df3 = df2.fillna(0)
+        df2 = df
+        df = pandas.read_csv("data.csv")
+        """
+        tree = ast.parse(source_code)
+        fun_node = tree.body[0]  # Get the function node
+
+        result = dataframe_check(fun_node, self.libraries, df_dict)
+
+        self.assertIn('df', result)
+        self.assertIn('df2', result)
+        self.assertIn('df3', result)
+
+    def test_dataframe_variables_are_copied(self):
+        # Test case where a rule modifies the returned list
+        source_code = """
+def process_data():
+    df = pandas.read_csv("data.csv")
+        """
+        tree = ast.parse(source_code)
+        fun_node = tree.body[0]  # Get the function node
+
+        dataframe_check(fun_node, self.libraries, df_dict).append('row')
+        result = dataframe_check(fun_node, self.libraries, df_dict)
+
+        self.assertNotIn('row', result)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import unittest
+
+from cs_detector.code_extractor.dictionaries import get_dictionaries, reload_dictionaries, ModelDictionary
+from cs_detector.code_extractor.models import check_model_method
+
+
+class TestDictionaries(unittest.TestCase):
+
+    def test_dictionaries_are_loaded_once(self):
+        self.assertIs(get_dictionaries(), get_dictionaries())
+
+    def test_reload_only_if_changed(self):
+        dictionaries = get_dictionaries()
+
+        self.assertIs(reload_dictionaries(only_if_changed=True), dictionaries)
+        reloaded = reload_dictionaries()
+        self.assertIsNot(reloaded, dictionaries)
+        self.assertEqual(reloaded.version, dictionaries.version)
+
+    def test_dataframe_methods(self):
+        dataframes = get_dictionaries().dataframes
+
+        self.assertIn('read_csv', dataframes.methods)
+        self.assertIn('merge', dataframes.dataframe_methods)
+        self.assertNotIn('set_flags', dataframes.dataframe_methods)
+
+    def test_tensor_operations_with_more_inputs(self):
+        tensors = get_dictionaries().tensors
+
+        self.assertIn('add', tensors.methods)
+        self.assertNotIn('constant', tensors.methods)
+
+    def test_dictionaries_are_read_only(self):
+        models = get_dictionaries().models
+
+        with self.assertRaises(TypeError):
+            models['method'] = []
+        self.assertIsInstance(models['method'], tuple)
+
+    def test_model_dictionary_from_plain_dict(self):
+        model_dict = {
+            'library': ['sklearn'],
+            'method': ['LogisticRegression()'],
+            'hyperparameters': ['penalty, C'],
+        }
+        models = ModelDictionary.of(model_dict)
+
+        self.assertEqual(models.hyperparameters['LogisticRegression()'], ('penalty', 'C'))
+        self.assertTrue(check_model_method('LogisticRegression()', model_dict, ['sklearn']))
+        self.assertFalse(check_model_method('LogisticRegression()', model_dict, ['tensorflow']))
+
+
+if __name__ == '__main__':
+    unittest.main()
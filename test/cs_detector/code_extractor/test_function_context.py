@@ -0,0 +1,64 @@
+import unittest
+import ast
+
+from cs_detector.code_extractor.function_context import function_context, scoped_walk, SourceLines
+
+
+class TestFunctionContext(unittest.TestCase):
+
+    def setUp(self):
+        source_code = """
+def process_data(df):
+    for i in range(3):
+        df.merge(other)
+    while True:
+        print(df['a'])
+        """
+        self.fun_node = ast.parse(source_code).body[0]
+
+    def test_nodes_are_indexed_by_type_in_walk_order(self):
+        context = function_context(self.fun_node)
+        calls = [node for node in ast.walk(self.fun_node) if isinstance(node, ast.Call)]
+
+        self.assertEqual(context.nodes(ast.Call), calls)
+
+    def test_nodes_of_multiple_types(self):
+        context = function_context(self.fun_node)
+        loops = context.nodes(ast.For, ast.While)
+
+        self.assertEqual([type(node) for node in loops], [ast.For, ast.While])
+
+    def test_missing_node_type(self):
+        context = function_context(self.fun_node)
+
+        self.assertEqual(context.nodes(ast.Compare), [])
+        self.assertFalse(context.has_nodes((ast.Compare,)))
+        self.assertTrue(context.has_nodes((ast.Compare, ast.Subscript)))
+
+    def test_context_is_reused(self):
+        self.assertIs(function_context(self.fun_node), function_context(self.fun_node))
+
+    def test_nested_functions_are_not_walked(self):
+        source = "def outer():\n    @decorator\n    def inner(x=default):\n        return x + 1\n    return inner\n"
+        fun_node = ast.parse(source).body[0]
+
+        names = [node.id for node in scoped_walk(fun_node) if isinstance(node, ast.Name)]
+
+        self.assertEqual(sorted(names), ['decorator', 'default', 'inner'])
+
+    def test_statement_source(self):
+        source = "def load():\r\n    df['a'] = 0  # empty column\r\n    df['é'] = ''; df['b'] = df[\r\n        'a']\r\n"
+        fun_node = ast.parse(source).body[0]
+        context = function_context(fun_node)
+
+        unparsed = [context.statement_source(node) for node in fun_node.body]
+        context.source = SourceLines(source)
+        sliced = [context.statement_source(node) for node in fun_node.body]
+
+        self.assertEqual(sliced[:2], ["df['a'] = 0", "df['é'] = ''"])
+        self.assertEqual(sliced[:2], unparsed[:2])
+        self.assertEqual(sliced[2], "df['b'] = df[\n        'a']")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import ast
+import unittest
+
+from cs_detector.code_extractor.libraries import extract_libraries, get_library_of_node, ImportTable
+
+SOURCE = """
+import numpy as np
+from numpy import ma
+import torchvision
+import os.path
+from sklearn.ensemble import RandomForestClassifier as Forest
+
+def load():
+    import pandas as pd
+    try:
+        import tensorflow as tf
+    except ImportError:
+        tf = None
+"""
+
+
+class TestImportTable(unittest.TestCase):
+
+    def setUp(self):
+        self.libraries = extract_libraries(ast.parse(SOURCE))
+
+    def test_import_strings(self):
+        self.assertEqual(set(self.libraries), {"numpy as np", "numpy.ma", "torchvision", "os.path",
+                                               "sklearn.ensemble.RandomForestClassifier as Forest", "pandas as pd",
+                                               "tensorflow as tf"})
+
+    def test_imported_packages(self):
+        self.assertTrue(self.libraries.imports("pandas"))
+        self.assertTrue(self.libraries.imports("tensorflow"))
+        self.assertTrue(self.libraries.imports("sklearn"))
+        self.assertTrue(self.libraries.imports("os"))
+        self.assertFalse(self.libraries.imports("torch"))
+
+    def test_aliases_and_origins(self):
+        self.assertEqual(self.libraries.aliases("numpy"), {"np"})
+        self.assertEqual(self.libraries.aliases("os"), {"os"})
+        self.assertEqual(self.libraries.origin("Forest"), "sklearn.ensemble.RandomForestClassifier")
+        self.assertEqual(self.libraries.origin("ma"), "numpy.ma")
+        self.assertIsNone(self.libraries.origin("torch"))
+
+    def test_test_libraries(self):
+        self.assertFalse(self.libraries.has_test_library)
+        self.assertTrue(ImportTable.of(["pytest", "pandas as pd"]).has_test_library)
+
+    def test_plain_list(self):
+        libraries = ImportTable.of(["pandas as pd", "sklearn.cluster.KMeans"])
+
+        self.assertEqual(libraries.aliases("pandas"), {"pd"})
+        self.assertEqual(libraries.library_of("KMeans"), "sklearn.cluster.KMeans")
+
+    def test_library_of_node(self):
+        call = ast.parse("Forest().fit(x)").body[0].value
+
+        self.assertEqual(get_library_of_node(call.func.value, self.libraries),
+                         "sklearn.ensemble.RandomForestClassifier as Forest")
+        self.assertEqual(get_library_of_node(call, self.libraries), "Unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
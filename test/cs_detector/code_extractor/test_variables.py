@@ -0,0 +1,53 @@
+import ast
+import unittest
+
+from cs_detector.code_extractor.variables import search_variable_definition, equal_node
+
+
+def linear_search(var, fun_node, limit_node):
+    last_node_definition = None
+    for node in ast.walk(fun_node):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == var:
+                    last_node_definition = node
+        if equal_node(node, limit_node):
+            return last_node_definition
+    return last_node_definition
+
+
+class TestSearchVariableDefinition(unittest.TestCase):
+
+    def setUp(self):
+        source_code = """
+def train(data):
+    x = [1, 2]
+    for i in range(3):
+        x = [[1], [2]]
+        y = tf.constant(x)
+    x = y = None
+    z = tf.constant(x)
+    x = 3
+        """
+        self.fun_node = ast.parse(source_code).body[0]
+        self.assigns = [node for node in ast.walk(self.fun_node) if isinstance(node, ast.Assign)]
+
+    def test_latest_definition_before_node(self):
+        z_assign = [node for node in self.assigns if node.targets[0].id == 'z'][0]
+
+        definition = search_variable_definition('x', self.fun_node, z_assign)
+
+        self.assertEqual(definition.lineno, 7)
+
+    def test_undefined_variable(self):
+        self.assertIsNone(search_variable_definition('w', self.fun_node, self.assigns[-1]))
+
+    def test_same_result_as_linear_search(self):
+        for limit_node in list(ast.walk(self.fun_node)):
+            for var in ['x', 'y', 'z', 'i']:
+                self.assertIs(search_variable_definition(var, self.fun_node, limit_node),
+                              linear_search(var, self.fun_node, limit_node))
+
+
+if __name__ == '__main__':
+    unittest.main()
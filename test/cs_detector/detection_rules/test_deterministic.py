@@ -2,12 +2,13 @@ import unittest
 import ast
 
 from cs_detector.detection_rules.Generic import deterministic_algorithm_option_not_used
+from cs_detector.code_extractor.libraries import ImportTable
 
 class TestDeterministicAlgorithmOption(unittest.TestCase):
 
     def setUp(self):
         # Set up common values for the tests
-        self.libraries = ['torch']
+        self.libraries = ImportTable.of(['torch'])
         self.filename = "test_file.py"
 
     def test_deterministic_algorithm_used(self):
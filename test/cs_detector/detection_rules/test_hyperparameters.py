@@ -1,6 +1,7 @@
 from cs_detector.detection_rules.Generic import hyperparameters_randomness_not_explicitly_set
 import unittest
 import ast
+from cs_detector.code_extractor.libraries import ImportTable
 
 
 # Sample test models and hyperparameters
@@ -24,7 +25,7 @@ def train_model():
         """
         tree = ast.parse(source_code)
         fun_node = tree.body[0]
-        libraries = ['sklearn']
+        libraries = ImportTable.of(['sklearn'])
 
         filename = "test_file.py"
         result, smells = hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, test_model_dict)
@@ -41,7 +42,7 @@ def train_model():
         """
         tree = ast.parse(source_code)
         fun_node = tree.body[0]
-        libraries = ['sklearn']
+        libraries = ImportTable.of(['sklearn'])
 
         filename = "test_file.py"
         result, smells = hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, test_model_dict)
@@ -65,7 +66,7 @@ def train_model():
             """
         tree = ast.parse(source_code)
         fun_node = tree.body[0]
-        libraries = ['sklearn']
+        libraries = ImportTable.of(['sklearn'])
 
         filename = "test_file.py"
         result, smells = hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, test_model_dict)
@@ -81,7 +82,7 @@ def process_data():
         """
         tree = ast.parse(source_code)
         fun_node = tree.body[0]
-        libraries = ['sklearn']
+        libraries = ImportTable.of(['sklearn'])
 
         filename = "test_file.py"
         result, smells = hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, test_model_dict)
@@ -96,7 +97,7 @@ def train_model():
         """
         tree = ast.parse(source_code)
         fun_node = tree.body[0]
-        libraries = []
+        libraries = ImportTable.of([])
 
         filename = "test_file.py"
         result, smells = hyperparameters_randomness_not_explicitly_set(libraries, filename, fun_node, test_model_dict)
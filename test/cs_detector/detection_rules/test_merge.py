@@ -3,6 +3,7 @@ import ast
 
 from cs_detector.code_extractor.dataframe_detector import load_dataframe_dict
 from cs_detector.detection_rules.Generic import merge_api_parameter_not_explicitly_set
+from cs_detector.code_extractor.libraries import ImportTable
 
 df_dict = load_dataframe_dict("../../../obj_dictionaries/dataframes.csv")
 
@@ -10,7 +11,7 @@ df_dict = load_dataframe_dict("../../../obj_dictionaries/dataframes.csv")
 class TestMergeAPIParameter(unittest.TestCase):
 
     def setUp(self):
-        self.libraries = ['pandas']
+        self.libraries = ImportTable.of(['pandas'])
         self.filename = "test_file.py"
 
     def test_merge_no_parameters(self):
@@ -0,0 +1,36 @@
+import os
+import subprocess
+
+# a file with one dataframe_conversion_api_misused smell, {n} makes the name of its function unique
+SMELLY_SOURCE = """
+import pandas as pd
+
+def load_{n}(path):
+    df = pd.read_csv(path)
+    return df.values
+"""
+
+
+def git(path, *args):
+    # run git in path with a test identity, returns its output
+    return subprocess.run(["git", "-C", path, "-c", "user.name=test", "-c", "user.email=test@example.com"] +
+                          list(args), check=True, capture_output=True, text=True).stdout.strip()
+
+
+def result_files(output_path, recursive=False, ordered=False):
+    """
+    Lines of the result files (.csv and error.txt) written in output_path, by path relative to it, with recursive
+    those of its subfolders too. The lines are sorted unless ordered, the results of two analyses can be compared
+    even if their files were analyzed in another order.
+    """
+    results = {}
+    for dirpath, dirnames, filenames in os.walk(output_path):
+        for filename in filenames:
+            if filename.endswith(".csv") or filename == "error.txt":
+                with open(os.path.join(dirpath, filename)) as file:
+                    lines = file.read().splitlines()
+                results[os.path.relpath(os.path.join(dirpath, filename), output_path)] = \
+                    lines if ordered else sorted(lines)
+        if not recursive:
+            break
+    return results